@@ -0,0 +1,90 @@
+from gemini_client import get_api_key, get_client, model_name
+from llm_cache import cache_key, get_llm_cache
+from llm_metrics import get_metrics
+from singleflight import get_flight
+
+# ==========================================
+# 0. PERSONAS
+# ==========================================
+SYSTEM_INSTRUCTIONS = {
+    "Student": (
+        "You are a wise, practical college senior/mentor. "
+        "Tone: Empathetic, tactical, low-cost, non-judgmental. "
+        "Do NOT lecture about long-term investing or stocks. "
+        "Focus on: Cheap food hacks, surviving on little money, side hustles, and academic survival. "
+        "Keep answers short (max 120 words) and use bullet points."
+    ),
+    "Standard": (
+        "You are a professional Financial Strategist. "
+        "Tone: Serious, objective, risk-focused. "
+        "Focus on: Cash preservation, debt reduction (avalanche/snowball), and asset allocation. "
+        "Keep answers actionable (max 120 words) and use bullet points."
+    ),
+}
+
+
+def system_instruction(persona_type: str) -> str:
+    return SYSTEM_INSTRUCTIONS["Student" if persona_type == "Student" else "Standard"]
+
+
+def advice_error_message(e: Exception) -> str:
+    error_msg = str(e)
+    if "429" in error_msg or "ResourceExhausted" in error_msg or "quota" in error_msg.lower():
+        return "⚠️ **Traffic Overload:** The AI model is currently busy (Rate Limit Reached). Please wait 30 seconds and try again."
+    else:
+        return f"⚠️ **Connection Error:** Unable to reach Sentinel AI. ({error_msg})"
+
+
+# ==========================================
+# 1. STREAMING + BLOCKING ENTRY POINTS
+# ==========================================
+def stream_advice(prompt_context, persona_type):
+    """
+    Yields advice text as the model produces it. A cached answer is yielded
+    in one piece; a fresh one is cached once the stream completes. Model
+    errors are raised to the caller (see advice_error_message).
+    """
+    if not get_api_key():
+        yield "⚠️ System Error: Gemini API Key not found in secrets."
+        return
+
+    system = system_instruction(persona_type)
+    model = model_name()
+    cache = get_llm_cache()
+    key = cache_key(model, system, prompt_context)
+    cached = cache.get(key, "advice", model=model)
+    if cached is not None:
+        yield cached
+        return
+
+    # Identical in-flight request from another session: wait for its full text.
+    flight = get_flight()
+    call, leader = flight.begin(key)
+    if not leader:
+        get_metrics().record("advice", model, cache="coalesced")
+        yield flight.wait(call)
+        return
+
+    full_prompt = f"{system}\n\nUSER CONTEXT: {prompt_context}"
+    parts = []
+    try:
+        for text in get_client().stream(full_prompt, "advice", model):
+            parts.append(text)
+            yield text
+    except BaseException as e:
+        flight.finish(key, call, error=e if isinstance(e, Exception) else RuntimeError("Advice stream abandoned"))
+        raise
+
+    result = "".join(parts)
+    cache.set(key, result, "advice")
+    flight.finish(key, call, result=result)
+
+
+def get_gemini_advice(prompt_context, persona_type):
+    """
+    Fetches AI advice with specific personas and strict error handling.
+    """
+    try:
+        return "".join(stream_advice(prompt_context, persona_type))
+    except Exception as e:
+        return advice_error_message(e)
@@ -0,0 +1,199 @@
+"""
+Precomputed advice table: topic x persona x profile tier.
+
+Build it as a deploy step (resumable, safe to re-run), then commit
+data/advice_matrix.json:
+    python advice_matrix.py
+
+The Advice page serves matching profiles from the table and only calls
+the model live for cells it doesn't cover yet (or for protocol topics).
+A live answer for a cell is asked with the cell's tier prompt and kept in
+the cache directory, so the next profile in that tier is a hit even
+before the full build has run; the next build folds those cells in.
+"""
+import itertools
+import json
+import os
+import sys
+import threading
+
+import streamlit as st
+
+from disk_cache import CACHE_ROOT
+from feeds import STREAM_RSS_MAP
+from insight import INSIGHT_BUCKETS, band
+
+MATRIX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "advice_matrix.json")
+LEARNED_PATH = os.path.join(CACHE_ROOT, "advice_matrix.json")   # cells answered live at runtime
+
+STUDENT_TOPICS = [
+    "💸 Stretching the Budget (Survival Mode)",
+    "🎓 Career & Internships (Stream Specific)",
+    "🍔 Food Hacks (Cheap Nutrition)",
+    "🍻 Social Life on a Budget"
+]
+
+STANDARD_TOPICS = [
+    "⛽ Inflation Proofing",
+    "📉 Market Crash Defense",
+    "💳 Debt Clearance Strategy",
+    "🏰 Asset Allocation"
+]
+
+# ==========================================
+# 0. PROFILE TIERS
+# ==========================================
+WALLET_DAYS = ([7, 15, 30], ["under a week", "1-2 weeks", "2-4 weeks", "over a month"])
+
+MARKET_ASSETS = {"Stocks", "Mutual Funds", "Crypto"}
+REAL_ASSETS = {"Gold", "Real Estate"}
+ASSET_MIXES = ["no investments", "market-linked assets", "gold/property", "mixed portfolio"]
+
+
+def asset_mix(assets) -> str:
+    assets = set(assets or [])
+    market, real = bool(assets & MARKET_ASSETS), bool(assets & REAL_ASSETS)
+    if market and real:
+        return "mixed portfolio"
+    if market:
+        return "market-linked assets"
+    if real:
+        return "gold/property"
+    return "no investments"
+
+
+def profile_tier(persona: str, profile) -> tuple[str, ...]:
+    if persona == "Student":
+        wallet = float(profile.get("savings_buffer", 0) or 0)
+        limit = float(profile.get("daily_limit", 100) or 0)
+        days = wallet / limit if limit > 0 else 999
+        stream = profile.get("study_stream", "General")
+        if stream not in STREAM_RSS_MAP:
+            stream = "General"
+        return (stream, band(days, *WALLET_DAYS))
+
+    return (
+        band(float(profile.get("risk_score", 0) or 0), *INSIGHT_BUCKETS["risk"]),
+        band(float(profile.get("runway_days", 0) or 0), *INSIGHT_BUCKETS["runway"]),
+        asset_mix(profile.get("held_assets")),
+    )
+
+
+def all_tiers(persona: str):
+    if persona == "Student":
+        return itertools.product(list(STREAM_RSS_MAP), WALLET_DAYS[1])
+    return itertools.product(INSIGHT_BUCKETS["risk"][1], INSIGHT_BUCKETS["runway"][1], ASSET_MIXES)
+
+
+def tier_prompt(persona: str, topic: str, tier: tuple[str, ...]) -> str:
+    if persona == "Student":
+        stream, wallet_days = tier
+        return (
+            f"Student Profile: Stream: {stream}. Wallet lasts {wallet_days} at the daily limit. "
+            f"My current problem/topic is: '{topic}'. "
+            "Give me specific, actionable advice for this situation."
+        )
+    risk, runway, mix = tier
+    return (
+        f"Financial Profile: Risk: {risk}. Runway: {runway}. Holdings: {mix}. "
+        f"I need a strategic plan for: '{topic}'. "
+        "Focus on protecting my livelihood."
+    )
+
+
+def matrix_key(persona: str, topic: str, tier: tuple[str, ...]) -> str:
+    return "|".join((persona, topic) + tuple(tier))
+
+
+# ==========================================
+# 1. LOOKUP
+# ==========================================
+def read_table(path: str) -> dict[str, str]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_table(path: str, table: dict[str, str]):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(table, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+class AdviceMatrix:
+    """The built table (read-only, shipped) plus cells learned from live calls."""
+
+    def __init__(self, path: str = MATRIX_PATH, learned_path: str = LEARNED_PATH):
+        self.learned_path = learned_path
+        self._learned = read_table(learned_path)
+        self._table = {**self._learned, **read_table(path)}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        return self._table.get(key)
+
+    def learn(self, key: str, text: str):
+        with self._lock:
+            if key in self._table:
+                return
+            self._table[key] = self._learned[key] = text
+            try:
+                write_table(self.learned_path, self._learned)
+            except OSError:
+                pass
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+
+@st.cache_resource
+def get_matrix() -> AdviceMatrix:
+    return AdviceMatrix()
+
+
+def lookup_advice(persona: str, topic: str, profile) -> str | None:
+    return get_matrix().get(matrix_key(persona, topic, profile_tier(persona, profile)))
+
+
+def cell_prompt(persona: str, topic: str, profile) -> str:
+    """The prompt for this profile's cell, so a live answer can be reused across the tier."""
+    return tier_prompt(persona, topic, profile_tier(persona, profile))
+
+
+def learn_advice(persona: str, topic: str, profile, text: str):
+    get_matrix().learn(matrix_key(persona, topic, profile_tier(persona, profile)), text)
+
+
+# ==========================================
+# 2. OFFLINE BUILD
+# ==========================================
+def build(path: str = MATRIX_PATH):
+    from advice_engine import get_gemini_advice
+
+    # Cells already answered live at runtime are folded in, not asked again.
+    table = {**read_table(LEARNED_PATH), **read_table(path)}
+
+    jobs = [("Student", t, tier) for t in STUDENT_TOPICS for tier in all_tiers("Student")]
+    jobs += [("Standard", t, tier) for t in STANDARD_TOPICS for tier in all_tiers("Standard")]
+    todo = [j for j in jobs if matrix_key(*j) not in table]
+    print(f"{len(jobs)} cells, {len(jobs) - len(todo)} already built, {len(todo)} to go")
+    if not todo:
+        write_table(path, table)
+
+    for n, (persona, topic, tier) in enumerate(todo, 1):
+        text = get_gemini_advice(tier_prompt(persona, topic, tier), persona)
+        if text.startswith("⚠️"):
+            print(f"[{n}/{len(todo)}] skipped {matrix_key(persona, topic, tier)}: {text}")
+            continue
+        table[matrix_key(persona, topic, tier)] = text
+        # Write after every cell so an interrupted run resumes where it stopped.
+        write_table(path, table)
+        print(f"[{n}/{len(todo)}] {matrix_key(persona, topic, tier)}")
+
+
+if __name__ == "__main__":
+    build(sys.argv[1] if len(sys.argv) > 1 else MATRIX_PATH)
@@ -0,0 +1,221 @@
+import hashlib
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import streamlit as st
+
+from dedup import tokenize
+from feeds import LIVELIHOOD_FEEDS, get_feed_store
+from relevance import ProfileIndex, extract_facets, facet_label
+
+# ==========================================
+# 0. CLASSIFY + SEVERITY RULES
+# ==========================================
+# Checked in order; the first facet kind an item matches decides its category.
+CATEGORY_BY_FACET = [
+    ("crop", ("agri", "🌾", "Crop Market Signal")),
+    ("agri:weather", ("agri", "🌾", "Farm & Weather Signal")),
+    ("loan:rates", ("rates", "📉", "Interest Rate Signal")),
+    ("cost:fuel", ("fuel", "⛽", "Fuel Price Signal")),
+    ("asset", ("markets", "📈", "Market Signal")),
+    ("cost:inflation", ("inflation", "🛒", "Cost of Living Signal")),
+]
+
+CRITICAL_TERMS = {"hike", "hikes", "hiked", "surge", "surges", "crash", "crashes", "ban", "bans",
+                  "banned", "default", "drought", "flood", "floods", "freeze", "halt", "suspends", "penalty"}
+WARNING_TERMS = {"rise", "rises", "raise", "raises", "revise", "revises", "tighten", "tightens",
+                 "cut", "cuts", "fall", "falls", "volatile", "volatility", "warns", "caution", "deficit"}
+
+MIN_MATCH_SCORE = 1.0
+
+
+def classify(item: dict) -> tuple[str, str, str] | None:
+    """(category, icon, label) for an item, or None if it matches no livelihood facet."""
+    facets = extract_facets(item["title"])
+    kinds = facets | {f.partition(":")[0] for f in facets}
+    for facet, category in CATEGORY_BY_FACET:
+        if facet in kinds:
+            return category
+    return None
+
+
+def severity(item: dict, score: float) -> str:
+    words = tokenize(item["title"])
+    if words & CRITICAL_TERMS or score >= 4.0:
+        return "CRITICAL"
+    if words & WARNING_TERMS or score >= 2.0:
+        return "WARNING"
+    return "ADVISORY"
+
+
+# ==========================================
+# 1. HIGH-WATER MARKS
+# ==========================================
+def feed_key(url: str) -> str:
+    return hashlib.blake2b(url.encode(), digest_size=8).hexdigest()
+
+
+def item_id(url: str, item: dict) -> str:
+    """Deterministic id so re-processing after a crash overwrites, never duplicates."""
+    raw = f"{url}|{item.get('guid') or item.get('link') or item['title']}"
+    return "news_" + hashlib.blake2b(raw.encode(), digest_size=8).hexdigest()
+
+
+def published_ts(item: dict) -> float | None:
+    try:
+        return parsedate_to_datetime(item["published"]).timestamp()
+    except Exception:
+        return None
+
+
+def seen_key(item: dict) -> str:
+    return item.get("guid") or item.get("link") or item["title"]
+
+
+def new_items(items: list[dict], mark: dict | None) -> list[dict]:
+    """Items past the feed's high-water mark. Feeds list newest first."""
+    if not mark:
+        return list(items)
+
+    mark_ts = mark.get("pub_ts")
+    if mark_ts is not None and all(published_ts(i) is not None for i in items):
+        # Items stamped exactly at the mark are new unless the mark already saw them.
+        seen = set(mark.get("seen") or [mark.get("guid")])
+        return [
+            i for i in items
+            if published_ts(i) > mark_ts or (published_ts(i) == mark_ts and seen_key(i) not in seen)
+        ]
+
+    out = []
+    for item in items:
+        if item.get("guid") == mark.get("guid"):
+            break
+        out.append(item)
+    return out
+
+
+def next_mark(url: str, items: list[dict], mark: dict | None) -> dict:
+    prev = mark or {}
+    stamps = [ts for ts in (published_ts(i) for i in items) if ts is not None]
+    if prev.get("pub_ts") is not None:
+        stamps.append(prev["pub_ts"])
+    pub_ts = max(stamps) if stamps else None
+    # Everything stamped at the mark, so a later item with the same timestamp still gets through.
+    seen = {seen_key(i) for i in items if pub_ts is not None and published_ts(i) == pub_ts}
+    if pub_ts is not None and prev.get("pub_ts") == pub_ts:
+        seen.update(prev.get("seen") or [])
+    return {
+        "url": url,
+        "guid": items[0].get("guid") if items else prev.get("guid"),
+        "pub_ts": pub_ts,
+        "seen": sorted(seen),
+    }
+
+
+# ==========================================
+# 2. PIPELINE
+# ==========================================
+class AlertPipeline:
+    """
+    Turns new feed items into per-user alerts exactly once:
+    new items -> classify -> severity -> fan-out -> bulk save -> advance mark.
+    The mark only moves after alerts are written, so a crash mid-run just
+    replays the same items onto the same alert ids.
+    """
+
+    def __init__(self, feeds=None, profile_refresh: float = 300):
+        self.feeds = set(feeds or LIVELIHOOD_FEEDS)
+        self.profile_refresh = profile_refresh
+        self.profiles = ProfileIndex()
+        self._profiles_loaded_at = 0.0
+        self._marks = None
+        self._lock = threading.Lock()
+        self.stats = {"runs": 0, "items": 0, "alerts": 0, "errors": 0, "last_error": None}
+
+    def on_refresh(self, url: str, items: list[dict]):
+        if url not in self.feeds:
+            return
+        try:
+            self.run(url, items)
+        except Exception as e:
+            self.stats["errors"] += 1
+            self.stats["last_error"] = f"{type(e).__name__}: {e}"
+
+    def run(self, url: str, items: list[dict]) -> int:
+        from db_ops import load_feed_marks, save_feed_marks, save_alerts
+
+        with self._lock:
+            if self._marks is None:
+                self._marks = load_feed_marks()
+            self._load_profiles()
+
+            key = feed_key(url)
+            mark = self._marks.get(key)
+            fresh = new_items(items, mark)
+            self.stats["runs"] += 1
+            if not fresh:
+                return 0
+
+            per_user = {}
+            for item in fresh:
+                for user_id, alert in self.fan_out(url, item):
+                    per_user.setdefault(user_id, []).append(alert)
+
+            for user_id, alerts in per_user.items():
+                save_alerts(alerts, user_id)
+
+            new_mark = next_mark(url, fresh, mark)
+            save_feed_marks({key: new_mark})
+            self._marks[key] = new_mark
+
+            created = sum(len(a) for a in per_user.values())
+            self.stats["items"] += len(fresh)
+            self.stats["alerts"] += created
+            return created
+
+    def fan_out(self, url: str, item: dict):
+        category = classify(item)
+        if category is None:
+            return
+        cat, icon, label = category
+        aid = item_id(url, item)
+        ts = published_ts(item)
+        created_at = datetime.fromtimestamp(ts or time.time(), timezone.utc).isoformat()
+
+        for user_id, (score, facets) in self.profiles.match(item, MIN_MATCH_SCORE).items():
+            why = ", ".join(dict.fromkeys(facet_label(f) for f in facets))
+            level = severity(item, score)
+            yield user_id, {
+                "id": aid,
+                "icon": icon,
+                "title": label,
+                "summary": item["title"],
+                "desc": f"Impact Analysis: {level.title()} • affects {why}",
+                "level": level,
+                "category": cat,
+                "link": item.get("link"),
+                "source": item.get("source"),
+                "score": round(score, 2),
+                "created_at": created_at,
+            }
+
+    def _load_profiles(self):
+        from db_ops import load_all_profiles
+
+        if time.time() - self._profiles_loaded_at < self.profile_refresh:
+            return
+        for user_id, profile in load_all_profiles().items():
+            if profile.get("user_type") == "Student":
+                self.profiles.remove(user_id)
+            else:
+                self.profiles.upsert(user_id, profile)
+        self._profiles_loaded_at = time.time()
+
+
+@st.cache_resource
+def get_alert_pipeline() -> AlertPipeline:
+    pipeline = AlertPipeline()
+    get_feed_store().subscribe(pipeline.on_refresh)
+    return pipeline
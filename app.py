@@ -14,11 +14,20 @@ st.session_state.setdefault("lang", "English")
 st.session_state.setdefault("profile_complete", False)
 
 
-st.session_state.setdefault("alerts", [])
 st.session_state.setdefault("resolved_alert_ids", set())
 st.session_state.setdefault("voice_selected_alert_id", None)
 
 
+# Process-wide background services (started once, shared by all sessions).
+from feeds import get_feed_store
+from alert_pipeline import get_alert_pipeline
+from lottie_assets import get_lottie_assets
+
+get_feed_store()
+get_alert_pipeline()
+get_lottie_assets()
+
+
 LANGS = ["English", "Kannada", "Hindi"]
 st.sidebar.selectbox("Language", LANGS, key="lang")
 
@@ -0,0 +1,101 @@
+import hashlib
+import json
+
+import streamlit as st
+
+from disk_cache import DiskCache
+from singleflight import get_flight
+from tts_backends import TTSBackend, backend_chain
+
+# ==========================================
+# 0. CONFIG
+# ==========================================
+AUDIO_CACHE_MAX_BYTES = 50 * 1024 * 1024
+AUDIO_TTL = 30 * 24 * 3600
+
+
+def audio_key(text: str, lang: str, slow: bool = False, backend: str = "gtts") -> str:
+    raw = json.dumps([text, lang, bool(slow), backend], ensure_ascii=False)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+# ==========================================
+# 1. CACHE
+# ==========================================
+class AudioCache:
+    """
+    Content-addressed audio cache: hash(text, lang, slow, backend) -> bytes,
+    shared by every session. Lookups without a backend check the configured
+    backends in fallback order.
+    """
+
+    def __init__(self, max_bytes: int = AUDIO_CACHE_MAX_BYTES):
+        self.store = DiskCache("audio", max_bytes=max_bytes, default_ttl=AUDIO_TTL)
+
+    def get(self, text: str, lang: str, slow: bool = False, count: bool = True,
+            backend: str | None = None) -> bytes | None:
+        names = [backend] if backend else [b.name for b in backend_chain(lang)]
+        for name in names:
+            audio = self.store.get(audio_key(text, lang, slow, name), count=False)
+            if audio is not None:
+                self.store.hits += count
+                return audio
+        self.store.misses += count
+        return None
+
+    def key_for(self, text: str, lang: str, slow: bool = False) -> str | None:
+        """The cache key of the clip for text, from whichever backend rendered it."""
+        for b in backend_chain(lang):
+            key = audio_key(text, lang, slow, b.name)
+            if key in self.store:
+                return key
+        return None
+
+    def load(self, key: str) -> bytes | None:
+        return self.store.get(key)
+
+    def set(self, text: str, lang: str, audio: bytes, slow: bool = False, backend: str = "gtts"):
+        self.store.set(audio_key(text, lang, slow, backend), audio)
+
+    def __contains__(self, args) -> bool:
+        return self.get(*args, count=False) is not None
+
+    def stats(self) -> dict:
+        return self.store.stats()
+
+
+@st.cache_resource
+def get_audio_cache() -> AudioCache:
+    return AudioCache()
+
+
+def synthesize(text: str, lang: str = "en", slow: bool = False, backend: TTSBackend | None = None) -> bytes:
+    """
+    Audio bytes for text, from the cache when possible. Without a backend,
+    the configured backends are tried in order until one succeeds.
+    Concurrent requests for the same audio share one synthesis call.
+    Raises if every backend fails.
+    """
+    cache = get_audio_cache()
+    chain = [backend] if backend else backend_chain(lang)
+    audio = cache.get(text, lang, slow, backend=backend.name if backend else None)
+    if audio is not None:
+        return audio
+    if not chain:
+        raise RuntimeError(f"No text-to-speech backend available for '{lang}'")
+
+    error = None
+    for b in chain:
+        def lead(b=b):
+            fresh = cache.get(text, lang, slow, count=False, backend=b.name)
+            if fresh is not None:
+                return fresh
+            audio = b.synthesize(text, lang, slow)
+            cache.set(text, lang, audio, slow, b.name)
+            return audio
+
+        try:
+            return get_flight().do(f"tts:{audio_key(text, lang, slow, b.name)}", lead)
+        except Exception as e:
+            error = e
+    raise error
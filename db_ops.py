@@ -2,6 +2,7 @@ from datetime import datetime, timezone
 from firestore_db import get_db
 
 DEMO_USER_ID = "demo_user"
+BATCH_LIMIT = 500  # Firestore max writes per batch
 
 
 def save_profile(profile: dict):
@@ -23,27 +24,31 @@ def load_profile() -> dict:
     return doc.to_dict() if doc.exists else {}
 
 
-def save_alerts(alerts: list[dict]):
+def save_alerts(alerts: list[dict], user_id: str = DEMO_USER_ID):
     db = get_db()
-    base = db.collection("users").document(DEMO_USER_ID).collection("alerts")
+    base = db.collection("users").document(user_id).collection("alerts")
+    now = datetime.now(timezone.utc).isoformat()
 
-    
+    # One round trip per BATCH_LIMIT alerts instead of one per alert.
+    batch = db.batch()
+    pending = 0
     for a in alerts:
         aid = a.get("id")
         if not aid:
             continue
-        base.document(aid).set(
-            {
-                **a,
-                "updated_at": datetime.now(timezone.utc).isoformat(),
-            },
-            merge=True,
-        )
+        batch.set(base.document(aid), {**a, "updated_at": now}, merge=True)
+        pending += 1
+        if pending == BATCH_LIMIT:
+            batch.commit()
+            batch = db.batch()
+            pending = 0
+    if pending:
+        batch.commit()
 
 
-def load_alerts() -> list[dict]:
+def load_alerts(user_id: str = DEMO_USER_ID) -> list[dict]:
     db = get_db()
-    base = db.collection("users").document(DEMO_USER_ID).collection("alerts")
+    base = db.collection("users").document(user_id).collection("alerts")
     docs = base.stream()
     out = []
     for d in docs:
@@ -53,6 +58,28 @@ def load_alerts() -> list[dict]:
     return out
 
 
+def load_all_profiles() -> dict[str, dict]:
+    db = get_db()
+    out = {}
+    for d in db.collection_group("data").stream():
+        if d.id != "profile":
+            continue
+        user_id = d.reference.parent.parent.id
+        out[user_id] = d.to_dict() or {}
+    return out
+
+
+def load_feed_marks() -> dict[str, dict]:
+    db = get_db()
+    doc = db.collection("pipeline").document("feed_marks").get()
+    return (doc.to_dict() or {}) if doc.exists else {}
+
+
+def save_feed_marks(marks: dict[str, dict]):
+    db = get_db()
+    db.collection("pipeline").document("feed_marks").set(marks, merge=True)
+
+
 def save_resolved_ids(resolved_ids: set[str]):
     db = get_db()
     doc_ref = db.collection("users").document(DEMO_USER_ID).collection("data").document("state")
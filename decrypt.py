@@ -0,0 +1,155 @@
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from gemini_client import get_api_key, get_client, model_name
+from llm_cache import cache_key, cached_generate, get_llm_cache
+
+# Decrypt every visible headline in the background on page render, so the
+# "✨ Decrypt" click is a cache lookup. Off by default: it spends a model
+# call on every News render whether or not anyone clicks. Deep Scan and
+# "Decrypt All" fill the same cache on request.
+DECRYPT_PREFETCH = False
+MAX_BATCH = 12
+# Headlines a batch failed on (or the model skipped) aren't prefetched again
+# until the cooldown runs out; it doubles on each repeat failure.
+PREFETCH_COOLDOWN = 300
+PREFETCH_COOLDOWN_MAX = 3600
+
+_prefetch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="decrypt-prefetch")
+_inflight = set()
+_inflight_lock = threading.Lock()
+_failed = {}  # headline -> (consecutive failures, retry_at); guarded by _inflight_lock
+
+
+def decrypt_prompt(headline: str) -> str:
+    return f"Translate this news headline into 1 simple, urgent sentence for a common person: '{headline}'"
+
+
+def batch_prompt(headlines: list[str]) -> str:
+    numbered = "\n".join(f"{i}. {h}" for i, h in enumerate(headlines, 1))
+    return (
+        "For each numbered news headline below, write 1 simple, urgent sentence for a common person.\n"
+        'Reply with ONLY a JSON array like [{"i": 1, "text": "..."}], one object per headline.\n\n'
+        f"{numbered}"
+    )
+
+
+def parse_batch(raw: str, count: int) -> dict[int, str]:
+    """Maps 1-based headline index -> sentence. Ignores anything malformed."""
+    raw = re.sub(r"^```(?:json)?|```$", "", raw.strip(), flags=re.MULTILINE).strip()
+    try:
+        rows = json.loads(raw)
+    except ValueError:
+        return {}
+    out = {}
+    for row in rows if isinstance(rows, list) else []:
+        try:
+            i = int(row["i"])
+            text = str(row["text"]).strip()
+        except (KeyError, TypeError, ValueError):
+            continue
+        if 1 <= i <= count and text:
+            out[i] = text
+    return out
+
+
+# ==========================================
+# 1. SINGLE + BATCH
+# ==========================================
+def lookup(headline: str, count: bool = False) -> str | None:
+    """Cached explanation, without calling the model."""
+    model = model_name()
+    key = cache_key(model, "", decrypt_prompt(headline))
+    return get_llm_cache().get(key, "decrypt", count=count, model=model)
+
+
+def decrypt_headline(headline: str) -> str:
+    if not get_api_key(): return "⚠️ API Key missing."
+
+    prompt = decrypt_prompt(headline)
+    model = model_name()
+
+    def generate():
+        return get_client().generate(prompt, "decrypt", model).strip()
+
+    try:
+        return cached_generate("decrypt", model, prompt, generate)
+    except Exception:
+        return "Could not decrypt. Server busy."
+
+
+def decrypt_batch(headlines: list[str]) -> dict[str, str]:
+    """
+    Explains many headlines with one model call. Results are stored under
+    each headline's single-decrypt cache key; headlines the model skipped
+    are simply left out and fall back to decrypt_headline on click.
+    """
+    cache = get_llm_cache()
+    results = {}
+    missing = []
+    for h in dict.fromkeys(headlines):
+        cached = lookup(h, count=True)
+        if cached is not None:
+            results[h] = cached
+        else:
+            missing.append(h)
+
+    if not missing or not get_api_key():
+        return results
+
+    model = model_name()
+    for start in range(0, len(missing), MAX_BATCH):
+        chunk = missing[start:start + MAX_BATCH]
+        try:
+            raw = get_client().generate(batch_prompt(chunk), "decrypt_batch", model)
+            parsed = parse_batch(raw, len(chunk))
+        except Exception:
+            parsed = {}
+        for i, text in parsed.items():
+            headline = chunk[i - 1]
+            cache.set(cache_key(model, "", decrypt_prompt(headline)), text, "decrypt")
+            results[headline] = text
+    _record_failures([h for h in missing if h not in results], [h for h in missing if h in results])
+    return results
+
+
+def _record_failures(failed: list[str], succeeded: list[str]):
+    now = time.time()
+    with _inflight_lock:
+        for h in succeeded:
+            _failed.pop(h, None)
+        for h in failed:
+            n = _failed.get(h, (0, 0))[0] + 1
+            _failed[h] = (n, now + min(PREFETCH_COOLDOWN * 2 ** (n - 1), PREFETCH_COOLDOWN_MAX))
+
+
+def cooling_down(headline: str) -> bool:
+    """True if a recent batch failed on this headline and prefetch should leave it alone."""
+    entry = _failed.get(headline)
+    return entry is not None and time.time() < entry[1]
+
+
+def prefetch(headlines: list[str]):
+    """Fire-and-forget batch decrypt of headlines not yet cached, in flight or cooling down."""
+    if not DECRYPT_PREFETCH or not get_api_key():
+        return
+    with _inflight_lock:
+        todo = [
+            h for h in dict.fromkeys(headlines)
+            if h not in _inflight and not cooling_down(h) and lookup(h) is None
+        ]
+        _inflight.update(todo)
+    if not todo:
+        return
+
+    def run():
+        try:
+            decrypt_batch(todo)
+        finally:
+            with _inflight_lock:
+                _inflight.difference_update(todo)
+
+    _prefetch_pool.submit(run)
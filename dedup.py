@@ -0,0 +1,150 @@
+import hashlib
+import random
+import re
+import threading
+
+# ==========================================
+# 0. CONFIG
+# ==========================================
+# 32 MinHash permutations split into 16 LSH bands of 2 rows. Two headlines
+# with Jaccard >= ~0.25 almost always share a band; candidates are then
+# confirmed against SIMILARITY_THRESHOLD on the full signature.
+NUM_PERM = 32
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SIMILARITY_THRESHOLD = 0.5
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(2718)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+STOPWORDS = {
+    "a", "an", "the", "of", "in", "on", "at", "to", "for", "and", "or", "by",
+    "with", "from", "as", "is", "are", "be", "its", "it", "this", "that",
+    "after", "over", "new", "says", "said",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+# ==========================================
+# 1. FINGERPRINTS
+# ==========================================
+def tokenize(text: str) -> set[str]:
+    return {t for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS}
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "big")
+
+
+def minhash(text: str) -> tuple[int, ...]:
+    """MinHash signature of a headline's word set."""
+    hashes = [_token_hash(t) for t in tokenize(text)]
+    if not hashes:
+        return tuple([_PRIME] * NUM_PERM)
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def similarity(sig_a: tuple[int, ...], sig_b: tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / NUM_PERM
+
+
+def _bands(sig: tuple[int, ...]):
+    for b in range(BANDS):
+        yield b, sig[b * ROWS:(b + 1) * ROWS]
+
+
+# ==========================================
+# 2. LSH INDEX
+# ==========================================
+class HeadlineDeduper:
+    """
+    Near-duplicate index across feeds. Each headline is added under a key and
+    a group (the feed it came from) and gets a cluster id; near-duplicates
+    share the cluster of whichever copy was indexed first. Lookups only
+    compare against headlines that share an LSH band bucket.
+    """
+
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._sigs = {}
+        self._cluster = {}
+        self._group = {}
+        self._members = {}
+
+    def add(self, key: str, text: str, group: str) -> str:
+        sig = minhash(text)
+        with self._lock:
+            if key in self._sigs:
+                self._remove(key)
+
+            cluster = key
+            best = self.threshold
+            for other in self._candidates(sig):
+                score = similarity(sig, self._sigs[other])
+                if score >= best:
+                    best = score
+                    cluster = self._cluster[other]
+
+            self._sigs[key] = sig
+            self._cluster[key] = cluster
+            self._group[key] = group
+            self._members.setdefault(cluster, set()).add(key)
+            for band in _bands(sig):
+                self._buckets.setdefault(band, set()).add(key)
+            return cluster
+
+    def remove_group(self, group: str):
+        with self._lock:
+            for key in [k for k, g in self._group.items() if g == group]:
+                self._remove(key)
+
+    def cluster_groups(self, cluster: str) -> set[str]:
+        """Every group currently holding a copy of this cluster."""
+        with self._lock:
+            return {self._group[k] for k in self._members.get(cluster, ())}
+
+    def _candidates(self, sig):
+        seen = set()
+        for band in _bands(sig):
+            seen.update(self._buckets.get(band, ()))
+        return seen
+
+    def _remove(self, key: str):
+        sig = self._sigs.pop(key)
+        for band in _bands(sig):
+            bucket = self._buckets.get(band)
+            if bucket:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band]
+        cluster = self._cluster.pop(key)
+        self._group.pop(key, None)
+        members = self._members.get(cluster)
+        if members:
+            members.discard(key)
+            if not members:
+                del self._members[cluster]
+
+
+def collapse(item_lists: list[list[dict]]) -> list[list[dict]]:
+    """
+    Drops repeats of a cluster already shown in an earlier list (or earlier in
+    the same list). Lists are taken in display priority order.
+    """
+    seen = set()
+    out = []
+    for items in item_lists:
+        kept = []
+        for item in items or []:
+            cluster = item.get("cluster") or item["title"]
+            if cluster in seen:
+                continue
+            seen.add(cluster)
+            kept.append(item)
+        out.append(kept)
+    return out
@@ -0,0 +1,104 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from decrypt import decrypt_batch
+from dedup import collapse
+from drills import threat_simulations
+from feeds import LIVELIHOOD_FEEDS, RBI_FEED, SEBI_FEED, get_feed_store
+from gemini_client import get_api_key
+from prerender import prerender
+from relevance import profile_facets
+
+# ==========================================
+# 0. CONFIG
+# ==========================================
+SCAN_WORKERS = 4
+DECRYPT_TIMEOUT = 15     # the scan reports without explanations rather than wait longer
+RESULT_TTL = 300         # News & Alerts uses a scan result this fresh instead of recomputing
+MIN_MATCH_SCORE = 1.0
+VISIBLE_PER_FEED = 3
+
+
+def _sync_feed(store, url: str) -> tuple[str, int, str]:
+    """
+    Refreshes a feed unless its copy is still fresh, joining the background
+    refresh if one is already running. Returns (url, items, how).
+    """
+    snap = store.snapshot(url)
+    if snap["items"] is not None and not snap["stale"]:
+        return url, len(snap["items"]), f"cached {snap['age_seconds'] // 60} min ago"
+    if store.revalidate(url).result():
+        return url, len(store.get(url) or []), "refreshed"
+    items = store.get(url)
+    return url, len(items or []), "unreachable, using saved copy" if items else "unreachable"
+
+
+# ==========================================
+# 1. PIPELINE
+# ==========================================
+def deep_scan(profile, lang: str = "en"):
+    """
+    Runs the scan and yields progress events as they happen:
+        {"stage": ..., "message": ...}
+    The last event has stage "done" and carries the full result under
+    "result": matches, simulations, decrypted headlines, and feed status.
+    Feed refreshes, decrypt and audio pre-rendering run concurrently.
+    """
+    started = time.time()
+    store = get_feed_store()
+    feeds = list(dict.fromkeys([RBI_FEED, SEBI_FEED] + LIVELIHOOD_FEEDS))
+
+    pool = ThreadPoolExecutor(max_workers=SCAN_WORKERS, thread_name_prefix="deep-scan")
+    try:
+        feed_futures = [pool.submit(_sync_feed, store, url) for url in feeds]
+
+        # Drills only need the profile, so they're ready before any feed is.
+        simulations = threat_simulations(profile)
+        prerender(simulations, lang)
+        yield {"stage": "drills", "message": f"Evaluated {len(simulations)} threat drills; queued their audio"}
+
+        feed_status = {}
+        for future in as_completed(feed_futures):
+            url, count, how = future.result()
+            feed_status[url] = {"items": count, "status": how}
+            yield {"stage": "feeds", "message": f"{store.feeds.get(url, url)}: {count} items ({how})"}
+
+        matches = store.relevance.top_k(profile_facets(profile), k=3, groups=set(LIVELIHOOD_FEEDS))
+        matches = [m for m in matches if m["score"] >= MIN_MATCH_SCORE]
+        yield {"stage": "match", "message": f"Matched {len(matches)} headlines to your profile"}
+
+        # Same headlines the News page shows first, so its decrypt buttons are instant.
+        main_items, sec_items = collapse([store.get(RBI_FEED) or [], store.get(SEBI_FEED) or []])
+        visible = [i["title"] for i in main_items[:VISIBLE_PER_FEED] + sec_items[:VISIBLE_PER_FEED]]
+        visible += [m["item"]["title"] for m in matches]
+        visible = list(dict.fromkeys(visible))
+
+        decrypted = {}
+        if visible and get_api_key():
+            yield {"stage": "decrypt", "message": f"Decrypting {len(visible)} headlines..."}
+            try:
+                decrypted = pool.submit(decrypt_batch, visible).result(timeout=DECRYPT_TIMEOUT)
+                yield {"stage": "decrypt", "message": f"Decrypted {len(decrypted)}/{len(visible)} headlines"}
+            except Exception:
+                yield {"stage": "decrypt", "message": "Decrypt timed out; headlines will explain on click"}
+    finally:
+        # Don't hold the page on a decrypt call that outlived its timeout; it still fills the cache.
+        pool.shutdown(wait=False)
+
+    yield {
+        "stage": "done",
+        "message": f"Scan complete in {time.time() - started:.1f}s",
+        "result": {
+            "finished_at": time.time(),
+            "matches": matches,
+            "simulations": simulations,
+            "decrypted": decrypted,
+            "feeds": feed_status,
+        },
+    }
+
+
+def fresh_result(result: dict | None) -> dict | None:
+    if result and time.time() - result.get("finished_at", 0) <= RESULT_TTL:
+        return result
+    return None
@@ -0,0 +1,74 @@
+"""
+Briefing cards built from the user's profile: Student motivation/advice
+cards and Standard threat drills. Shared by the News, Voice and Deep Scan
+code paths so they all produce the same alert objects (and the same scripts).
+"""
+
+# Motivation Quotes Map (Field Specific)
+MOTIVATION_MAP = {
+    "CSE / Tech": "“Talk is cheap. Show me the code.” – Linus Torvalds",
+    "Finance / Commerce": "“Price is what you pay. Value is what you get.” – Warren Buffett",
+    "Medical / Biology": "“Wherever the art of Medicine is loved, there is also a love of Humanity.”",
+    "Arts / Humanities": "“Creativity takes courage.” – Henri Matisse",
+    "Law": "“Justice cannot be for one side alone, but must be for both.”",
+    "Architecture": "“We shape our buildings; thereafter they shape us.”",
+    "Management (BBA/MBA)": "“Leadership is the capacity to translate vision into reality.”",
+    "General": "“The expert in anything was once a beginner.”"
+}
+
+BROKE_ADVICE = (
+    "Never be ashamed of not having money. It is a temporary stage, not your identity. "
+    "Save what you can. If you really need to borrow, ask close friends or family—there is always someone willing to help."
+)
+
+
+def motivation_card(stream: str) -> dict:
+    return {
+        "id": "daily_motivation",
+        "title": f"Study Motivation ({stream.split('/')[0]})",
+        "summary": MOTIVATION_MAP.get(stream, MOTIVATION_MAP["General"]),
+        "desc": "Daily inspiration for your field."
+    }
+
+
+def broke_advice_card() -> dict:
+    return {
+        "id": "financial_advice_note",
+        "title": "Sentinel Advice: On Being Broke",
+        "summary": BROKE_ADVICE,
+        "desc": "Financial mental health check."
+    }
+
+
+def threat_simulations(profile) -> list[dict]:
+    """
+    Drill cards (icon + level) from the Standard profile. The News page,
+    Deep Scan and the Voice page all read these, so a clip pre-rendered
+    for one is a cache hit on the others.
+    """
+    transport = int(profile.get("transport", 0) or 0)
+    emi_total = int(profile.get("emi_total", 0) or 0)
+    simulations = []
+
+    if transport > 0:
+        simulations.append({
+            "id": "fuel_drill", "icon": "⛽", "title": "Fuel Supply Shock",
+            "desc": "Global oil prices spike by 15%.",
+            "summary": f"Impact: Transport cost rises by ~₹{int(transport*0.15)}.", "level": "WARNING"
+        })
+
+    if emi_total > 0:
+        simulations.append({
+            "id": "rate_drill", "icon": "📉", "title": "Interest Rate Surge",
+            "desc": "Repo rate raised by 50bps.",
+            "summary": "Loan tenure might increase by 6-12 months.", "level": "CRITICAL"
+        })
+
+    if not simulations:
+        simulations.append({
+            "id": "inflation_drill", "icon": "🛒", "title": "Cost of Living Spike",
+            "desc": "Vegetable prices double.",
+            "summary": "Buying power reduced. Cut discretionary spend.", "level": "ADVISORY"
+        })
+    return simulations
+
@@ -0,0 +1,322 @@
+import random
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urlparse
+from urllib.request import urlopen, Request
+
+import streamlit as st
+
+from dedup import HeadlineDeduper
+from relevance import RelevanceIndex
+
+# ==========================================
+# 0. FEED REGISTRY
+# ==========================================
+STREAM_RSS_MAP = {
+    "CSE / Tech": "https://www.sciencedaily.com/rss/computers_math/computer_science.xml",
+    "Finance / Commerce": "https://economictimes.indiatimes.com/markets/rssfeeds/1977021501.cms",
+    "Medical / Biology": "https://www.sciencedaily.com/rss/health_medicine.xml",
+    "Arts / Humanities": "https://indianexpress.com/section/lifestyle/art-and-culture/feed/",
+    "Law": "https://www.barandbench.com/route/feed.xml",
+    "Architecture": "https://www.archdaily.com/feed/rss/",
+    "Management (BBA/MBA)": "https://economictimes.indiatimes.com/small-biz/rssfeeds/5575607.cms",
+    "General": "https://indianexpress.com/section/education/feed/"
+}
+
+RBI_FEED = "https://www.rbi.org.in/pressreleases_rss.xml"
+SEBI_FEED = "https://www.sebi.gov.in/sebirss.xml"
+
+STANDARD_FEEDS = {
+    "RBI": RBI_FEED,
+    "SEBI": SEBI_FEED,
+}
+
+# Feeds searched for Standard-mode personalised matches.
+LIVELIHOOD_FEEDS = [
+    RBI_FEED,
+    SEBI_FEED,
+    STREAM_RSS_MAP["Finance / Commerce"],
+    STREAM_RSS_MAP["Management (BBA/MBA)"],
+]
+
+# Default cadence is 10 minutes (the old fetch_rss TTL). Official sources
+# publish a handful of releases a day, so they are polled less often.
+REFRESH_SECONDS = 600
+FEED_INTERVALS = {
+    RBI_FEED: 900,
+    SEBI_FEED: 900,
+}
+JITTER_SECONDS = 60
+STARTUP_SPREAD_SECONDS = 3
+FETCH_TIMEOUT = 5
+ITEM_LIMIT = 10
+REFRESH_WORKERS = 4
+
+# A copy older than STALE_FACTOR x its cadence is labelled stale and a
+# background revalidation is kicked off on read.
+STALE_FACTOR = 2
+
+# Per-host circuit breaker: after BREAKER_THRESHOLD consecutive failures the
+# host is skipped for BREAKER_COOLDOWN seconds, then probed once.
+BREAKER_THRESHOLD = 3
+BREAKER_COOLDOWN = 300
+
+
+def all_feeds() -> dict[str, str]:
+    """Every configured feed as {url: display name}."""
+    feeds = {url: name for name, url in STREAM_RSS_MAP.items()}
+    feeds.update({url: name for name, url in STANDARD_FEEDS.items()})
+    return feeds
+
+
+def fetch_rss(url: str, limit: int = ITEM_LIMIT, timeout: float = FETCH_TIMEOUT) -> list[dict]:
+    """Downloads and parses one RSS feed. Raises on network or parse errors."""
+    req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
+    with urlopen(req, timeout=timeout) as resp:
+        root = ET.fromstring(resp.read())
+    items = []
+    for item in root.findall(".//item")[:limit]:
+        title = item.findtext("title")
+        link = item.findtext("link")
+        if title:
+            items.append({
+                "title": title.strip(),
+                "link": link,
+                "guid": (item.findtext("guid") or link or title).strip(),
+                "published": item.findtext("pubDate"),
+            })
+    return items
+
+
+# ==========================================
+# 1. CIRCUIT BREAKER
+# ==========================================
+class CircuitBreaker:
+    """Closed -> open after repeated failures -> half-open probe after cooldown."""
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.time() - self.opened_at >= self.cooldown:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.threshold:
+                self.opened_at = time.time()
+            self._probing = False
+
+
+# ==========================================
+# 2. SHARED STORE + BACKGROUND SCHEDULER
+# ==========================================
+class FeedStore:
+    """
+    Process-wide feed cache. A daemon thread refreshes every feed on its own
+    cadence; page renders only ever read the last stored copy. Failed fetches
+    never replace good data, they only count against the host's breaker.
+    """
+
+    def __init__(self, feeds: dict[str, str], interval: float = REFRESH_SECONDS,
+                 jitter: float = JITTER_SECONDS, intervals: dict[str, float] | None = None):
+        self.feeds = dict(feeds)
+        self.interval = interval
+        self.jitter = jitter
+        self.intervals = dict(intervals or {})
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pool = ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix="feed-refresh")
+        self._inflight = {}     # url -> Future of the refresh already running
+        self._breakers = {}
+        self.dedup = HeadlineDeduper()
+        self.relevance = RelevanceIndex()
+        self._listeners = []
+        self._entries = {
+            url: {"items": None, "refreshed_at": None, "errors": 0, "last_error": None}
+            for url in self.feeds
+        }
+
+    # ---- Reads (never touch the network) ----
+    def get(self, url: str) -> list[dict] | None:
+        """Last good items for a feed, or None if it has not loaded yet."""
+        snap = self.snapshot(url)
+        return snap["items"]
+
+    def snapshot(self, url: str) -> dict:
+        """
+        Last good copy plus its age. Serves stale data immediately and, if the
+        copy is past its freshness window, revalidates it in the background.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(url)
+            if not entry:
+                return {"items": None, "age_seconds": None, "stale": False}
+            items = list(entry["items"]) if entry["items"] is not None else None
+            refreshed = entry["refreshed_at"]
+
+        age = int(now - refreshed) if refreshed else None
+        stale = age is not None and age > self._interval(url) * STALE_FACTOR
+        if stale or items is None:
+            self.revalidate(url)
+        return {"items": items, "age_seconds": age, "stale": stale}
+
+    def stats(self) -> list[dict]:
+        now = time.time()
+        out = []
+        with self._lock:
+            for url, entry in self._entries.items():
+                refreshed = entry["refreshed_at"]
+                out.append({
+                    "feed": self.feeds[url],
+                    "url": url,
+                    "items": len(entry["items"] or []),
+                    "age_seconds": int(now - refreshed) if refreshed else None,
+                    "errors": entry["errors"],
+                    "last_error": entry["last_error"],
+                    "breaker": self._breaker(url).state,
+                })
+        return out
+
+    # ---- Refresh ----
+    def _breaker(self, url: str) -> CircuitBreaker:
+        host = urlparse(url).netloc
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers.setdefault(host, CircuitBreaker())
+        return breaker
+
+    def _interval(self, url: str) -> float:
+        return self.intervals.get(url, self.interval)
+
+    def refresh(self, url: str) -> bool:
+        breaker = self._breaker(url)
+        if not breaker.allow():
+            return False
+
+        try:
+            items = fetch_rss(url)
+        except Exception as e:
+            breaker.record_failure()
+            with self._lock:
+                entry = self._entries[url]
+                entry["errors"] += 1
+                entry["last_error"] = f"{type(e).__name__}: {e}"
+            return False
+
+        breaker.record_success()
+        self._index(url, items)
+        with self._lock:
+            entry = self._entries[url]
+            entry["items"] = items
+            entry["refreshed_at"] = time.time()
+            entry["last_error"] = None
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            listener(url, list(items))
+        return True
+
+    def subscribe(self, listener):
+        """Registers listener(url, items), called after every successful refresh."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def _index(self, url: str, items: list[dict]):
+        """Ingest-time dedup and relevance indexing."""
+        self.dedup.remove_group(url)
+        self.relevance.remove_group(url)
+        for item in items:
+            key = f"{url}|{item['title']}"
+            item["source"] = self.feeds[url]
+            item["cluster"] = self.dedup.add(key, item["title"], url)
+            self.relevance.add(key, item, url)
+
+    def also_in(self, item: dict) -> list[str]:
+        """Other feeds currently carrying a near-duplicate of this item."""
+        urls = self.dedup.cluster_groups(item.get("cluster", ""))
+        return sorted({self.feeds[u] for u in urls} - {item.get("source")})
+
+    def revalidate(self, url: str) -> Future:
+        """
+        Schedules a refresh on the worker pool unless one is already running.
+        Returns the running refresh's future (True if it fetched), so callers
+        that need the result can wait on it without fetching twice.
+        """
+        with self._lock:
+            future = self._inflight.get(url)
+            if future is None:
+                future = self._inflight[url] = self._pool.submit(self._refresh_tracked, url)
+            return future
+
+    def _refresh_tracked(self, url: str) -> bool:
+        try:
+            return self.refresh(url)
+        finally:
+            with self._lock:
+                self._inflight.pop(url, None)
+
+    def _next_delay(self, url: str) -> float:
+        return max(1.0, self._interval(url) + random.uniform(-self.jitter, self.jitter))
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="feed-prefetcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._wake.set()
+        self._pool.shutdown(wait=False)
+
+    def _run(self):
+        # Spread the first pass over a few seconds so a cold start doesn't
+        # hit every host at once, but pages still fill quickly.
+        now = time.time()
+        due = {url: now + random.uniform(0, STARTUP_SPREAD_SECONDS) for url in self.feeds}
+
+        while not self._wake.is_set():
+            url = min(due, key=due.get)
+            wait = due[url] - time.time()
+            if wait > 0 and self._wake.wait(wait):
+                break
+            # Hand off to the pool so one hanging host can't hold up the rest.
+            self.revalidate(url)
+            due[url] = time.time() + self._next_delay(url)
+
+
+@st.cache_resource
+def get_feed_store() -> FeedStore:
+    store = FeedStore(all_feeds(), intervals=FEED_INTERVALS)
+    store.start()
+    return store
@@ -1,10 +1,11 @@
 import streamlit as st
-import firebase_admin
-from firebase_admin import credentials, firestore
 
 @st.cache_resource
 def get_db():
-   
+    # Imported here so pages that never touch Firestore don't load the SDK.
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+
     if not firebase_admin._apps:
         
         if "firebase_key" in st.secrets:
@@ -0,0 +1,201 @@
+import os
+import random
+import re
+import threading
+import time
+
+import streamlit as st
+
+from lazy_imports import installed, load
+from llm_metrics import get_metrics, usage_tokens
+
+# ==========================================
+# 0. CONFIG
+# ==========================================
+DEFAULT_MODEL = "gemini-2.5-flash"
+
+# Sized to the free-tier Flash quota; override with GEMINI_RPM in secrets/env.
+DEFAULT_RPM = 10
+MAX_CONCURRENCY = 4
+QUEUE_TIMEOUT = 20      # max seconds a call waits for a rate-limit token
+MAX_ATTEMPTS = 3
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+
+# Transient failures only: matched on the HTTP status, the google.api_core
+# exception class, or a status code leading the message ("503 Service Unavailable").
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+RETRYABLE_ERRORS = {
+    "RateLimited", "ResourceExhausted", "TooManyRequests", "InternalServerError",
+    "BadGateway", "ServiceUnavailable", "GatewayTimeout", "DeadlineExceeded",
+}
+_STATUS_RE = re.compile(r"^\s*(\d{3})\b")
+
+
+def _setting(name: str, default=None):
+    try:
+        value = st.secrets.get(name)
+    except Exception:
+        value = None
+    return value or os.getenv(name) or default
+
+
+def get_api_key():
+    return _setting("GEMINI_API_KEY")
+
+
+def model_name() -> str:
+    return _setting("GEMINI_MODEL", DEFAULT_MODEL)
+
+
+def genai_installed() -> bool:
+    return installed("google.generativeai")
+
+
+class RateLimited(Exception):
+    """Raised when no request slot frees up in time. Reads like a 429 to callers."""
+
+    def __init__(self):
+        super().__init__("429 ResourceExhausted: local rate limit queue timed out")
+
+
+def is_retryable(e: Exception) -> bool:
+    code = getattr(e, "code", None)
+    if isinstance(code, int):
+        return code in RETRYABLE_STATUS
+    if any(cls.__name__ in RETRYABLE_ERRORS for cls in type(e).__mro__):
+        return True
+    if isinstance(e, (TimeoutError, ConnectionError)):
+        return True
+    m = _STATUS_RE.match(str(e))
+    return bool(m) and int(m.group(1)) in RETRYABLE_STATUS
+
+
+# ==========================================
+# 1. TOKEN BUCKET
+# ==========================================
+class TokenBucket:
+    def __init__(self, rate_per_minute: float, capacity: float | None = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or max(1.0, rate_per_minute / 6)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+# ==========================================
+# 2. CLIENT
+# ==========================================
+class GeminiClient:
+    """
+    Process-wide model client: one genai.configure, a token bucket sized to
+    the quota, a concurrency cap, and jittered exponential backoff on
+    retryable errors. Every call is recorded in llm_metrics.
+    """
+
+    def __init__(self, rpm: float = DEFAULT_RPM, max_concurrency: int = MAX_CONCURRENCY):
+        self.bucket = TokenBucket(rpm)
+        self.semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._configured_key = None
+        self._models = {}
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return genai_installed() and bool(get_api_key())
+
+    def _model(self, name: str):
+        # grpc + protobuf make this the slowest import in the app; pay for it on the first call only.
+        genai = load("google.generativeai")
+        if genai is None:
+            raise RuntimeError("google-generativeai is not installed")
+        api_key = get_api_key()
+        with self._lock:
+            if api_key != self._configured_key:
+                genai.configure(api_key=api_key)
+                self._configured_key = api_key
+                self._models.clear()
+            if name not in self._models:
+                self._models[name] = genai.GenerativeModel(name)
+            return self._models[name]
+
+    def generate(self, prompt: str, site: str, model: str | None = None) -> str:
+        return "".join(self.stream(prompt, site, model, stream=False))
+
+    def stream(self, prompt: str, site: str, model: str | None = None, stream: bool = True):
+        """
+        Yields response text. Retries only happen before the first chunk is
+        yielded; errors after that propagate as-is.
+        """
+        model = model or model_name()
+        started = time.monotonic()
+        attempt = 0
+        yielded = False
+        parts = []
+        usage = None
+        try:
+            while True:
+                attempt += 1
+                if not self.bucket.acquire(QUEUE_TIMEOUT):
+                    raise RateLimited()
+                try:
+                    with self.semaphore:
+                        response = self._model(model).generate_content(prompt, stream=stream)
+                        if not stream:
+                            text = response.text
+                            usage = getattr(response, "usage_metadata", None)
+                            yielded = True
+                            parts.append(text)
+                            yield text
+                        else:
+                            for chunk in response:
+                                # The final chunk carries usage for the whole response.
+                                usage = getattr(chunk, "usage_metadata", None) or usage
+                                if chunk.text:
+                                    yielded = True
+                                    parts.append(chunk.text)
+                                    yield chunk.text
+                    break
+                except Exception as e:
+                    if yielded or attempt >= MAX_ATTEMPTS or not is_retryable(e):
+                        raise
+                    # Full jitter: sleep a random slice of the exponential window.
+                    time.sleep(random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt)))
+        except Exception as e:
+            self._record(site, model, prompt, "".join(parts), usage, started, attempt, error=type(e).__name__)
+            raise
+        self._record(site, model, prompt, "".join(parts), usage, started, attempt)
+
+    # ---- Metrics ----
+    def _record(self, site, model, prompt, text, usage, started, attempts, error=None):
+        prompt_tokens, response_tokens = usage_tokens(usage, prompt, text)
+        get_metrics().record(
+            site, model,
+            outcome="error" if error else "ok",
+            latency=time.monotonic() - started,
+            prompt_tokens=prompt_tokens,
+            response_tokens=response_tokens,
+            retries=max(0, attempts - 1),
+            error=error,
+            prompt=prompt,
+        )
+
+
+@st.cache_resource
+def get_client() -> GeminiClient:
+    return GeminiClient(rpm=float(_setting("GEMINI_RPM", DEFAULT_RPM)))
@@ -0,0 +1,110 @@
+"""
+Import-time report for each page route, plus a cold-start budget check.
+
+    python import_budget.py                   # report; exit 1 if any route is over budget
+    python import_budget.py --budget-ms 300 --top 15
+
+tests/test_import_budget.py runs the same check under pytest.
+
+A route's cost is what importing its top-level modules adds on top of
+streamlit itself (which the server has already loaded). A route also
+fails if it eagerly imports one of the heavy SDKs that lazy_imports is
+meant to defer.
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+IMPORT_BUDGET_MS = 250
+HEAVY_MODULES = {"google.generativeai", "firebase_admin", "gtts", "deep_translator", "streamlit_lottie", "pyttsx3"}
+
+
+def route_files() -> list[str]:
+    pages = sorted(f for f in os.listdir(os.path.join(ROOT, "pages")) if f.endswith(".py"))
+    return ["app.py"] + [os.path.join("pages", f) for f in pages]
+
+
+def top_level_imports(path: str) -> list[str]:
+    """Modules a script imports at module level (including inside top-level try/if blocks)."""
+    with open(os.path.join(ROOT, path), encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    found = []
+    stack = list(tree.body)
+    while stack:
+        node = stack.pop(0)
+        if isinstance(node, ast.Import):
+            found += [a.name for a in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            found.append(node.module)
+        elif isinstance(node, (ast.Try, ast.If, ast.With)):
+            stack = list(node.body) + [n for h in getattr(node, "handlers", []) for n in h.body] + stack
+    return list(dict.fromkeys(found))
+
+
+def importtime(modules: list[str]) -> tuple[dict, list[str]]:
+    """({module: (self_us, cumulative_us, depth)}, failed imports) from `python -X importtime`."""
+    code = "\n".join(
+        f"try:\n    import {m}\nexcept Exception as e:\n    print({m!r} + ': ' + type(e).__name__ + ': ' + str(e))"
+        for m in modules
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    timings = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        # One leading space, then two more per nesting level.
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        timings.setdefault(name.strip(), (int(self_us), int(cum_us), depth))
+    return timings, [l for l in proc.stdout.splitlines() if l]
+
+
+def measure(route: str, baseline: dict) -> dict:
+    """Import cost a route adds on top of baseline (streamlit's own timings)."""
+    modules = [m for m in top_level_imports(route) if m != "streamlit"]
+    timings, failed = importtime(["streamlit"] + modules)
+    added = {name: t for name, t in timings.items() if name not in baseline}
+    return {
+        "total_ms": sum(t[0] for t in added.values()) / 1000,
+        "added": added,
+        "heavy": sorted(name for name in added if name in HEAVY_MODULES),
+        "failed": failed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_BUDGET_MS", IMPORT_BUDGET_MS)))
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    baseline, _ = importtime(["streamlit"])
+    over = False
+    for route in route_files():
+        report = measure(route, baseline)
+        total_ms, added, heavy, failed = report["total_ms"], report["added"], report["heavy"], report["failed"]
+
+        ok = total_ms <= args.budget_ms and not heavy
+        over |= not ok
+        print(f"{'OK  ' if ok else 'FAIL'} {route:<24} {total_ms:8.1f} ms  ({len(added)} modules)")
+        for name in heavy:
+            print(f"       eager heavy import: {name}")
+        for line in failed:
+            print(f"       could not import {line}")
+        top = sorted(added.items(), key=lambda kv: kv[1][1], reverse=True)
+        for name, (self_us, cum_us, depth) in [kv for kv in top if kv[1][2] <= 1][:args.top]:
+            print(f"       {cum_us / 1000:8.1f} ms cumulative  {self_us / 1000:7.1f} ms self  {name}")
+
+    print(f"\nBudget: {args.budget_ms:.0f} ms per route on top of streamlit.")
+    sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    main()
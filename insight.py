@@ -0,0 +1,172 @@
+import threading
+import time
+from bisect import bisect_right
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import streamlit as st
+
+from gemini_client import genai_installed, get_api_key, get_client, model_name
+from llm_cache import cache_key, cached_generate, get_llm_cache
+
+# Seconds the dashboard waits for a background insight before showing the
+# rule-based fallback line.
+INSIGHT_TIMEOUT = 12
+
+# A finished insight job is reused for JOB_TTL seconds; one that failed or
+# came back degraded only for FAILED_JOB_TTL, so a recovered model shows up fast.
+JOB_TTL = 600
+FAILED_JOB_TTL = 30
+
+LIBRARY_MISSING = "⚠️ Gemini library missing."
+KEY_MISSING = "⚠️ Gemini Key missing. Unable to generate real-time insight."
+INSIGHT_UNAVAILABLE = "sorry for inconvenience! ,gemini 2.5 flash's credit has been currently overused, please check again later."
+DEGRADED_INSIGHTS = {LIBRARY_MISSING, KEY_MISSING, INSIGHT_UNAVAILABLE}
+
+# ==========================================
+# 0. BUCKETS
+# ==========================================
+# The one-line insight only needs coarse bands, so every ₹50 quick-log tap
+# no longer changes the cache key. Each band is (edges, labels) with
+# len(labels) == len(edges) + 1. Override via [insight_buckets] in secrets.
+INSIGHT_BUCKETS = {
+    "income": (
+        [10000, 25000, 50000, 100000, 200000],
+        ["under ₹10k", "₹10k-25k", "₹25k-50k", "₹50k-1L", "₹1L-2L", "over ₹2L"],
+    ),
+    "burn_ratio": (
+        [0.5, 0.8, 1.0, 1.2],
+        ["under 50% of income", "50-80% of income", "80-100% of income", "100-120% of income", "over 120% of income"],
+    ),
+    "runway": (
+        [15, 30, 90, 180, 900],
+        ["under 15 days", "15-30 days", "30-90 days", "90-180 days", "over 180 days", "indefinite"],
+    ),
+    "risk": (
+        [25, 50, 75],
+        ["low (0-24/100)", "moderate (25-49/100)", "high (50-74/100)", "critical (75-100/100)"],
+    ),
+}
+
+
+def _buckets() -> dict:
+    try:
+        override = dict(st.secrets.get("insight_buckets", {}))
+    except Exception:
+        override = {}
+    return {**INSIGHT_BUCKETS, **{k: (list(v[0]), list(v[1])) for k, v in override.items()}}
+
+
+def band(value: float, edges: list, labels: list) -> str:
+    return labels[bisect_right(edges, value)]
+
+
+def bucket_profile(income, burn, runway, risk_score) -> dict[str, str]:
+    buckets = _buckets()
+    income = float(income or 0)
+    burn = float(burn or 0)
+    return {
+        "income": band(income, *buckets["income"]),
+        "burn_ratio": band(burn / income, *buckets["burn_ratio"]) if income > 0 else "no income",
+        "runway": band(float(runway or 0), *buckets["runway"]),
+        "risk": band(float(risk_score or 0), *buckets["risk"]),
+    }
+
+
+# ==========================================
+# 1. INSIGHT
+# ==========================================
+_bucket_lock = threading.Lock()
+_bucket_stats = {"calls": 0, "raw_keys": set(), "bucket_keys": set()}
+
+
+def bucket_stats() -> dict:
+    """How many distinct raw inputs collapsed into how many cache keys."""
+    with _bucket_lock:
+        return {
+            "calls": _bucket_stats["calls"],
+            "distinct_inputs": len(_bucket_stats["raw_keys"]),
+            "distinct_buckets": len(_bucket_stats["bucket_keys"]),
+        }
+
+
+def insight_prompt(bands: dict[str, str]) -> str:
+    return (
+        f"Analyze this financial status: Monthly Income {bands['income']}, "
+        f"Monthly Burn {bands['burn_ratio']}, Survival Runway {bands['runway']}, "
+        f"Risk Score {bands['risk']}. "
+        "Provide exactly ONE short, punchy sentence (max 20 words) of advice or warning. "
+        "Be direct. No preamble."
+    )
+
+
+def get_gemini_dashboard_insight(income, burn, runway, risk_score):
+    if not genai_installed():
+        return LIBRARY_MISSING
+
+    if not get_api_key():
+        return KEY_MISSING
+
+    bands = bucket_profile(income, burn, runway, risk_score)
+    with _bucket_lock:
+        if len(_bucket_stats["raw_keys"]) > 10000:
+            _bucket_stats["raw_keys"].clear()
+            _bucket_stats["bucket_keys"].clear()
+        _bucket_stats["calls"] += 1
+        _bucket_stats["raw_keys"].add((income, burn, runway, risk_score))
+        _bucket_stats["bucket_keys"].add(tuple(bands.values()))
+
+    prompt = insight_prompt(bands)
+    model = model_name()
+
+    def generate():
+        return get_client().generate(prompt, "insight", model).strip()
+
+    try:
+        return cached_generate("insight", model, prompt, generate)
+    except Exception:
+        return INSIGHT_UNAVAILABLE
+
+
+# ==========================================
+# 2. BACKGROUND RENDERING
+# ==========================================
+_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="insight")
+_jobs_lock = threading.Lock()
+_jobs = {}
+
+
+def cached_insight(income, burn, runway, risk_score) -> str | None:
+    """Insight text if already cached; never calls the model."""
+    prompt = insight_prompt(bucket_profile(income, burn, runway, risk_score))
+    return get_llm_cache().get(cache_key(model_name(), "", prompt), "insight", count=False)
+
+
+def _job_ttl(future: Future) -> float:
+    if future.exception() is not None or future.result() in DEGRADED_INSIGHTS:
+        return FAILED_JOB_TTL
+    return JOB_TTL
+
+
+def submit_insight(income, burn, runway, risk_score) -> tuple[Future, float]:
+    """
+    Starts (or joins) a background insight job for these inputs' bucket.
+    Returns the future and the time it was submitted.
+    """
+    key = tuple(bucket_profile(income, burn, runway, risk_score).values())
+    now = time.time()
+    with _jobs_lock:
+        for k in [k for k, (f, t) in _jobs.items() if f.done() and now - t > _job_ttl(f)]:
+            del _jobs[k]
+        job = _jobs.get(key)
+        if job is None:
+            job = _jobs[key] = (_pool.submit(get_gemini_dashboard_insight, income, burn, runway, risk_score), now)
+        return job
+
+
+def fallback_insight(runway, risk_score) -> str:
+    """Rule-based line shown when the model is slow or unavailable."""
+    if risk_score >= 75 or runway <= 15:
+        return "Runway is critically short. Freeze non-essential spending today."
+    if risk_score >= 50 or runway <= 30:
+        return "Risk is elevated. Trim variable expenses and build a 30-day buffer."
+    return "You're in the safe zone. Keep saving to extend your runway."
@@ -0,0 +1,28 @@
+"""
+Deferred imports for the heavy optional SDKs (genai, firebase_admin, gtts,
+deep_translator, streamlit_lottie, pyttsx3). Importing a page should never
+pay for an SDK until a code path actually uses it.
+
+Check the startup cost with:
+    python import_budget.py
+"""
+import functools
+import importlib
+import importlib.util
+
+
+def installed(module: str) -> bool:
+    """True if module can be imported, without importing it."""
+    try:
+        return importlib.util.find_spec(module) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def load(module: str):
+    """The imported module, or None if it isn't installed. Imported once per process."""
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        return None
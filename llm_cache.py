@@ -0,0 +1,95 @@
+import hashlib
+import json
+import threading
+
+import streamlit as st
+
+from disk_cache import DiskCache
+from llm_metrics import get_metrics
+from singleflight import get_flight
+
+# ==========================================
+# 0. CONFIG
+# ==========================================
+LLM_CACHE_MAX_BYTES = 20 * 1024 * 1024
+DEFAULT_TTL = 24 * 3600
+
+# Headline explanations don't change; dashboard insights track live numbers.
+SITE_TTLS = {
+    "decrypt": 7 * 24 * 3600,
+    "advice": 24 * 3600,
+    "insight": 3600,
+}
+
+
+def cache_key(model: str, system: str, prompt: str) -> str:
+    raw = json.dumps([model, system or "", prompt], ensure_ascii=False)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+# ==========================================
+# 1. CACHE
+# ==========================================
+class LLMCache:
+    """Content-addressed model response cache: hash(model, system, prompt) -> text."""
+
+    def __init__(self, max_bytes: int = LLM_CACHE_MAX_BYTES):
+        self.store = DiskCache("llm", max_bytes=max_bytes, default_ttl=DEFAULT_TTL)
+        self._lock = threading.Lock()
+        self.site_stats = {}
+
+    def get(self, key: str, site: str = "", count: bool = True, model: str = "") -> str | None:
+        """count=False for internal peeks that shouldn't skew hit-ratio stats."""
+        value = self.store.get(key, count=count)
+        if count:
+            self._count(site, value is not None)
+            if value is not None:
+                get_metrics().record(site, model, cache="hit")
+        return value.decode() if value is not None else None
+
+    def set(self, key: str, text: str, site: str = ""):
+        self.store.set(key, text.encode(), ttl=SITE_TTLS.get(site, DEFAULT_TTL))
+
+    def _count(self, site: str, hit: bool):
+        with self._lock:
+            s = self.site_stats.setdefault(site, {"hits": 0, "misses": 0})
+            s["hits" if hit else "misses"] += 1
+
+    def stats(self) -> dict:
+        out = self.store.stats()
+        with self._lock:
+            out["sites"] = {
+                site: {**s, "hit_ratio": round(s["hits"] / (s["hits"] + s["misses"]), 3)}
+                for site, s in self.site_stats.items()
+            }
+        return out
+
+
+@st.cache_resource
+def get_llm_cache() -> LLMCache:
+    return LLMCache()
+
+
+def cached_generate(site: str, model: str, prompt: str, generate, system: str = "") -> str:
+    """
+    Returns the cached response for (model, system, prompt), calling
+    generate() on a miss. Concurrent misses on the same key share a single
+    generate() call. Exceptions from generate() propagate to every waiter
+    and nothing is cached, so callers keep their own error messages.
+    """
+    cache = get_llm_cache()
+    key = cache_key(model, system, prompt)
+    text = cache.get(key, site, model=model)
+    if text is not None:
+        return text
+
+    def lead():
+        # A previous leader may have filled the cache between our miss and now.
+        fresh = cache.get(key, site, count=False)
+        if fresh is not None:
+            return fresh
+        result = generate()
+        cache.set(key, result, site)
+        return result
+
+    return get_flight().do(key, lead, on_join=lambda: get_metrics().record(site, model, cache="coalesced"))
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+import streamlit as st
+
+from disk_cache import CACHE_ROOT
+
+# ==========================================
+# 0. CONFIG
+# ==========================================
+WINDOW_SECONDS = 3600            # rolling window for aggregates
+SNAPSHOT_EVERY = 30              # seconds between metrics file writes
+LATENCY_BUCKETS_MS = [100, 250, 500, 1000, 2000, 5000, 10000, 30000]
+METRICS_PATH = os.path.join(CACHE_ROOT, "llm_metrics.json")
+CALL_LOG_PATH = os.path.join(CACHE_ROOT, "llm_calls.jsonl")
+
+# USD per 1M (input, output) tokens.
+PRICE_PER_M_TOKENS = {
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-flash-latest": (0.30, 2.50),
+}
+
+logger = logging.getLogger("sentinel.llm")
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4) if text else 0
+
+
+def usage_tokens(usage, prompt: str, text: str) -> tuple[int, int]:
+    """(prompt, response) token counts from usage_metadata, else a chars/4 estimate."""
+    prompt_tokens = getattr(usage, "prompt_token_count", None)
+    response_tokens = getattr(usage, "candidates_token_count", None)
+    return (
+        prompt_tokens if prompt_tokens is not None else estimate_tokens(prompt),
+        response_tokens if response_tokens is not None else estimate_tokens(text),
+    )
+
+
+def cost_usd(model: str, prompt_tokens: int, response_tokens: int) -> float:
+    price_in, price_out = PRICE_PER_M_TOKENS.get(model, (0.0, 0.0))
+    return (prompt_tokens * price_in + response_tokens * price_out) / 1_000_000
+
+
+# ==========================================
+# 1. RECORDER
+# ==========================================
+class LLMMetrics:
+    """
+    One record per model lookup: site, model, tokens, latency, cache
+    (hit / miss / coalesced), retries and outcome. Each record is logged as
+    a JSON line; a rolling-window summary is written to METRICS_PATH.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records = deque()
+        self._last_snapshot = 0.0
+        os.makedirs(CACHE_ROOT, exist_ok=True)
+        if not any(getattr(h, "baseFilename", None) == CALL_LOG_PATH for h in logger.handlers):
+            handler = RotatingFileHandler(CALL_LOG_PATH, maxBytes=1_000_000, backupCount=3, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+
+    def record(self, site: str, model: str = "", outcome: str = "ok", cache: str = "miss",
+               latency: float = 0.0, prompt_tokens: int = 0, response_tokens: int = 0,
+               retries: int = 0, error: str | None = None, prompt: str = ""):
+        rec = {
+            "ts": round(time.time(), 3),
+            "site": site,
+            "model": model,
+            "outcome": outcome,
+            "cache": cache,
+            "latency_ms": int(latency * 1000),
+            "prompt_tokens": prompt_tokens,
+            "response_tokens": response_tokens,
+            "cost_usd": round(cost_usd(model, prompt_tokens, response_tokens), 6),
+            "retries": retries,
+            "error": error,
+            "prompt_id": hashlib.sha1(prompt.encode()).hexdigest()[:10] if prompt else None,
+            "prompt_head": prompt[:80] if prompt else None,
+        }
+        logger.info(json.dumps(rec, ensure_ascii=False))
+
+        with self._lock:
+            self._records.append(rec)
+            cutoff = rec["ts"] - WINDOW_SECONDS
+            while self._records and self._records[0]["ts"] < cutoff:
+                self._records.popleft()
+            due = rec["ts"] - self._last_snapshot >= SNAPSHOT_EVERY
+            if due:
+                self._last_snapshot = rec["ts"]
+        if due:
+            self.write_snapshot()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            records = list(self._records)
+
+        sites = {}
+        prompts = {}
+        for r in records:
+            s = sites.setdefault(r["site"], {
+                "calls": 0, "hits": 0, "misses": 0, "coalesced": 0, "errors": 0, "retries": 0,
+                "prompt_tokens": 0, "response_tokens": 0, "cost_usd": 0.0,
+                "latency_hist": [0] * (len(LATENCY_BUCKETS_MS) + 1), "_lat": [],
+            })
+            s["calls"] += 1
+            s["hits" if r["cache"] == "hit" else "coalesced" if r["cache"] == "coalesced" else "misses"] += 1
+            s["errors"] += r["outcome"] != "ok"
+            s["retries"] += r["retries"]
+            s["prompt_tokens"] += r["prompt_tokens"]
+            s["response_tokens"] += r["response_tokens"]
+            s["cost_usd"] += r["cost_usd"]
+            if r["cache"] == "miss":
+                bucket = next((i for i, edge in enumerate(LATENCY_BUCKETS_MS) if r["latency_ms"] <= edge), len(LATENCY_BUCKETS_MS))
+                s["latency_hist"][bucket] += 1
+                s["_lat"].append(r["latency_ms"])
+            if r["prompt_id"] and r["cache"] == "miss":
+                p = prompts.setdefault(r["prompt_id"], {"site": r["site"], "prompt": r["prompt_head"], "calls": 0, "tokens": 0, "cost_usd": 0.0})
+                p["calls"] += 1
+                p["tokens"] += r["prompt_tokens"] + r["response_tokens"]
+                p["cost_usd"] += r["cost_usd"]
+
+        for s in sites.values():
+            lat = sorted(s.pop("_lat"))
+            s["p50_ms"] = lat[len(lat) // 2] if lat else None
+            s["p95_ms"] = lat[min(len(lat) - 1, int(len(lat) * 0.95))] if lat else None
+            s["hit_ratio"] = round(s["hits"] / s["calls"], 3) if s["calls"] else 0.0
+            s["cost_usd"] = round(s["cost_usd"], 6)
+
+        top = sorted(prompts.values(), key=lambda p: p["tokens"], reverse=True)[:10]
+        return {
+            "window_seconds": WINDOW_SECONDS,
+            "generated_at": round(time.time(), 3),
+            "latency_buckets_ms": LATENCY_BUCKETS_MS,
+            "sites": sites,
+            "top_prompts": top,
+        }
+
+    def write_snapshot(self):
+        tmp = METRICS_PATH + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, ensure_ascii=False, indent=1)
+            os.replace(tmp, METRICS_PATH)
+        except OSError:
+            pass
+
+
+@st.cache_resource
+def get_metrics() -> LLMMetrics:
+    return LLMMetrics()
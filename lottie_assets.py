@@ -0,0 +1,139 @@
+"""
+Lottie animations served from local gzipped copies in assets/lottie/.
+
+Pages read the in-memory copy and never wait on the network; the remote
+originals are only re-fetched in a background thread. Refreshed copies go
+to the cache directory (SENTINEL_CACHE_DIR), never into the repo, and win
+over the bundle when both exist. To vendor (or update) the bundled copies:
+    python lottie_assets.py
+"""
+import gzip
+import json
+import os
+import threading
+import time
+
+import requests
+import streamlit as st
+
+from disk_cache import CACHE_ROOT
+from lazy_imports import load
+
+LOTTIE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "lottie")
+LOTTIE_CACHE_DIR = os.path.join(CACHE_ROOT, "lottie")
+
+LOTTIE_URLS = {
+    "safe": "https://assets2.lottiefiles.com/packages/lf20_x62chJ.json",
+    "critical": "https://assets10.lottiefiles.com/packages/lf20_qp1q7mct.json",
+    "voice": "https://lottie.host/17158f55-1b4e-4df7-8326-9f880482592d/0F7e8eX4l4.json",
+}
+
+FETCH_TIMEOUT = 5
+REFRESH_SECONDS = 24 * 3600
+
+
+def asset_path(name: str, directory: str = LOTTIE_DIR) -> str:
+    return os.path.join(directory, f"{name}.json.gz")
+
+
+def fetch(url: str) -> dict:
+    r = requests.get(url, timeout=FETCH_TIMEOUT)
+    r.raise_for_status()
+    data = r.json()
+    if not isinstance(data, dict) or "layers" not in data:
+        raise ValueError("not a Lottie animation")
+    return data
+
+
+def write_asset(name: str, data: dict, directory: str = LOTTIE_DIR):
+    """Minified, gzipped, written atomically."""
+    os.makedirs(directory, exist_ok=True)
+    raw = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+    path = asset_path(name, directory)
+    tmp = path + ".tmp"
+    # mtime=0 keeps the file byte-identical when the animation hasn't changed.
+    with open(tmp, "wb") as f:
+        f.write(gzip.compress(raw, mtime=0))
+    os.replace(tmp, path)
+
+
+def read_asset(name: str) -> dict | None:
+    """The refreshed copy from the cache directory, else the bundled one."""
+    for directory in (LOTTIE_CACHE_DIR, LOTTIE_DIR):
+        try:
+            with gzip.open(asset_path(name, directory), "rb") as f:
+                return json.loads(f.read())
+        except (OSError, ValueError):
+            continue
+    return None
+
+
+# ==========================================
+# 1. IN-MEMORY STORE
+# ==========================================
+class LottieAssets:
+    def __init__(self, urls: dict[str, str] = LOTTIE_URLS, refresh_seconds: float = REFRESH_SECONDS):
+        self.urls = urls
+        self.refresh_seconds = refresh_seconds
+        self._data = {name: read_asset(name) for name in urls}
+        self._thread = None
+        self.errors = {}
+
+    def get(self, name: str) -> dict | None:
+        """The animation, or None if it hasn't been bundled or fetched yet. Never blocks."""
+        return self._data.get(name)
+
+    def refresh(self):
+        for name, url in self.urls.items():
+            try:
+                data = fetch(url)
+            except Exception as e:
+                self.errors[name] = str(e)
+                continue
+            self.errors.pop(name, None)
+            if data != self._data.get(name):
+                self._data[name] = data
+                try:
+                    write_asset(name, data, LOTTIE_CACHE_DIR)
+                except OSError as e:
+                    self.errors[name] = str(e)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="lottie-refresh", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self.refresh()
+            time.sleep(self.refresh_seconds)
+
+
+@st.cache_resource
+def get_lottie_assets() -> LottieAssets:
+    assets = LottieAssets()
+    assets.start()
+    return assets
+
+
+def get_lottie(name: str) -> dict | None:
+    return get_lottie_assets().get(name)
+
+
+def render_lottie(name: str, **kwargs) -> bool:
+    """Draws the animation with streamlit_lottie (imported on first use). False if it can't."""
+    data = get_lottie(name)
+    lottie = load("streamlit_lottie") if data else None
+    if lottie is None:
+        return False
+    lottie.st_lottie(data, **kwargs)
+    return True
+
+
+if __name__ == "__main__":
+    for name, url in LOTTIE_URLS.items():
+        try:
+            write_asset(name, fetch(url))
+            print(f"{name}: {os.path.getsize(asset_path(name))} bytes -> {asset_path(name)}")
+        except Exception as e:
+            print(f"{name}: failed ({e})")
@@ -1,7 +1,7 @@
 import streamlit as st
-import time
-import google.generativeai as genai
-import os
+from advice_engine import stream_advice, advice_error_message
+from advice_matrix import STUDENT_TOPICS, STANDARD_TOPICS, cell_prompt, learn_advice, lookup_advice
+from session_store import drop_blob, get_value, put_value
 
 st.set_page_config(page_title="Advice", page_icon=":material/lightbulb:")
 
@@ -13,51 +13,7 @@ if not st.session_state.get("logged_in", False):
     st.stop()
 
 # ==========================================
-# 1. AI ENGINE (Dual Persona)
-# ==========================================
-def get_gemini_advice(prompt_context, persona_type):
-    """
-    Fetches AI advice with specific personas and strict error handling.
-    """
-    api_key = st.secrets.get("GEMINI_API_KEY") or os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        return "⚠️ System Error: Gemini API Key not found in secrets."
-
-    try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-flash-latest')
-        
-        # Dual Persona Logic
-        if persona_type == "Student":
-            system_instruction = (
-                "You are a wise, practical college senior/mentor. "
-                "Tone: Empathetic, tactical, low-cost, non-judgmental. "
-                "Do NOT lecture about long-term investing or stocks. "
-                "Focus on: Cheap food hacks, surviving on little money, side hustles, and academic survival. "
-                "Keep answers short (max 120 words) and use bullet points."
-            )
-        else:
-            system_instruction = (
-                "You are a professional Financial Strategist. "
-                "Tone: Serious, objective, risk-focused. "
-                "Focus on: Cash preservation, debt reduction (avalanche/snowball), and asset allocation. "
-                "Keep answers actionable (max 120 words) and use bullet points."
-            )
-
-        full_prompt = f"{system_instruction}\n\nUSER CONTEXT: {prompt_context}"
-        
-        response = model.generate_content(full_prompt)
-        return response.text
-
-    except Exception as e:
-        error_msg = str(e)
-        if "429" in error_msg or "ResourceExhausted" in error_msg or "quota" in error_msg.lower():
-            return "⚠️ **Traffic Overload:** The AI model is currently busy (Rate Limit Reached). Please wait 30 seconds and try again."
-        else:
-            return f"⚠️ **Connection Error:** Unable to reach Sentinel AI. ({error_msg})"
-
-# ==========================================
-# 2. UI SETUP & CONTEXT LOADING
+# 1. UI SETUP & CONTEXT LOADING
 # ==========================================
 user_type = st.session_state.get("user_type", "Standard")
 
@@ -80,7 +36,7 @@ else:
 st.divider()
 
 # ==========================================
-# 3. TOPIC SELECTION (Auto vs Manual)
+# 2. TOPIC SELECTION (Auto vs Manual)
 # ==========================================
 
 
@@ -96,26 +52,16 @@ if protocol_context:
 
 else:
     if user_type == "Student":
-        topics = [
-            "💸 Stretching the Budget (Survival Mode)", 
-            "🎓 Career & Internships (Stream Specific)", 
-            "🍔 Food Hacks (Cheap Nutrition)", 
-            "🍻 Social Life on a Budget"
-        ]
+        topics = STUDENT_TOPICS
         btn_label = "⚡ Ask Mentor"
     else:
-        topics = [
-            "⛽ Inflation Proofing", 
-            "📉 Market Crash Defense", 
-            "💳 Debt Clearance Strategy", 
-            "🏰 Asset Allocation"
-        ]
+        topics = STANDARD_TOPICS
         btn_label = "🛡️ Generate Strategy"
         
     selected_topic = st.selectbox("Select Area of Concern:", topics)
 
 # ==========================================
-# 4. CONTEXT PACKAGING
+# 3. CONTEXT PACKAGING
 # ==========================================
 
 
@@ -147,7 +93,7 @@ else:
     persona = "Standard"
 
 # ==========================================
-# 5. ACTION & DISPLAY
+# 4. ACTION & DISPLAY
 # ==========================================
 
 with st.container(border=True):
@@ -157,40 +103,47 @@ with st.container(border=True):
     final_btn_label = f"🚨 Generate Protocol for {selected_topic}" if protocol_context else btn_label
     
     if st.button(final_btn_label, type="primary", use_container_width=True):
-        
-        with st.status("🔄 Sentinel is analyzing parameters...", expanded=True) as status:
-            if user_type == "Student":
-                st.write("Scanning wallet constraints...")
-            else:
-                st.write("Checking financial vitals...")
-            
-            time.sleep(0.5)
-            st.write("Consulting knowledge base...")
-            
-            # THE API CALL
-            advice_result = get_gemini_advice(ai_prompt, persona)
-            
-            status.update(label="Analysis Complete", state="complete", expanded=False)
-        
-        
+
+        if user_type == "Student":
+            st.caption("Scanning wallet constraints... Consulting knowledge base...")
+        else:
+            st.caption("Checking financial vitals... Consulting knowledge base...")
+
+        # Precomputed protocol for this profile tier, if the matrix has one
+        advice_result = None if protocol_context else lookup_advice(persona, selected_topic, st.session_state)
+
+        from_matrix = bool(advice_result)
+        if from_matrix:
+            st.markdown(advice_result)
+        else:
+            # THE API CALL (streamed token by token). Topic advice is asked for
+            # the profile's tier so the answer can fill that cell of the matrix.
+            prompt = ai_prompt if protocol_context else cell_prompt(persona, selected_topic, st.session_state)
+            try:
+                advice_result = st.write_stream(stream_advice(prompt, persona))
+            except Exception as e:
+                advice_result = advice_error_message(e)
+
         if "Traffic Overload" in advice_result:
              st.warning(advice_result, icon="⏳")
         elif "Connection Error" in advice_result:
              st.error(advice_result, icon="❌")
         else:
              st.success("Protocol Generated")
-             st.markdown(advice_result)
-             
+             if not (from_matrix or protocol_context):
+                 learn_advice(persona, selected_topic, st.session_state, advice_result)
+
              # Save to history so it doesn't vanish
-             st.session_state["last_advice"] = advice_result
+             put_value("last_advice", advice_result)
              st.session_state["last_advice_topic"] = selected_topic
 
 # History Display
-if "last_advice" in st.session_state and not protocol_context:
+last_advice = get_value("last_advice")
+if last_advice and not protocol_context:
     st.divider()
     st.caption(f"Previously generated for: {st.session_state.get('last_advice_topic', 'Unknown')}")
     with st.container(border=True):
-        st.markdown(st.session_state["last_advice"])
+        st.markdown(last_advice)
         if st.button("Clear History"):
-            del st.session_state["last_advice"]
+            drop_blob("last_advice")
             st.rerun()
\ No newline at end of file
@@ -1,20 +1,14 @@
 import streamlit as st
 import time
-import os
-import requests
-from io import BytesIO
-from streamlit_lottie import st_lottie
 
-# --- Library Checks (Graceful Fallbacks) ---
-try:
-    import google.generativeai as genai
-except ImportError:
-    genai = None
-
-try:
-    from gtts import gTTS
-except ImportError:
-    gTTS = None
+from audio_cache import synthesize
+from lottie_assets import render_lottie
+from tts_backends import audio_format
+from deep_scan import deep_scan
+from translation import LANG_CODES
+from insight import INSIGHT_TIMEOUT, cached_insight, submit_insight, fallback_insight
+from profile_model import commit, session_defaults
+from session_store import put_value
 
 try:
     from db_ops import save_profile
@@ -46,17 +40,6 @@ def initialize_state():
         "logged_in": False,             
         "profile_complete": False,      
         "user_type": "Student",         
-        "today_spend": 0.0,
-        "savings_buffer": 0.0,
-        "daily_limit": 100.0,
-        "monthly_income": 0.0,
-        "burn": 0.0,
-        "net_savings": 0.0,
-        "runway_days": 0,
-        "risk_score": 0,
-        "college_name": "Amity University",
-        "study_stream": "B.Tech CSE",
-        "student_note": "",
         "lang": "English",
         "advice_topic_context": None,
         # NEW STATE VARIABLES FOR CONFIRMATION
@@ -68,58 +51,20 @@ def initialize_state():
         if key not in st.session_state:
             st.session_state[key] = value
 
+    # Profile fields come from the model, for the current mode only.
+    for key, value in session_defaults(st.session_state["user_type"]).items():
+        if key not in st.session_state:
+            st.session_state[key] = value
+
 initialize_state()
 
 # ==========================================
 # 1. HELPER FUNCTIONS & ASSETS
 # ==========================================
 
-# Asset URLs
-LOTTIE_SAFE = "https://assets2.lottiefiles.com/packages/lf20_x62chJ.json"
-LOTTIE_CRITICAL = "https://assets10.lottiefiles.com/packages/lf20_qp1q7mct.json"
-
-@st.cache_data(ttl=3600)
-def load_lottieurl(url: str):
-    try:
-        r = requests.get(url, timeout=3)
-        if r.status_code != 200:
-            return None
-        return r.json()
-    except Exception:
-        return None
-
-@st.cache_data(ttl=3600)
-def get_gemini_dashboard_insight(income, burn, runway, risk_score):
-    if not genai:
-        return "⚠️ Gemini library missing."
-        
-    api_key = st.secrets.get("GEMINI_API_KEY") or os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        return "⚠️ Gemini Key missing. Unable to generate real-time insight."
-    
-    try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        prompt = (
-            f"Analyze this financial status: Monthly Income {income}, Monthly Burn {burn}, "
-            f"Survival Runway {runway} days, Risk Score {risk_score}/100. "
-            "Provide exactly ONE short, punchy sentence (max 20 words) of advice or warning. "
-            "Be direct. No preamble."
-        )
-        response = model.generate_content(prompt)
-        return response.text.strip()
-    except Exception:
-        return "sorry for inconvenience! ,gemini 2.5 flash's credit has been currently overused, please check again later."
-
 def speak_text(text):
-    if not gTTS:
-        return None
     try:
-        tts = gTTS(text=text, lang='en')
-        fp = BytesIO()
-        tts.write_to_fp(fp)
-        fp.seek(0)
-        return fp
+        return synthesize(text, "en")
     except Exception:
         return None
 
@@ -173,7 +118,7 @@ if user_type == "Student":
         st.write("") # Spacer
         if st.button("🔄 Reset Day", help="Resets 'Spent Today' to 0", use_container_width=True):
             st.session_state["today_spend"] = 0.0
-            save_profile({"today_spend": 0.0}) 
+            commit(st.session_state, save_profile, fields=("today_spend",))
             st.rerun()
 
     st.divider()
@@ -237,14 +182,14 @@ if user_type == "Student":
     with n_col1:
         if st.button("💾 Save Note", use_container_width=True):
             st.session_state["student_note"] = user_note
-            save_profile({"student_note": user_note})
+            commit(st.session_state, save_profile, fields=("student_note",))
             st.toast("Note saved!")
     with n_col2:
         if st.button("🔊 Read Aloud", use_container_width=True):
             if user_note.strip():
                 audio_fp = speak_text(user_note)
                 if audio_fp:
-                    st.audio(audio_fp, format='audio/mp3', autoplay=True)
+                    st.audio(audio_fp, format=audio_format(audio_fp), autoplay=True)
             else:
                 st.warning("Write something first!")
 
@@ -253,85 +198,89 @@ if user_type == "Student":
     # --- Quick Log ---
     st.subheader("⚡ Quick Log", help="Add your daily expenses here manually.")
     
-    with st.container(border=True):
-        if st.button("🔗 Auto-Track via Bank SMS", help="Link your bank SMS", use_container_width=True):
-            st.toast("🚀 Coming Soon: Account Aggregator Integration", icon="🚧")
+    def update_wallet(wallet_delta, spend_delta=0.0):
+        """The Quick Log's only link to the dashboard: apply the change, then redraw the metrics."""
+        st.session_state["savings_buffer"] += wallet_delta
+        st.session_state["today_spend"] += spend_delta
+        commit(st.session_state, save_profile, fields=("savings_buffer", "today_spend"))
+        st.rerun()
+
+    # Taps, the confirm step and cancel only rerun this fragment; the whole
+    # page reruns only when the wallet actually changes.
+    @st.fragment
+    def quick_log():
+        with st.container(border=True):
+            if st.button("🔗 Auto-Track via Bank SMS", help="Link your bank SMS", use_container_width=True):
+                st.toast("🚀 Coming Soon: Account Aggregator Integration", icon="🚧")
             
-        st.divider()
+            st.divider()
         
-        # --- SUCCESS MESSAGE DISPLAY ---
-        if st.session_state.get("show_success_msg"):
-             st.success("✅ Log Added Successfully! Dashboard Updated.", icon="💸")
-             # Reset the flag so it doesn't show forever (requires another rerun eventually or user action)
-             # For now, it stays until next action, which is fine for visibility.
-
-        # --- CONFIRMATION DIALOG LOGIC ---
-        pending_amt = st.session_state.get("pending_deduct")
-
-        if pending_amt is not None:
-            # Show Confirmation Box
-            st.warning(f"⚠️ **Wait!** Are you sure you want to log **₹{pending_amt}**?")
-            col_yes, col_no = st.columns(2)
+            # --- SUCCESS MESSAGE DISPLAY ---
+            if st.session_state.get("show_success_msg"):
+                 st.success("✅ Log Added Successfully! Dashboard Updated.", icon="💸")
+                 # Reset the flag so it doesn't show forever (requires another rerun eventually or user action)
+                 # For now, it stays until next action, which is fine for visibility.
+
+            # --- CONFIRMATION DIALOG LOGIC ---
+            pending_amt = st.session_state.get("pending_deduct")
+
+            if pending_amt is not None:
+                # Show Confirmation Box
+                st.warning(f"⚠️ **Wait!** Are you sure you want to log **₹{pending_amt}**?")
+                col_yes, col_no = st.columns(2)
             
-            with col_yes:
-                if st.button("✅ YES, CONFIRM", use_container_width=True, type="primary"):
-                    # Perform Deduction
-                    val = float(pending_amt)
-                    st.session_state["savings_buffer"] -= val
-                    st.session_state["today_spend"] += val
-                    save_profile({
-                        "savings_buffer": st.session_state["savings_buffer"],
-                        "today_spend": st.session_state["today_spend"]
-                    })
-                    # Clear pending and show success
-                    st.session_state["pending_deduct"] = None
-                    st.session_state["show_success_msg"] = True
-                    st.toast("Spending Recorded!", icon="📉")
-                    st.rerun()
+                with col_yes:
+                    if st.button("✅ YES, CONFIRM", use_container_width=True, type="primary"):
+                        # Clear pending and show success, then perform the deduction
+                        val = float(pending_amt)
+                        st.session_state["pending_deduct"] = None
+                        st.session_state["show_success_msg"] = True
+                        st.toast("Spending Recorded!", icon="📉")
+                        update_wallet(-val, spend_delta=val)
             
-            with col_no:
-                if st.button("❌ CANCEL", use_container_width=True):
-                    st.session_state["pending_deduct"] = None
-                    st.session_state["show_success_msg"] = False
-                    st.rerun()
-
-        else:
-            # Show Standard Buttons (Only visible if not confirming)
-            st.caption("Common Spends:")
-            qb1, qb2, qb3 = st.columns(3)
+                with col_no:
+                    if st.button("❌ CANCEL", use_container_width=True):
+                        st.session_state["pending_deduct"] = None
+                        st.session_state["show_success_msg"] = False
+                        st.rerun(scope="fragment")
+
+            else:
+                # Show Standard Buttons (Only visible if not confirming)
+                st.caption("Common Spends:")
+                qb1, qb2, qb3 = st.columns(3)
             
-            # These buttons now just set the 'pending_deduct' state
-            with qb1:
-                if st.button("☕ ₹50", use_container_width=True): 
-                    st.session_state["pending_deduct"] = 50.0
-                    st.rerun()
-            with qb2:
-                if st.button("🍔 ₹100", use_container_width=True): 
-                    st.session_state["pending_deduct"] = 100.0
-                    st.rerun()
-            with qb3:
-                if st.button("🚌 ₹30", use_container_width=True): 
-                    st.session_state["pending_deduct"] = 30.0
-                    st.rerun()
-
-            st.caption("Custom Entry:")
-            c_input, c_btn1, c_btn2 = st.columns([2, 1, 1])
-            with c_input:
-                amount = st.number_input("Amount (₹)", min_value=0.0, step=10.0, key="trans_amt")
-            with c_btn1:
-                if st.button("Spent", use_container_width=True):
-                    if amount > 0: 
-                        st.session_state["pending_deduct"] = amount
-                        st.rerun()
-            with c_btn2:
-                # "Got Cash" is positive, handle immediately or confirm? 
-                # Keeping it immediate for now as it adds money, less risky.
-                if st.button("Got Cash", use_container_width=True):
-                    if amount > 0:
-                        st.session_state["savings_buffer"] += amount
-                        save_profile({"savings_buffer": st.session_state["savings_buffer"]})
-                        st.toast("Cash Added!", icon="💰")
-                        st.rerun()
+                # These buttons now just set the 'pending_deduct' state
+                with qb1:
+                    if st.button("☕ ₹50", use_container_width=True): 
+                        st.session_state["pending_deduct"] = 50.0
+                        st.rerun(scope="fragment")
+                with qb2:
+                    if st.button("🍔 ₹100", use_container_width=True): 
+                        st.session_state["pending_deduct"] = 100.0
+                        st.rerun(scope="fragment")
+                with qb3:
+                    if st.button("🚌 ₹30", use_container_width=True): 
+                        st.session_state["pending_deduct"] = 30.0
+                        st.rerun(scope="fragment")
+
+                st.caption("Custom Entry:")
+                c_input, c_btn1, c_btn2 = st.columns([2, 1, 1])
+                with c_input:
+                    amount = st.number_input("Amount (₹)", min_value=0.0, step=10.0, key="trans_amt")
+                with c_btn1:
+                    if st.button("Spent", use_container_width=True):
+                        if amount > 0: 
+                            st.session_state["pending_deduct"] = amount
+                            st.rerun(scope="fragment")
+                with c_btn2:
+                    # "Got Cash" is positive, handle immediately or confirm? 
+                    # Keeping it immediate for now as it adds money, less risky.
+                    if st.button("Got Cash", use_container_width=True):
+                        if amount > 0:
+                            st.toast("Cash Added!", icon="💰")
+                            update_wallet(amount)
+
+    quick_log()
 
     # --- Navigation ---
     st.write("")
@@ -364,15 +313,15 @@ else:
     if risk >= 75 or runway <= 15:
         status_msg = "CRITICAL THREATS"
         status_color = "red"
-        lottie_url = LOTTIE_CRITICAL
+        lottie_name = "critical"
     elif risk >= 50 or runway <= 30:
         status_msg = "MONITORING RISKS"
         status_color = "orange"
-        lottie_url = LOTTIE_CRITICAL 
+        lottie_name = "critical"
     else:
         status_msg = "LIVELIHOOD SECURE"
         status_color = "green"
-        lottie_url = LOTTIE_SAFE
+        lottie_name = "safe"
 
     # --- Dashboard Header ---
     c1, c2 = st.columns([3, 1]) 
@@ -382,25 +331,23 @@ else:
         st.markdown(f"### Status: :{status_color}[{status_msg}]")
         
     with c2:
-        lottie_json = load_lottieurl(lottie_url)
-        if lottie_json:
-            st_lottie(lottie_json, height=150, key="sentinel_avatar")
-        else:
+        if not render_lottie(lottie_name, height=150, key="sentinel_avatar"):
             st.markdown("<h1>🛡️</h1>", unsafe_allow_html=True) 
 
     if st.button("🔍 Run Deep Scan", help="Analyze new alerts"):
         scan_placeholder = st.empty()
-        scan_logs = [
-            "> Initializing Sentinel Sat-Link...",
-            "> Connecting to RBI/SEBI Feeds...",
-            "> Decrypting Economic Data Streams...",
-            "> Analyzing User Risk Profile...",
-            "> THREATS DETECTED. GENERATING REPORT."
-        ]
-        for log in scan_logs:
-            scan_placeholder.markdown(f"```\n{log}\n```")
-            time.sleep(0.5) 
-        
+        scan_logs = ["> Initializing Sentinel Sat-Link..."]
+        scan_placeholder.markdown(f"```\n{scan_logs[0]}\n```")
+        scan_lang = LANG_CODES.get(st.session_state.get("voice_lang", st.session_state.get("lang", "English")), "en")
+
+        # Real pipeline: feeds, profile match, drills, decrypt + audio pre-warm, streamed as it runs.
+        for event in deep_scan(st.session_state, scan_lang):
+            scan_logs.append(f"> {event['message']}")
+            scan_placeholder.markdown("```\n" + "\n".join(scan_logs) + "\n```")
+            if event["stage"] == "done":
+                # News & Alerts renders from this instead of recomputing.
+                put_value("deep_scan", event["result"])
+
         scan_placeholder.empty() 
         st.switch_page("pages/news_alerts.py")
 
@@ -434,49 +381,78 @@ else:
          st.toast("🚀 Coming Soon: Account Aggregator Integration", icon="🚧")
 
     # --- EMERGENCY SIMULATOR ---
-    with st.expander("⚡ Simulate Emergency (Stress Test)", expanded=False):
-        st.caption("See what happens to your runway if a sudden cost hits today.")
+    # Reads the metrics, never writes them: every input and click stays inside the fragment.
+    @st.fragment
+    def emergency_simulator():
+        with st.expander("⚡ Simulate Emergency (Stress Test)", expanded=False):
+            st.caption("See what happens to your runway if a sudden cost hits today.")
         
-        sc1, sc2 = st.columns([2, 1])
-        with sc1:
-            shock_amount = st.number_input("Emergency Cost (₹)", min_value=0.0, value=50000.0, step=5000.0)
-        with sc2:
-            st.write("") 
-            st.write("")
-            simulate_btn = st.button("💥 Simulate", type="primary", use_container_width=True)
-
-        if simulate_btn:
-            temp_savings = net_savings - shock_amount
-            if burn > 0:
-                new_runway = int(temp_savings / (burn / 30))
-            else:
-                new_runway = 999
+            sc1, sc2 = st.columns([2, 1])
+            with sc1:
+                shock_amount = st.number_input("Emergency Cost (₹)", min_value=0.0, value=50000.0, step=5000.0)
+            with sc2:
+                st.write("") 
+                st.write("")
+                simulate_btn = st.button("💥 Simulate", type="primary", use_container_width=True)
+
+            if simulate_btn:
+                temp_savings = net_savings - shock_amount
+                if burn > 0:
+                    new_runway = int(temp_savings / (burn / 30))
+                else:
+                    new_runway = 999
             
-            if new_runway < 0: new_runway = 0
+                if new_runway < 0: new_runway = 0
             
-            st.markdown("### ⚠️ Impact Report")
-            c_before, c_after = st.columns(2)
-            c_before.metric("Current Runway", f"{runway} Days")
-            c_after.metric("Runway After Shock", f"{new_runway} Days", delta=f"{new_runway - runway} Days", delta_color="inverse")
+                st.markdown("### ⚠️ Impact Report")
+                c_before, c_after = st.columns(2)
+                c_before.metric("Current Runway", f"{runway} Days")
+                c_after.metric("Runway After Shock", f"{new_runway} Days", delta=f"{new_runway - runway} Days", delta_color="inverse")
             
-            if new_runway < 30:
-                st.error("Result: CRITICAL FAILURE. You need an Emergency Fund.")
-            else:
-                st.success("Result: SURVIVABLE. You have enough buffer.")
-                st.balloons()
+                if new_runway < 30:
+                    st.error("Result: CRITICAL FAILURE. You need an Emergency Fund.")
+                else:
+                    st.success("Result: SURVIVABLE. You have enough buffer.")
+                    st.balloons()
+
+    emergency_simulator()
 
     st.divider()
     
     # --- Gemini Analysis ---
     st.subheader("🤖 Gemini Analysis")
-    with st.container(border=True):
-        with st.spinner("Gemini is analyzing your live metrics..."):
-            ai_insight = get_gemini_dashboard_insight(income, burn, runway, risk)
-        
-        st.markdown(f"**Gemini Insight:** {ai_insight}")
-        if risk > 70:
-             st.caption("Action: Check 'Variable' expenses in Tracking immediately.")
-        
+
+    # The insight is computed off the script thread; the panel below is a
+    # fragment that polls for it, so the rest of the dashboard never waits.
+    ai_insight = cached_insight(income, burn, runway, risk)
+    if ai_insight is None:
+        insight_job, insight_started = submit_insight(income, burn, runway, risk)
+        insight_pending = not insight_job.done() and time.time() - insight_started < INSIGHT_TIMEOUT
+    else:
+        insight_job, insight_started, insight_pending = None, 0.0, False
+
+    @st.fragment(run_every=1 if insight_pending else None)
+    def gemini_insight_panel():
+        text = ai_insight
+        if text is None and insight_job.done():
+            text = insight_job.result()
+        with st.container(border=True):
+            if text is not None:
+                st.markdown(f"**Gemini Insight:** {text}")
+            elif time.time() - insight_started < INSIGHT_TIMEOUT:
+                st.caption("⏳ Gemini is analyzing your live metrics...")
+            else:
+                st.markdown(f"**Sentinel Insight:** {fallback_insight(runway, risk)}")
+                st.caption("Gemini is slow right now; this rule-based insight will be replaced next visit.")
+            if risk > 70:
+                 st.caption("Action: Check 'Variable' expenses in Tracking immediately.")
+
+        # Once resolved, one full rerun re-registers the panel without polling.
+        if insight_pending and (insight_job.done() or time.time() - insight_started >= INSIGHT_TIMEOUT):
+            st.rerun()
+
+    gemini_insight_panel()
+
     st.caption("Powered by Gemini 2.5 Flash • Real-time Calculation")
 
     # --- Footer Navigation ---
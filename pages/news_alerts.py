@@ -1,37 +1,18 @@
+import time
+
 import streamlit as st
-import xml.etree.ElementTree as ET
-from urllib.request import urlopen, Request
-import google.generativeai as genai
-import os
+from feeds import STREAM_RSS_MAP, RBI_FEED, SEBI_FEED, LIVELIHOOD_FEEDS, get_feed_store
+from dedup import collapse
+from relevance import profile_facets, facet_label
+from decrypt import decrypt_headline, decrypt_batch, lookup, prefetch
+from translation import LANG_CODES, cached_many, prefetch_many
+from prerender import prerender
+from session_store import drop_blob, get_value, put_value
+from drills import broke_advice_card, motivation_card, threat_simulations
+from deep_scan import fresh_result
 
 st.set_page_config(page_title="News & Alerts", page_icon="📰", layout="wide")
 
-# ==========================================
-# 0. CONFIG & STREAM MAP
-# ==========================================
-STREAM_RSS_MAP = {
-    "CSE / Tech": "https://www.sciencedaily.com/rss/computers_math/computer_science.xml",
-    "Finance / Commerce": "https://economictimes.indiatimes.com/markets/rssfeeds/1977021501.cms",
-    "Medical / Biology": "https://www.sciencedaily.com/rss/health_medicine.xml",
-    "Arts / Humanities": "https://indianexpress.com/section/lifestyle/art-and-culture/feed/",
-    "Law": "https://www.barandbench.com/route/feed.xml",
-    "Architecture": "https://www.archdaily.com/feed/rss/",
-    "Management (BBA/MBA)": "https://economictimes.indiatimes.com/small-biz/rssfeeds/5575607.cms",
-    "General": "https://indianexpress.com/section/education/feed/"
-}
-
-# Motivation Quotes Map (Field Specific)
-MOTIVATION_MAP = {
-    "CSE / Tech": "“Talk is cheap. Show me the code.” – Linus Torvalds",
-    "Finance / Commerce": "“Price is what you pay. Value is what you get.” – Warren Buffett",
-    "Medical / Biology": "“Wherever the art of Medicine is loved, there is also a love of Humanity.”",
-    "Arts / Humanities": "“Creativity takes courage.” – Henri Matisse",
-    "Law": "“Justice cannot be for one side alone, but must be for both.”",
-    "Architecture": "“We shape our buildings; thereafter they shape us.”",
-    "Management (BBA/MBA)": "“Leadership is the capacity to translate vision into reality.”",
-    "General": "“The expert in anything was once a beginner.”"
-}
-
 # ==========================================
 # 1. AUTH & SECURITY
 # ==========================================
@@ -40,35 +21,57 @@ if not st.session_state.get("logged_in", False):
     st.stop()
 
 # ==========================================
-# 2. AI HELPER
+# 2. RENDER HELPERS
 # ==========================================
-def ask_gemini_decrypt(headline):
-    api_key = st.secrets.get("GEMINI_API_KEY") or os.getenv("GEMINI_API_KEY")
-    if not api_key: return "⚠️ API Key missing."
+def render_decrypt(title, key):
+    decrypted = get_value("decrypted", {})
+    if title in decrypted:
+        st.info(decrypted[title])
+    elif st.button("✨ Decrypt", key=key):
+        # A cache hit after a Deep Scan or "Decrypt All" (or a background prefetch, if enabled).
+        cached = lookup(title, count=True)
+        if cached:
+            st.info(cached)
+        else:
+            with st.spinner(".."):
+                st.info(decrypt_headline(title))
 
+def render_feed(snapshot, items, key_prefix, limit=3):
+    if items is None:
+        st.caption("⏳ Syncing feed... check back in a moment.")
+        return
+    if not items:
+        if snapshot["items"]:
+            st.caption("Same stories as the other column.")
+        else:
+            st.caption("No live updates.")
+        return
+    if snapshot["stale"]:
+        st.caption(f"🕒 Showing saved copy from {snapshot['age_seconds'] // 60} min ago. Refreshing in background...")
+    lang_code = LANG_CODES.get(st.session_state.get("lang", "English"), "en")
+    titles = [item["title"] for item in items[:limit]]
+    # Only cached translations render; the rest are fetched in the background
+    # and show up on a later rerun. Until then the original title stands alone.
+    translated = cached_many(titles, lang_code)
+    prefetch_many([t for t, tr in zip(titles, translated) if tr is None], lang_code)
+    for i, item in enumerate(items[:limit]):
+        with st.container(border=True):
+            st.markdown(f"[{item['title']}]({item['link']})")
+            if translated[i] and translated[i] != " ".join(item["title"].split()):
+                st.caption(translated[i])
+            also_in = feed_store.also_in(item)
+            if also_in:
+                st.caption(f"📎 Also reported by {', '.join(also_in)}")
+            render_decrypt(item['title'], f"{key_prefix}_{i}")
+
+@st.cache_data(ttl=60)
+def load_news_alerts():
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-flash-latest')
-        prompt = f"Translate this news headline into 1 simple, urgent sentence for a common person: '{headline}'"
-        response = model.generate_content(prompt)
-        return response.text.strip()
-    except:
-        return "Could not decrypt. Server busy."
-
-@st.cache_data(ttl=600)
-def fetch_rss(url, limit=3):
-    try:
-        req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with urlopen(req, timeout=5) as resp:
-            root = ET.fromstring(resp.read())
-        items = []
-        for item in root.findall(".//item")[:limit]:
-            title = item.findtext("title")
-            link = item.findtext("link")
-            if title: items.append({"title": title, "link": link})
-        return items
+        from db_ops import load_alerts
+        alerts = [a for a in load_alerts() if a.get("id", "").startswith("news_")]
     except Exception:
         return []
+    return sorted(alerts, key=lambda a: a.get("created_at", ""), reverse=True)
 
 # ==========================================
 # 3. ROUTING LOGIC
@@ -89,65 +92,89 @@ st.divider()
 # 4. LIVE NEWS FEED
 # ==========================================
 st.subheader("📡 Live Feed")
+feed_store = get_feed_store()
+
+if user_type == "Student":
+    target_feed = STREAM_RSS_MAP.get(stream, STREAM_RSS_MAP["General"])
+    sec_feed = STREAM_RSS_MAP["General"]
+else:
+    target_feed = RBI_FEED
+    sec_feed = SEBI_FEED
+
+main_snap = feed_store.snapshot(target_feed)
+sec_snap = feed_store.snapshot(sec_feed)
+
+# Same story from both feeds is shown once, in the left column.
+main_items, sec_items = collapse([main_snap["items"], sec_snap["items"]])
+if main_snap["items"] is None:
+    main_items = None
+if sec_snap["items"] is None:
+    sec_items = None
+
+# A recent Deep Scan from the dashboard already did the matching and decrypting.
+scan = fresh_result(get_value("deep_scan")) if user_type != "Student" else None
+if scan:
+    put_value("decrypted", {**scan["decrypted"], **get_value("decrypted", {})})
+    st.caption(f"🔍 Results from your Deep Scan {int(time.time() - scan['finished_at']) // 60} min ago.")
+
+matches = []
+if scan:
+    matches = scan["matches"]
+elif user_type != "Student":
+    matches = feed_store.relevance.top_k(profile_facets(st.session_state), k=3, groups=set(LIVELIHOOD_FEEDS))
+    matches = [m for m in matches if m["score"] >= 1.0]
+
+# One batched model call covers every headline on the page.
+visible = [i["title"] for i in (main_items or [])[:3] + (sec_items or [])[:3] + [m["item"] for m in matches]]
+prefetch(visible)  # no-op unless DECRYPT_PREFETCH is on
+if visible and st.button("✨ Decrypt All", help="Explain every headline on this page in one go"):
+    with st.spinner("Decrypting headlines..."):
+        put_value("decrypted", {**get_value("decrypted", {}), **decrypt_batch(visible)})
+
 col1, col2 = st.columns(2)
 
 with col1:
     if user_type == "Student":
-        target_feed = STREAM_RSS_MAP.get(stream, STREAM_RSS_MAP["General"])
         st.markdown(f"**🎓 Industry Updates ({stream.split('/')[0]})**")
     else:
-        target_feed = "https://www.rbi.org.in/pressreleases_rss.xml"
         st.markdown("**🏦 Economy & Policy (RBI)**")
 
-    news_items = fetch_rss(target_feed, 3)
-    if news_items:
-        for i, item in enumerate(news_items):
-            with st.container(border=True):
-                st.markdown(f"[{item['title']}]({item['link']})")
-                if st.button("✨ Decrypt", key=f"d1_{i}"):
-                    with st.spinner(".."):
-                        st.info(ask_gemini_decrypt(item['title']))
-    else:
-        st.caption("No live updates.")
+    render_feed(main_snap, main_items, "d1")
 
 with col2:
     if user_type == "Student":
         st.markdown("**🏫 General Education News**")
-        sec_feed = STREAM_RSS_MAP["General"]
     else:
         st.markdown("**📈 Market Signals (SEBI)**")
-        sec_feed = "https://www.sebi.gov.in/sebirss.xml"
 
-    sec_items = fetch_rss(sec_feed, 3)
-    if sec_items:
-        for i, item in enumerate(sec_items):
-            with st.container(border=True):
-                st.markdown(f"[{item['title']}]({item['link']})")
-                if st.button("✨ Decrypt", key=f"d2_{i}"):
-                    with st.spinner(".."):
-                        st.info(ask_gemini_decrypt(item['title']))
-    else:
-        st.caption("No live updates.")
+    render_feed(sec_snap, sec_items, "d2")
+
+# ---- Personalised matches (Standard) ----
+if matches:
+    st.markdown("**🎯 Relevant to You**")
+    for i, m in enumerate(matches):
+        item = m["item"]
+        with st.container(border=True):
+            st.markdown(f"[{item['title']}]({item['link']})")
+            why = ", ".join(dict.fromkeys(facet_label(f) for f in m["facets"]))
+            st.caption(f"Why this applies: affects {why} • {item['source']}")
+            render_decrypt(item['title'], f"d3_{i}")
 
 st.divider()
 
 # ==========================================
 # 5. CARDS: MOTIVATION vs DRILLS
 # ==========================================
+# Briefings on this page are rendered to audio in the background, in the Voice page's language.
+voice_lang = LANG_CODES.get(st.session_state.get("voice_lang", st.session_state.get("lang", "English")), "en")
+
 if user_type == "Student":
     st.subheader("🚀 Daily Boost")
     st.caption("Fuel for your mind and wallet.")
     
-    # 1. Motivation Card
-    quote = MOTIVATION_MAP.get(stream, MOTIVATION_MAP["General"])
-    
-    # Object for Voice Engine
-    motivation_obj = {
-        "id": "daily_motivation",
-        "title": f"Study Motivation ({stream.split('/')[0]})",
-        "summary": quote,
-        "desc": "Daily inspiration for your field."
-    }
+    # 1. Motivation Card (object doubles as the Voice Engine briefing)
+    motivation_obj = motivation_card(stream)
+    quote = motivation_obj["summary"]
 
     with st.container(border=True):
         c_icon, c_info = st.columns([0.1, 0.9])
@@ -161,23 +188,17 @@ if user_type == "Student":
             
             if st.button("🎙️ Listen", key="btn_voice_mot"):
                 
-                st.session_state.pop("voice_audio_mp3", None)
-                st.session_state.pop("translated_script", None)
+                st.session_state.pop("voice_audio", None)
+                drop_blob("translated_script")
                 st.session_state.pop("voice_script", None)
                 
                 
                 st.session_state["voice_selected_alert_id"] = "daily_motivation"
-                st.session_state["alerts"] = [motivation_obj] 
+                put_value("alerts", [motivation_obj])
                 st.switch_page("pages/voice.py")
 
     # 2. Financial Advice Card (Compassionate)
-    advice_text = "Never be ashamed of not having money. It is a temporary stage, not your identity. Save what you can. If you really need to borrow, ask close friends or family—there is always someone willing to help."
-    advice_obj = {
-        "id": "financial_advice_note",
-        "title": "Sentinel Advice: On Being Broke",
-        "summary": advice_text,
-        "desc": "Financial mental health check."
-    }
+    advice_obj = broke_advice_card()
 
     with st.container(border=True):
         c_icon, c_info = st.columns([0.1, 0.9])
@@ -191,45 +212,53 @@ if user_type == "Student":
             
             if st.button("🎙️ Listen", key="btn_voice_adv"):
                 
-                st.session_state.pop("voice_audio_mp3", None)
-                st.session_state.pop("translated_script", None)
+                st.session_state.pop("voice_audio", None)
+                drop_blob("translated_script")
                 st.session_state.pop("voice_script", None)
                 
                 
                 st.session_state["voice_selected_alert_id"] = "financial_advice_note"
-                st.session_state["alerts"] = [advice_obj]
+                put_value("alerts", [advice_obj])
                 st.switch_page("pages/voice.py")
 
+    prerender([motivation_obj, advice_obj], voice_lang)
+
 else:
+    # --- STANDARD MODE: LIVE ALERTS (from the news pipeline) ---
+    resolved = st.session_state.get("resolved_alert_ids", set())
+    live_alerts = [a for a in load_news_alerts() if a["id"] not in resolved][:5]
+    color_map = {"CRITICAL": "red", "WARNING": "orange", "ADVISORY": "blue"}
+
+    if live_alerts:
+        st.subheader("🛰️ Sentinel Alerts")
+        st.caption("Generated from live RBI/SEBI/market feeds for your profile.")
+        for alert in live_alerts:
+            color = color_map.get(alert.get("level"), "gray")
+            with st.container(border=True):
+                c_icon, c_info = st.columns([0.1, 0.9])
+                with c_icon:
+                    st.markdown(f"## {alert.get('icon', '📢')}")
+                with c_info:
+                    st.markdown(f":{color}[**{alert['title']}**]")
+                    st.write(alert["summary"])
+                    st.caption(alert.get("desc", ""))
+                    if st.button("🎙️ Listen", key=f"btn_voice_{alert['id']}"):
+                        st.session_state.pop("voice_audio", None)
+                        drop_blob("translated_script")
+                        st.session_state.pop("voice_script", None)
+
+                        st.session_state["voice_selected_alert_id"] = alert["id"]
+                        put_value("alerts", live_alerts)
+                        st.switch_page("pages/voice.py")
+        st.divider()
+
     # --- STANDARD MODE: KEEPS DRILLS ---
     st.subheader("🚨 Threat Simulations")
     st.caption("Potential scenarios to test your resilience.")
 
-    simulations = []
-    crops = st.session_state.get("crops_grown", [])
-    transport = int(st.session_state.get("transport", 0))
-    emi_total = int(st.session_state.get("emi_total", 0))
-
-    if transport > 0:
-        simulations.append({
-            "id": "fuel_drill", "icon": "⛽", "title": "Fuel Supply Shock",
-            "desc": "Global oil prices spike by 15%.",
-            "summary": f"Impact: Transport cost rises by ~₹{int(transport*0.15)}.", "level": "WARNING"
-        })
-
-    if emi_total > 0:
-        simulations.append({
-            "id": "rate_drill", "icon": "📉", "title": "Interest Rate Surge",
-            "desc": "Repo rate raised by 50bps.",
-            "summary": "Loan tenure might increase by 6-12 months.", "level": "CRITICAL"
-        })
-
-    if not simulations:
-        simulations.append({
-            "id": "inflation_drill", "icon": "🛒", "title": "Cost of Living Spike",
-            "desc": "Vegetable prices double.",
-            "summary": "Buying power reduced. Cut discretionary spend.", "level": "ADVISORY"
-        })
+    simulations = scan["simulations"] if scan else threat_simulations(st.session_state)
+
+    prerender(live_alerts + simulations, voice_lang)
 
     for sim in simulations:
         color_map = {"CRITICAL": "red", "WARNING": "orange", "ADVISORY": "blue"} 
@@ -247,12 +276,12 @@ else:
                 with b1:
                     if st.button("🎙️ Listen", key=f"btn_voice_{sim['id']}", use_container_width=True):
                         
-                        st.session_state.pop("voice_audio_mp3", None)
-                        st.session_state.pop("translated_script", None)
+                        st.session_state.pop("voice_audio", None)
+                        drop_blob("translated_script")
                         st.session_state.pop("voice_script", None)
 
                         st.session_state["voice_selected_alert_id"] = sim["id"]
-                        st.session_state["alerts"] = simulations
+                        put_value("alerts", simulations)
                         st.switch_page("pages/voice.py")
                 with b2:
                      if st.button("💡 Protocol", key=f"btn_advice_{sim['id']}", use_container_width=True):
@@ -22,6 +22,114 @@ except Exception as e:
 
 st.divider()
 
+# ---- Feed health ----
+st.subheader("Feed Health")
+from feeds import get_feed_store
+
+feed_rows = []
+for row in get_feed_store().stats():
+    age = row["age_seconds"]
+    feed_rows.append({
+        "Feed": row["feed"],
+        "Items": row["items"],
+        "Last refresh": f"{age // 60}m {age % 60}s ago" if age is not None else "pending",
+        "Errors": row["errors"],
+        "Circuit": row["breaker"],
+        "Last error": row["last_error"] or "",
+    })
+st.dataframe(feed_rows, use_container_width=True, hide_index=True)
+
+from alert_pipeline import get_alert_pipeline
+
+pipe = get_alert_pipeline().stats
+st.caption(
+    f"Alert pipeline: {pipe['runs']} runs • {pipe['items']} new items • "
+    f"{pipe['alerts']} alerts • {pipe['errors']} errors"
+    + (f" (last: {pipe['last_error']})" if pipe["last_error"] else "")
+)
+
+from llm_cache import get_llm_cache
+
+llm = get_llm_cache().stats()
+st.caption(
+    f"Gemini cache: {llm['entries']} entries • {llm['bytes'] // 1024} KB • "
+    f"hit ratio {llm['hit_ratio']:.0%} ({llm['hits']} hits / {llm['misses']} misses)"
+)
+for site, site_stats in llm["sites"].items():
+    st.caption(f"• {site}: {site_stats['hit_ratio']:.0%} hit ratio ({site_stats['hits']} / {site_stats['hits'] + site_stats['misses']})")
+
+from llm_metrics import METRICS_PATH, get_metrics
+
+snap = get_metrics().snapshot()
+metric_rows = []
+for site, m in snap["sites"].items():
+    metric_rows.append({
+        "Site": site,
+        "Lookups": m["calls"],
+        "Hits": m["hits"],
+        "Model calls": m["misses"],
+        "Coalesced": m["coalesced"],
+        "Errors": m["errors"],
+        "Retries": m["retries"],
+        "Tokens in/out": f"{m['prompt_tokens']} / {m['response_tokens']}",
+        "Cost (USD)": f"{m['cost_usd']:.4f}",
+        "p50 ms": m["p50_ms"],
+        "p95 ms": m["p95_ms"],
+    })
+if metric_rows:
+    st.dataframe(metric_rows, use_container_width=True, hide_index=True)
+    with st.expander("Most expensive prompts (last hour)"):
+        for p in snap["top_prompts"]:
+            st.caption(f"• {p['site']}: {p['tokens']} tokens over {p['calls']} calls — {p['prompt']}…")
+st.caption(f"Model metrics (last {snap['window_seconds'] // 60} min) are also written to {METRICS_PATH}")
+
+from audio_cache import get_audio_cache
+
+au = get_audio_cache().stats()
+st.caption(
+    f"Voice audio cache: {au['entries']} clips • {au['bytes'] // 1024} KB • "
+    f"hit ratio {au['hit_ratio']:.0%} ({au['hits']} hits / {au['misses']} misses)"
+)
+
+from translation import get_translator
+
+tr = get_translator().stats()
+st.caption(
+    f"Translation cache: {tr['entries']} sentences • {tr['hit_ratio']:.0%} served from cache • "
+    f"{tr['requests']} network requests • {tr['failures']} failures ({tr['backing_off']} backing off)"
+)
+
+from prerender import get_prerenderer
+
+pr = get_prerenderer()
+st.caption(
+    f"Briefing pre-render: {pr.stats['rendered']} rendered • {pr.stats['already_cached']} already cached • "
+    f"{pr.stats['failed']} failed • {pr.backlog()} queued"
+)
+
+from session_store import drop_blob, drop_session, get_blob_store, session_id
+
+bs = get_blob_store().stats()
+st.caption(
+    f"Session blobs: {bs['blobs']} shared • {bs['bytes'] // 1024} KB across {bs['sessions']} sessions • "
+    f"this session {get_blob_store().session_bytes(session_id()) // 1024} KB • {bs['evictions']} evicted"
+)
+
+from singleflight import get_flight
+
+fl = get_flight().stats()
+st.caption(f"Request coalescing: {fl['leaders']} upstream calls served {fl['followers']} extra waiters • {fl['in_flight']} in flight")
+
+from insight import bucket_stats
+
+ib = bucket_stats()
+st.caption(
+    f"Dashboard insight buckets: {ib['distinct_inputs']} distinct inputs → "
+    f"{ib['distinct_buckets']} cache keys over {ib['calls']} lookups"
+)
+
+st.divider()
+
 
 st.subheader("Language")
 st.write(f"Current language: **{st.session_state.get('lang', 'English')}**")
@@ -29,6 +137,7 @@ st.caption("Change language from the sidebar dropdown (top-left).")
 
 st.write("")
 st.subheader("Reset / Logout")
+from profile_model import reset_session
 
 with st.container(border=True):
     st.write("Use this if you want to restart the demo from scratch.")
@@ -38,46 +147,24 @@ with st.container(border=True):
     with c1:
         if st.button("Reset demo (clear profile + alerts)", use_container_width=True):
             
+            # Profile fields come from the model; these are the session caches built on top of them.
             keys_to_clear = [
-                "profile_complete",
-                "monthly_income",
-                "savings_buffer",
-                "rent",
-                "food",
-                "transport",
-                "utilities",
-                "education",
-                "medical",
-                "emi_total",
-                "burn",
-                "net_savings",
-                "runway_days",
-                "risk_score",
-                "alerts",
                 "resolved_alert_ids",
                 "voice_selected_alert_id",
                 "voice_script",
-                # New keys added below
-                "crops_grown",
-                "held_assets",
-                "livelihood_sources",
-                "assets",
-                "alert_channels",
-                "local_language",
-                "fixed_monthly",
-                "gig_avg_monthly",
-                "farm_avg_monthly",
-                "business_avg_monthly",
-                "crop_input_cost",
-                "sip",
-                "portfolio_value"
+                "voice_audio",
             ]
+            reset_session(st.session_state)
             for k in keys_to_clear:
                 st.session_state.pop(k, None)
+            # Large payloads live in the blob store; the session only holds their keys.
+            for k in ("alerts", "translated_script", "deep_scan", "decrypted"):
+                drop_blob(k)
             st.rerun()
 
     with c2:
         if st.button("Logout (clear everything)", type="primary", use_container_width=True):
+            drop_session()
             st.session_state.clear()
             st.rerun()
 
@@ -1,6 +1,8 @@
 import streamlit as st
 import time
 
+from profile_model import StandardProfile, StudentProfile, commit, from_dict, to_dict, to_session
+
 st.set_page_config(page_title="Tracking", page_icon=":material/account_balance_wallet:")
 
 # ==========================================
@@ -231,6 +233,58 @@ alert_channels = st.multiselect("Alerts", ["Text", "Voice"], default=["Text"])
 # ==========================================
 if st.button("🚀 Activate Sentinel", type="primary", use_container_width=True):
     
+    if "Student" in user_type:
+        burn, runway, risk = compute_student_stats(current_wallet, daily_limit)
+        profile = StudentProfile(
+            monthly_income=student_allowance,
+            savings_buffer=current_wallet,
+            burn=burn,
+            runway_days=runway,
+            risk_score=risk,
+            college_name=college_name,
+            study_stream=study_stream,
+            daily_limit=daily_limit,
+            today_spend=st.session_state.get("today_spend", 0.0),
+            student_note=st.session_state.get("student_note", ""),
+        )
+        
+    else:
+        burn, net_savings, runway, risk = compute_standard_stats(
+            monthly_income, rent, food, transport, utilities, emi_total, savings_buffer
+        )
+        profile = StandardProfile(
+            monthly_income=monthly_income,
+            savings_buffer=savings_buffer,
+            burn=burn,
+            runway_days=runway,
+            risk_score=risk,
+            livelihood_sources=livelihood_sources,
+            fixed_monthly=fixed_monthly,
+            gig_avg_monthly=gig_avg_monthly,
+            farm_avg_monthly=farm_avg_monthly,
+            production_type=production_type,
+            crop_input_cost=crop_input_cost,
+            crops_grown=crops_grown,
+            held_assets=held_assets,
+            sip=sip,
+            rent=rent,
+            food=food,
+            transport=transport,
+            utilities=utilities,
+            education=st.session_state.get("education", 0.0),
+            medical=st.session_state.get("medical", 0.0),
+            emi_total=emi_total,
+            net_savings=net_savings,
+        )
+
+    # Round-trip through the model so every field is coerced to its declared type.
+    profile = from_dict(to_dict(profile))
+    problems = profile.validate()
+    if problems:
+        for problem in problems:
+            st.error(problem)
+        st.stop()
+
     with st.status("🔄 Configuring Sentinel Core...", expanded=True) as status:
         if "Student" in user_type:
             st.write("Calibrating Student Budget...")
@@ -245,74 +299,12 @@ if st.button("🚀 Activate Sentinel", type="primary", use_container_width=True)
         st.write("Saving Profile Encrypted...")
         status.update(label="✅ Setup Complete!", state="complete", expanded=False)
 
-    if "Student" in user_type:
-        st.session_state["user_type"] = "Student"
-        st.session_state["college_name"] = college_name
-        st.session_state["study_stream"] = study_stream
-        st.session_state["monthly_income"] = student_allowance
-        st.session_state["savings_buffer"] = current_wallet 
-        st.session_state["daily_limit"] = daily_limit
-        st.session_state["rent"] = 0
-        st.session_state["food"] = 0
-        st.session_state["emi_total"] = 0
-        st.session_state["transport"] = 0
-        
-        burn, runway, risk = compute_student_stats(current_wallet, daily_limit)
-        
-    else:
-        st.session_state["user_type"] = "Standard"
-        st.session_state["livelihood_sources"] = livelihood_sources
-        st.session_state["fixed_monthly"] = fixed_monthly
-        st.session_state["gig_avg_monthly"] = gig_avg_monthly
-        st.session_state["farm_avg_monthly"] = farm_avg_monthly
-        st.session_state["production_type"] = production_type
-        st.session_state["crop_input_cost"] = crop_input_cost
-        st.session_state["crops_grown"] = crops_grown
-        st.session_state["held_assets"] = held_assets
-        st.session_state["sip"] = sip
-        
-        st.session_state["monthly_income"] = monthly_income
-        st.session_state["savings_buffer"] = savings_buffer
-        st.session_state["rent"] = rent
-        st.session_state["food"] = food
-        st.session_state["transport"] = transport
-        st.session_state["utilities"] = utilities
-        st.session_state["emi_total"] = emi_total
-        
-        burn, net_savings, runway, risk = compute_standard_stats(
-            monthly_income, rent, food, transport, utilities, emi_total, savings_buffer
-        )
-        st.session_state["net_savings"] = net_savings
-
-    st.session_state["burn"] = burn
-    st.session_state["runway_days"] = runway
-    st.session_state["risk_score"] = risk
+    to_session(st.session_state, profile)
     st.session_state["profile_complete"] = True
     
     from db_ops import save_profile
     
-    profile_data = {
-        "user_type": st.session_state["user_type"],
-        "monthly_income": st.session_state["monthly_income"],
-        "burn": st.session_state["burn"],
-        "runway_days": st.session_state["runway_days"],
-        "savings_buffer": st.session_state["savings_buffer"],
-    }
-    
-    if st.session_state["user_type"] == "Student":
-        profile_data.update({
-            "college_name": st.session_state["college_name"],
-            "study_stream": st.session_state["study_stream"],
-            "daily_limit": st.session_state["daily_limit"]
-        })
-    else:
-        profile_data.update({
-            "crops_grown": st.session_state["crops_grown"],
-            "held_assets": st.session_state["held_assets"],
-            "emi_total": st.session_state["emi_total"]
-        })
-
-    save_profile(profile_data)
+    commit(st.session_state, save_profile, full=True)
 
     st.success(f"Sentinel active in {st.session_state['user_type']} Mode.")
     time.sleep(1)
@@ -1,11 +1,15 @@
 import streamlit as st
-from gtts import gTTS
-from io import BytesIO
-from deep_translator import GoogleTranslator
-import requests
-from streamlit_lottie import st_lottie
 import time
 
+from translation import LANG_CODES, TranslationError, translate
+from tts import synthesize_chunks
+from tts_backends import audio_format, join_audio
+from audio_cache import get_audio_cache
+from prerender import briefing_script, cached_briefing, prerender
+from session_store import drop_blob, get_value, put_value
+from lottie_assets import render_lottie
+from drills import broke_advice_card, motivation_card, threat_simulations
+
 st.set_page_config(
     page_title="Voice Assistant",
     page_icon="🎙️",
@@ -13,22 +17,9 @@ st.set_page_config(
 )
 
 # ==========================================
-# 1. SETUP & ASSETS
+# 1. AUTH
 # ==========================================
 
-# ---- Lottie Loader ----
-@st.cache_data
-def load_lottieurl(url: str):
-    try:
-        r = requests.get(url)
-        if r.status_code != 200:
-            return None
-        return r.json()
-    except:
-        return None
-
-lottie_voice = load_lottieurl("https://lottie.host/17158f55-1b4e-4df7-8326-9f880482592d/0F7e8eX4l4.json")
-
 if not st.session_state.get("logged_in", False):
     st.warning("Please login as demo to continue.")
     st.stop()
@@ -41,77 +32,19 @@ user_type = st.session_state.get("user_type", "Standard")
 # --- CASE A: STUDENT MODE ---
 if user_type == "Student":
     stream = st.session_state.get("study_stream", "General")
-    
-    MOTIVATION_MAP = {
-        "CSE / Tech": "“Talk is cheap. Show me the code.” – Linus Torvalds",
-        "Finance / Commerce": "“Price is what you pay. Value is what you get.” – Warren Buffett",
-        "Medical / Biology": "“Wherever the art of Medicine is loved, there is also a love of Humanity.”",
-        "Arts / Humanities": "“Creativity takes courage.” – Henri Matisse",
-        "Law": "“Justice cannot be for one side alone, but must be for both.”",
-        "Architecture": "“We shape our buildings; thereafter they shape us.”",
-        "Management (BBA/MBA)": "“Leadership is the capacity to translate vision into reality.”",
-        "General": "“The expert in anything was once a beginner.”"
-    }
-    
-    quote = MOTIVATION_MAP.get(stream, MOTIVATION_MAP["General"])
-    
-    
-    st.session_state["alerts"] = [
-        {
-            "id": "daily_motivation",
-            "title": f"Study Motivation ({stream.split('/')[0]})",
-            "summary": quote,
-            "desc": "Daily inspiration for your field."
-        },
-        {
-            "id": "financial_advice_note",
-            "title": "Sentinel Advice: On Being Broke",
-            "summary": "Never be ashamed of not having money. It is a temporary stage, not your identity. Save what you can. If you really need to borrow, ask close friends or family—there is always someone willing to help.",
-            "desc": "Financial mental health check."
-        }
-    ]
+    put_value("alerts", [motivation_card(stream), broke_advice_card()])
 
 # --- CASE B: STANDARD MODE (The Fix) ---
 else:
     
-    current_alerts = st.session_state.get("alerts", [])
+    current_alerts = get_value("alerts", [])
     if current_alerts and current_alerts[0]["id"] == "daily_motivation":
         current_alerts = [] # Wipe them
         
     
     if not current_alerts:
-        transport = int(st.session_state.get("transport", 0))
-        emi_total = int(st.session_state.get("emi_total", 0))
-        
-        standard_drills = []
-        
-        
-        if transport > 0:
-            standard_drills.append({
-                "id": "fuel_drill",
-                "title": "Fuel Supply Shock",
-                "summary": f"Global oil prices have spiked. Your estimated transport cost will rise by ₹{int(transport*0.15)}. Consider pooling or public transit.",
-                "desc": "Impact Analysis: Moderate"
-            })
-            
-    
-        if emi_total > 0:
-            standard_drills.append({
-                "id": "rate_drill",
-                "title": "Interest Rate Surge",
-                "summary": "The Central Bank has raised rates. Your loan tenure may extend by 6-12 months. Pre-payment is advised if possible.",
-                "desc": "Impact Analysis: Critical"
-            })
-            
-        
-        standard_drills.append({
-            "id": "inflation_drill",
-            "title": "Cost of Living Report",
-            "summary": "Vegetable and utility prices are trending up 8%. It is advised to cut discretionary spending this week to maintain your runway.",
-            "desc": "General Advisory"
-        })
-        
-        st.session_state["alerts"] = standard_drills
+        # Same drills the News page and Deep Scan pre-render.
+        put_value("alerts", threat_simulations(st.session_state))
 
 # ==========================================
 # 3. UI & LOGIC
@@ -127,14 +60,13 @@ with c1:
         st.caption("Daily Briefing & Risk Simulation Audio.")
 
 # ---- Language Selector ----
-LANG_MAP = {
-    "English": "en",
-    "Hindi": "hi",
-    "Kannada": "kn",
-    "Tamil": "ta",
-    "Telugu": "te"
-}
-selected_lang_name = st.selectbox("Broadcast Language", list(LANG_MAP.keys()), index=0)
+LANG_MAP = LANG_CODES
+# "voice_lang" outlives this page (News and Home read it); the widget's own
+# key is dropped by Streamlit whenever the Voice page isn't rendered.
+if "voice_lang_select" not in st.session_state:
+    st.session_state["voice_lang_select"] = st.session_state.get("voice_lang", st.session_state.get("lang", "English"))
+selected_lang_name = st.selectbox("Broadcast Language", list(LANG_MAP.keys()), key="voice_lang_select")
+st.session_state["voice_lang"] = selected_lang_name
 target_code = LANG_MAP[selected_lang_name]
 
 st.divider()
@@ -146,7 +78,7 @@ left_col, right_col = st.columns([1, 1])
 
 
 with left_col:
-    alerts = st.session_state.get("alerts", [])
+    alerts = get_value("alerts", [])
     
     if not alerts:
         st.info("No active briefings available.")
@@ -174,27 +106,47 @@ with left_col:
     
     target_alert = alerts[selected_idx]
     
-    # Detect Switch:
-    if target_alert["id"] != st.session_state.get("current_voice_id_rendering"):
-        st.session_state.pop("voice_audio_mp3", None)
-        st.session_state["current_voice_id_rendering"] = target_alert["id"]
+    # Detect Switch (alert or language):
+    rendering = f"{target_alert['id']}:{target_code}"
+    if rendering != st.session_state.get("current_voice_id_rendering"):
+        st.session_state.pop("voice_audio", None)
+        drop_blob("translated_script")
+        st.session_state["current_voice_id_rendering"] = rendering
 
         st.session_state["voice_selected_alert_id"] = target_alert["id"]
 
     # ---- GENERATOR LOGIC ----
     
+    # Render every briefing x language in the background, this one first.
+    prerender(alerts, target_code, target_alert["id"])
+
     # 1. Build Raw Script
-    raw_script = f"Hello. Here is your briefing for: {target_alert['title']}. \n\n {target_alert['summary']} \n\n {target_alert.get('desc', '')}"
-    
-    # 2. Check if we have Audio in memory
-    audio_data = st.session_state.get("voice_audio_mp3")
+    raw_script = briefing_script(target_alert)
+    
+    # 2. Check if we have Audio already (or rendered in the background)
+    # The session only holds the audio cache key; the clip stays on disk.
+    audio_cache = get_audio_cache()
+    audio_key = st.session_state.get("voice_audio")
+    if audio_key is None:
+        ready = cached_briefing(target_alert, target_code)
+        if ready:
+            script, audio_key = ready
+            put_value("translated_script", script)
+            st.session_state["voice_audio"] = audio_key
+    audio_data = audio_cache.load(audio_key) if audio_key else None
+    if audio_key and audio_data is None:
+        # Evicted from the audio cache: forget the dangling key.
+        st.session_state.pop("voice_audio", None)
     
     if audio_data:
         st.success("✅ Audio Ready")
-        st.audio(audio_data, format="audio/mp3", autoplay=True)
+        # If the first chunk was already playing as a preview, carry on from there.
+        preview_started = st.session_state.pop("voice_preview_started", None)
+        start = int(time.time() - preview_started) if preview_started else 0
+        st.audio(audio_data, format=audio_format(audio_data), autoplay=True, start_time=start)
         
         if st.button("🔄 Regenerate / Change Language"):
-            st.session_state.pop("voice_audio_mp3", None)
+            st.session_state.pop("voice_audio", None)
             st.rerun()
             
     else:
@@ -203,35 +155,45 @@ with left_col:
             
             with st.status("Processing Neural Speech...", expanded=True) as status:
                 
-                # 1. Translation
+                # 1. Translation (sentence-level cache; only new sentences hit the network)
                 if target_code != "en":
                     st.write(f"Translating to {selected_lang_name}...")
                     try:
-                        final_text = GoogleTranslator(source='auto', target=target_code).translate(raw_script)
-                    except:
-                        final_text = raw_script
-                        st.error("Translation failed, falling back to English.")
+                        final_text = translate(raw_script, target_code)
+                    except TranslationError as e:
+                        final_text = e.text
+                        st.error(f"Translation incomplete: {e.failed} sentence(s) left in English.")
                 else:
                     final_text = raw_script
                 
                 # Save text
-                st.session_state["translated_script"] = final_text
+                put_value("translated_script", final_text)
                 
                 st.write("Synthesizing Audio...")
-                time.sleep(0.5)
                 
-                # 2. TTS Generation
+                # 2. TTS Generation: sentence chunks in parallel, first chunk plays as soon as it lands
                 try:
-                    tts = gTTS(text=final_text, lang=target_code, slow=False)
-                    fp = BytesIO()
-                    tts.write_to_fp(fp)
-                    fp.seek(0)
-                    
-                    st.session_state["voice_audio_mp3"] = fp
+                    parts = []
+                    for i, total, audio in synthesize_chunks(final_text, target_code):
+                        parts.append(audio)
+                        if total > 1 and i == 0:
+                            st.audio(audio, format=audio_format(audio), autoplay=True)
+                            st.session_state["voice_preview_started"] = time.time()
+                        elif total > 1:
+                            st.write(f"Segment {i + 1}/{total} ready")
+                    audio_data = join_audio(parts)
                     status.update(label="Complete!", state="complete", expanded=False)
-                    st.rerun()
+                    # synthesize_chunks cached the joined clip; keep just its key.
+                    audio_key = audio_cache.key_for(final_text, target_code)
+                    if audio_key:
+                        st.session_state["voice_audio"] = audio_key
+                        st.rerun()
+                    # The audio cache didn't keep it: play it once, right here.
+                    st.session_state.pop("voice_preview_started", None)
+                    st.audio(audio_data, format=audio_format(audio_data), autoplay=True)
                     
                 except Exception as e:
+                    st.session_state.pop("voice_preview_started", None)
                     status.update(label="Failed", state="error")
                     st.error(f"TTS Error: {e}")
 
@@ -242,11 +204,10 @@ with right_col:
         with c_head:
             st.markdown(f"**Script Preview ({selected_lang_name})**")
         with c_anim:
-            if lottie_voice:
-                st_lottie(lottie_voice, height=40, key="wave_anim")
+            render_lottie("voice", height=40, key="wave_anim")
 
         
-        display_text = st.session_state.get("translated_script", raw_script)
+        display_text = get_value("translated_script", raw_script)
         
         st.text_area(
             "script_display",
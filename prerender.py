@@ -0,0 +1,120 @@
+import itertools
+import queue
+import threading
+import time
+
+import streamlit as st
+
+from audio_cache import get_audio_cache
+from translation import cached_translation, translate
+from tts import speak
+
+# Priority of a job = (language rank, alert rank): every alert in the
+# preferred language, then the selected alert in English as a fallback;
+# within a language the alert the user picked goes first.
+PREFERRED, ENGLISH = 0, 1
+
+# A failed job isn't queued again until its backoff runs out; it doubles on
+# each repeat failure, so a dead network costs one attempt per backoff.
+FAILURE_BACKOFF = 120
+FAILURE_BACKOFF_MAX = 3600
+DONE_MAX = 2000           # finished jobs remembered so re-renders don't requeue them
+
+
+def briefing_script(alert: dict) -> str:
+    """The text the Voice page reads out for an alert."""
+    return f"Hello. Here is your briefing for: {alert['title']}. \n\n {alert['summary']} \n\n {alert.get('desc', '')}"
+
+
+def cached_briefing(alert: dict, lang: str) -> tuple[str, str] | None:
+    """(script, audio cache key) if this alert is already fully rendered in lang, without any network call."""
+    text = cached_translation(briefing_script(alert), lang)
+    if text is None:
+        return None
+    key = get_audio_cache().key_for(text, lang)
+    return (text, key) if key is not None else None
+
+
+class Prerenderer:
+    """
+    Background worker that translates and synthesizes briefings into the
+    audio cache ahead of time, so the Voice page is usually a cache hit.
+    One thread keeps it gentle on the free translate/TTS endpoints.
+    """
+
+    def __init__(self):
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._pending = {}
+        self._done = {}           # job -> True, oldest first
+        self._failures = {}       # job -> (consecutive failures, retry_at)
+        self._lock = threading.Lock()
+        self._thread = None
+        self.stats = {"queued": 0, "rendered": 0, "already_cached": 0, "failed": 0}
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="prerender", daemon=True)
+            self._thread.start()
+
+    def enqueue(self, alerts: list[dict], preferred_lang: str = "en", selected_id: str | None = None):
+        jobs = [(alert, preferred_lang, PREFERRED) for alert in alerts]
+        if preferred_lang != "en":
+            jobs += [(alert, "en", ENGLISH) for alert in alerts if alert.get("id") == selected_id]
+        now = time.time()
+        for alert, lang, lang_rank in jobs:
+            job = (briefing_script(alert), lang)
+            priority = (lang_rank, 0 if alert.get("id") == selected_id else 1)
+            with self._lock:
+                if job in self._done or self._failures.get(job, (0, 0))[1] > now:
+                    continue
+                # Already queued at the same or higher priority: nothing to do.
+                if job in self._pending and self._pending[job] <= priority:
+                    continue
+                self._pending[job] = priority
+                self.stats["queued"] += 1
+            self._queue.put((priority, next(self._seq), job))
+
+    def _run(self):
+        while True:
+            priority, _, job = self._queue.get()
+            with self._lock:
+                # A promoted job leaves its old entry behind; run it once, at its best priority.
+                if self._pending.get(job) != priority:
+                    continue
+            script, lang = job
+            try:
+                text = translate(script, lang)
+                if (text, lang, False) in get_audio_cache():
+                    outcome = "already_cached"
+                else:
+                    speak(text, lang)
+                    outcome = "rendered"
+            except Exception:
+                # Includes TranslationError: never bake a half-English clip into the cache.
+                outcome = "failed"
+            with self._lock:
+                self._pending.pop(job, None)
+                self.stats[outcome] += 1
+                if outcome == "failed":
+                    n = self._failures.get(job, (0, 0))[0] + 1
+                    self._failures[job] = (n, time.time() + min(FAILURE_BACKOFF * 2 ** (n - 1), FAILURE_BACKOFF_MAX))
+                else:
+                    self._failures.pop(job, None)
+                    self._done[job] = True
+                    if len(self._done) > DONE_MAX:
+                        del self._done[next(iter(self._done))]
+
+    def backlog(self) -> int:
+        return self._queue.qsize()
+
+
+@st.cache_resource
+def get_prerenderer() -> Prerenderer:
+    worker = Prerenderer()
+    worker.start()
+    return worker
+
+
+def prerender(alerts: list[dict], preferred_lang: str = "en", selected_id: str | None = None):
+    get_prerenderer().enqueue(alerts, preferred_lang, selected_id)
@@ -0,0 +1,248 @@
+"""
+The profile model. StudentProfile and StandardProfile declare every field a
+profile can hold; session defaults, validation, diffing, reset and storage
+all derive from these two classes instead of hand-kept key lists.
+
+Snapshots are encoded positionally (msgpack, or JSON if msgpack isn't
+installed) behind a schema version, so field order is part of the schema:
+bump SCHEMA_VERSION whenever fields are added, removed or reordered.
+"""
+import json
+from dataclasses import MISSING, dataclass, field, fields
+
+from lazy_imports import load
+
+# ==========================================
+# 0. CONFIG
+# ==========================================
+SCHEMA_VERSION = 1
+SAVED_KEY = "profile_saved"   # session key: encoded snapshot of the last write
+
+# Session keys that belong to the profile but not to either variant's fields.
+SESSION_KEYS = ("user_type", "profile_complete", SAVED_KEY)
+
+
+def _money(default: float = 0.0, minimum: float | None = 0.0):
+    return field(default=default, metadata={"min": minimum})
+
+
+def _items():
+    return field(default_factory=list)
+
+
+# ==========================================
+# 1. MODEL
+# ==========================================
+@dataclass(slots=True)
+class Profile:
+    monthly_income: float = _money()
+    savings_buffer: float = _money()
+    burn: float = _money()
+    runway_days: int = 0
+    risk_score: int = 0
+
+    user_type = ""
+
+    def validate(self) -> list[str]:
+        """Human-readable problems; empty when the profile can be saved."""
+        problems = []
+        for f in fields(self):
+            minimum = f.metadata.get("min")
+            if minimum is not None and getattr(self, f.name) < minimum:
+                problems.append(f"{f.name.replace('_', ' ').capitalize()} can't be below {minimum:g}.")
+        if not 0 <= self.risk_score <= 100:
+            problems.append("Risk score must be between 0 and 100.")
+        return problems
+
+
+@dataclass(slots=True)
+class StudentProfile(Profile):
+    college_name: str = "Amity University"
+    study_stream: str = "B.Tech CSE"
+    daily_limit: float = _money(100.0, minimum=10.0)
+    today_spend: float = _money()
+    student_note: str = ""
+
+    user_type = "Student"
+
+
+@dataclass(slots=True)
+class StandardProfile(Profile):
+    livelihood_sources: list[str] = _items()
+    fixed_monthly: float = _money()
+    gig_avg_monthly: float = _money()
+    farm_avg_monthly: float = _money()
+    production_type: str = "N/A"
+    crop_input_cost: float = _money()
+    crops_grown: list[str] = _items()
+    held_assets: list[str] = _items()
+    sip: float = _money()
+    rent: float = _money()
+    food: float = _money()
+    transport: float = _money()
+    utilities: float = _money()
+    education: float = _money()
+    medical: float = _money()
+    emi_total: float = _money()
+    net_savings: float = _money(minimum=None)
+
+    user_type = "Standard"
+
+
+PROFILE_TYPES = {cls.user_type: cls for cls in (StudentProfile, StandardProfile)}
+
+
+def profile_class(user_type: str | None) -> type[Profile]:
+    return PROFILE_TYPES.get(user_type, StudentProfile)
+
+
+def field_names(cls: type[Profile]) -> list[str]:
+    return [f.name for f in fields(cls)]
+
+
+def profile_keys() -> set[str]:
+    """Every session key the profile owns, across both variants."""
+    keys = set(SESSION_KEYS)
+    for cls in PROFILE_TYPES.values():
+        keys.update(field_names(cls))
+    return keys
+
+
+def _coerce(f, value):
+    if f.type in ("float", float):
+        return float(value)
+    if f.type in ("int", int):
+        return int(value)
+    if f.type in ("str", str):
+        return str(value)
+    return [str(v) for v in value]
+
+
+def _default(f):
+    return f.default_factory() if f.default is MISSING else f.default
+
+
+def from_dict(data: dict, user_type: str | None = None) -> Profile:
+    """
+    A profile from session state or a stored document. Unknown keys are
+    ignored; missing, None or malformed values fall back to the default.
+    """
+    cls = profile_class(user_type or data.get("user_type"))
+    values = {}
+    for f in fields(cls):
+        value = data.get(f.name)
+        try:
+            values[f.name] = _default(f) if value is None else _coerce(f, value)
+        except (TypeError, ValueError):
+            values[f.name] = _default(f)
+    return cls(**values)
+
+
+def to_dict(profile: Profile) -> dict:
+    """The stored document: every field, plus user_type and schema_version."""
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "user_type": profile.user_type,
+        **{name: getattr(profile, name) for name in field_names(type(profile))},
+    }
+
+
+def diff(old: Profile | None, new: Profile) -> dict:
+    """Fields of new that differ from old; the whole document if the variant changed."""
+    if old is None or type(old) is not type(new):
+        return to_dict(new)
+    return {
+        name: getattr(new, name)
+        for name in field_names(type(new))
+        if getattr(old, name) != getattr(new, name)
+    }
+
+
+# ==========================================
+# 2. ENCODING
+# ==========================================
+_MSGPACK = b"m"
+_JSON = b"j"
+
+
+def encode(profile: Profile) -> bytes:
+    """[version, user_type, *field values], one format byte in front."""
+    row = [SCHEMA_VERSION, profile.user_type] + [getattr(profile, n) for n in field_names(type(profile))]
+    msgpack = load("msgpack")
+    if msgpack is not None:
+        return _MSGPACK + msgpack.packb(row)
+    return _JSON + json.dumps(row, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def decode(blob: bytes | None) -> Profile | None:
+    """The encoded profile, or None if it's unreadable or from another schema version."""
+    if not blob:
+        return None
+    try:
+        if blob[:1] == _MSGPACK:
+            msgpack = load("msgpack")
+            row = msgpack.unpackb(blob[1:]) if msgpack is not None else None
+        else:
+            row = json.loads(blob[1:])
+    except ValueError:
+        return None
+    if not row or row[0] != SCHEMA_VERSION:
+        return None
+    cls = profile_class(row[1])
+    names = field_names(cls)
+    if len(row) - 2 != len(names):
+        return None
+    return from_dict(dict(zip(names, row[2:])), cls.user_type)
+
+
+# ==========================================
+# 3. SESSION STATE
+# ==========================================
+def session_defaults(user_type: str | None) -> dict:
+    cls = profile_class(user_type)
+    return {f.name: _default(f) for f in fields(cls)}
+
+
+def from_session(state) -> Profile:
+    return from_dict(state, state.get("user_type"))
+
+
+def to_session(state, profile: Profile):
+    """Writes profile's fields into state and drops the other variant's, so nothing stale lingers."""
+    state["user_type"] = profile.user_type
+    for key in profile_keys() - set(SESSION_KEYS) - set(field_names(type(profile))):
+        state.pop(key, None)
+    for name in field_names(type(profile)):
+        state[name] = getattr(profile, name)
+
+
+def reset_session(state):
+    for key in profile_keys():
+        state.pop(key, None)
+
+
+def commit(state, save, fields: tuple[str, ...] = (), full: bool = False) -> dict:
+    """
+    Saves the session's profile with save(changes), writing only the fields
+    that changed since the last commit. With no earlier commit this session,
+    only fields that differ from the defaults are written, so a fresh session
+    never overwrites stored values it hasn't loaded. Names in fields are
+    always written: they're what the caller just set, even when the new
+    value happens to match the snapshot or the default. full=True writes
+    everything (the setup form owns the whole profile). Returns what was written.
+    """
+    profile = from_session(state)
+    if full:
+        changes = to_dict(profile)
+    else:
+        previous = decode(state.get(SAVED_KEY))
+        if previous is None or type(previous) is not type(profile):
+            changes = {**diff(type(profile)(), profile), "schema_version": SCHEMA_VERSION, "user_type": profile.user_type}
+        else:
+            changes = diff(previous, profile)
+        names = set(field_names(type(profile)))
+        changes.update({name: getattr(profile, name) for name in fields if name in names})
+    if changes:
+        save(changes)
+    state[SAVED_KEY] = encode(profile)
+    return changes
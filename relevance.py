@@ -0,0 +1,204 @@
+import threading
+
+from dedup import tokenize
+
+# ==========================================
+# 0. FACET VOCABULARY
+# ==========================================
+# Each facet is an entity or topic a profile can care about. Items are
+# indexed under every facet whose terms appear in the headline.
+CROP_TERMS = {
+    "Onion": {"onion", "onions"},
+    "Rice": {"rice", "paddy", "basmati"},
+    "Cotton": {"cotton"},
+    "Wheat": {"wheat", "atta"},
+    "Tomato": {"tomato", "tomatoes"},
+    "Sugarcane": {"sugarcane", "sugar", "ethanol"},
+}
+
+ASSET_TERMS = {
+    "Stocks": {"stock", "stocks", "equity", "equities", "shares", "sensex", "nifty", "ipo", "derivatives"},
+    "Mutual Funds": {"mutual", "mf", "amfi", "nav", "sip"},
+    "Gold": {"gold", "bullion", "sgb"},
+    "Crypto": {"crypto", "cryptocurrency", "bitcoin", "vda"},
+    "Real Estate": {"realty", "housing", "property", "reit", "reits"},
+}
+
+TOPIC_TERMS = {
+    "loan:rates": {"repo", "rate", "rates", "emi", "loan", "loans", "lending", "mclr", "interest", "monetary", "borrowers"},
+    "cost:fuel": {"fuel", "petrol", "diesel", "crude", "oil", "lpg"},
+    "cost:inflation": {"inflation", "cpi", "wpi", "prices", "price"},
+    "agri:weather": {"monsoon", "rainfall", "drought", "flood", "msp", "kharif", "rabi", "farmers", "agriculture", "crop", "crops"},
+}
+
+FACET_TERMS = {
+    **{f"crop:{name}": terms for name, terms in CROP_TERMS.items()},
+    **{f"asset:{name}": terms for name, terms in ASSET_TERMS.items()},
+    **TOPIC_TERMS,
+}
+
+FACET_LABELS = {
+    "loan:rates": "your loan EMIs",
+    "cost:fuel": "your transport costs",
+    "cost:inflation": "household costs",
+    "agri:weather": "your farm income",
+}
+
+# term -> facets, so extraction is one dict lookup per headline token
+_TERM_FACETS = {}
+for _facet, _terms in FACET_TERMS.items():
+    for _term in _terms:
+        _TERM_FACETS.setdefault(_term, set()).add(_facet)
+
+
+def extract_facets(text: str) -> set[str]:
+    facets = set()
+    for token in tokenize(text):
+        facets |= _TERM_FACETS.get(token, set())
+    return facets
+
+
+def facet_label(facet: str) -> str:
+    if facet in FACET_LABELS:
+        return FACET_LABELS[facet]
+    kind, _, name = facet.partition(":")
+    return f"your {name} {'crop' if kind == 'crop' else 'holdings'}"
+
+
+def profile_facets(profile: dict) -> dict[str, float]:
+    """Weighted facets for a Standard profile (session_state or stored profile)."""
+    weights = {"cost:inflation": 0.5}
+
+    crops = profile.get("crops_grown") or []
+    for crop in crops:
+        weights[f"crop:{crop}"] = 3.0
+    if crops:
+        weights["agri:weather"] = 1.5
+
+    for asset in profile.get("held_assets") or []:
+        weights[f"asset:{asset}"] = 2.0
+
+    emi = float(profile.get("emi_total") or 0)
+    income = float(profile.get("monthly_income") or 0)
+    if emi > 0:
+        # Heavier EMI load -> rate news matters more.
+        weights["loan:rates"] = 2.0 + (min(1.0, emi / income) if income > 0 else 1.0)
+
+    if float(profile.get("transport") or 0) > 0:
+        weights["cost:fuel"] = 1.0
+
+    return weights
+
+
+# ==========================================
+# 1. ITEM INDEX (top-K items per user)
+# ==========================================
+class RelevanceIndex:
+    """
+    Inverted index of feed items by facet. Scoring a profile only walks the
+    posting lists for that profile's facets, never the whole item set.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings = {}
+        self._items = {}
+
+    def add(self, key: str, item: dict, group: str):
+        facets = extract_facets(item["title"])
+        with self._lock:
+            if key in self._items:
+                self._remove(key)
+            self._items[key] = (item, facets, group)
+            for facet in facets:
+                self._postings.setdefault(facet, set()).add(key)
+
+    def remove_group(self, group: str):
+        with self._lock:
+            for key in [k for k, (_, _, g) in self._items.items() if g == group]:
+                self._remove(key)
+
+    def top_k(self, weights: dict[str, float], k: int = 5, groups=None) -> list[dict]:
+        """
+        Best matching items for a facet weighting. Returns dicts with the
+        item, its score and the facets it matched; near-duplicates (same
+        cluster) are counted once.
+        """
+        scores = {}
+        matched = {}
+        with self._lock:
+            for facet, weight in weights.items():
+                for key in self._postings.get(facet, ()):
+                    scores[key] = scores.get(key, 0.0) + weight
+                    matched.setdefault(key, []).append(facet)
+            entries = {key: self._items[key] for key in scores}
+
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        out = []
+        seen_clusters = set()
+        for key in ranked:
+            item, _, group = entries[key]
+            if groups is not None and group not in groups:
+                continue
+            cluster = item.get("cluster", key)
+            if cluster in seen_clusters:
+                continue
+            seen_clusters.add(cluster)
+            out.append({"item": item, "score": scores[key], "facets": matched[key]})
+            if len(out) == k:
+                break
+        return out
+
+    def _remove(self, key: str):
+        _, facets, _ = self._items.pop(key)
+        for facet in facets:
+            posting = self._postings.get(facet)
+            if posting:
+                posting.discard(key)
+                if not posting:
+                    del self._postings[facet]
+
+
+# ==========================================
+# 2. PROFILE INDEX (users per new item)
+# ==========================================
+class ProfileIndex:
+    """
+    Reverse direction: facet -> {user_id: weight}. Matching a new item only
+    touches users who share one of its facets.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings = {}
+        self._profiles = {}
+
+    def upsert(self, user_id: str, profile: dict):
+        weights = profile_facets(profile)
+        with self._lock:
+            self._drop(user_id)
+            self._profiles[user_id] = weights
+            for facet, weight in weights.items():
+                self._postings.setdefault(facet, {})[user_id] = weight
+
+    def remove(self, user_id: str):
+        with self._lock:
+            self._drop(user_id)
+
+    def match(self, item: dict, min_score: float = 1.0) -> dict[str, tuple[float, list[str]]]:
+        """{user_id: (score, matched facets)} for users the item applies to."""
+        out = {}
+        with self._lock:
+            for facet in extract_facets(item["title"]):
+                for user_id, weight in self._postings.get(facet, {}).items():
+                    score, facets = out.get(user_id, (0.0, []))
+                    out[user_id] = (score + weight, facets + [facet])
+        return {u: v for u, v in out.items() if v[0] >= min_score}
+
+    def _drop(self, user_id: str):
+        for facet in self._profiles.pop(user_id, {}):
+            posting = self._postings.get(facet)
+            if posting:
+                posting.pop(user_id, None)
+                if not posting:
+                    del self._postings[facet]
@@ -0,0 +1,204 @@
+import hashlib
+import pickle
+import threading
+import time
+
+import streamlit as st
+
+try:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+except ImportError:
+    get_script_run_ctx = None
+
+# ==========================================
+# 0. CONFIG
+# ==========================================
+STORE_MAX_BYTES = 64 * 1024 * 1024      # all sessions together
+SESSION_MAX_BYTES = 4 * 1024 * 1024     # one session's references
+MAX_BLOB_BYTES = 2 * 1024 * 1024        # anything larger isn't kept at all; must fit in a session
+IDLE_SECONDS = 30 * 60
+
+
+def session_id() -> str:
+    ctx = get_script_run_ctx() if get_script_run_ctx else None
+    return ctx.session_id if ctx else "local"
+
+
+# ==========================================
+# 1. SHARED BLOB STORE
+# ==========================================
+class _Blob:
+    __slots__ = ("data", "owners", "last_access")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.owners = {}        # session id -> last access by that session
+        self.last_access = time.time()
+
+
+class BlobStore:
+    """
+    Process-wide, content-addressed home for large session payloads (alert
+    lists, scripts, advice text, scan results). Sessions keep only the key. Identical blobs are stored once and
+    charged to every session that references them. Idle references go
+    first when a session or the store is over budget, then the least
+    recently used.
+    """
+
+    def __init__(self, max_bytes: int = STORE_MAX_BYTES, session_max_bytes: int = SESSION_MAX_BYTES,
+                 max_blob_bytes: int = MAX_BLOB_BYTES, idle_seconds: float = IDLE_SECONDS):
+        if max_blob_bytes > min(session_max_bytes, max_bytes):
+            # A blob the session can't hold would evict every other reference it has.
+            raise ValueError("max_blob_bytes can't exceed session_max_bytes or max_bytes")
+        self.max_bytes = max_bytes
+        self.session_max_bytes = session_max_bytes
+        self.max_blob_bytes = max_blob_bytes
+        self.idle_seconds = idle_seconds
+        self._blobs = {}
+        self._sessions = {}     # session id -> {key: size}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.rejected = 0
+
+    def put(self, owner: str, data: bytes) -> str | None:
+        """Stores data for owner and returns its key, or None if the blob is too large to keep."""
+        if len(data) > self.max_blob_bytes:
+            self.rejected += 1
+            return None
+        key = hashlib.sha256(data).hexdigest()
+        now = time.time()
+        with self._lock:
+            blob = self._blobs.get(key)
+            if blob is None:
+                blob = self._blobs[key] = _Blob(data)
+                self._bytes += len(data)
+            blob.owners[owner] = now
+            blob.last_access = now
+            self._sessions.setdefault(owner, {})[key] = len(data)
+            self._evict_session(owner, keep=key)
+            self._evict_store(now, keep=key)
+        return key
+
+    def get(self, owner: str, key: str) -> bytes | None:
+        now = time.time()
+        with self._lock:
+            blob = self._blobs.get(key)
+            if blob is None or owner not in blob.owners:
+                return None
+            blob.owners[owner] = now
+            blob.last_access = now
+            return blob.data
+
+    def release(self, owner: str, key: str):
+        with self._lock:
+            self._release(owner, key)
+
+    def release_session(self, owner: str):
+        with self._lock:
+            for key in list(self._sessions.get(owner, ())):
+                self._release(owner, key)
+
+    def _release(self, owner: str, key: str):
+        refs = self._sessions.get(owner)
+        if refs is not None:
+            refs.pop(key, None)
+            if not refs:
+                del self._sessions[owner]
+        blob = self._blobs.get(key)
+        if blob is None:
+            return
+        blob.owners.pop(owner, None)
+        if not blob.owners:
+            del self._blobs[key]
+            self._bytes -= len(blob.data)
+
+    def _evict_session(self, owner: str, keep: str):
+        refs = self._sessions.get(owner, {})
+        by_age = sorted((self._blobs[k].owners[owner], k) for k in refs if k != keep)
+        for _, key in by_age:
+            if sum(refs.values()) <= self.session_max_bytes:
+                break
+            self._release(owner, key)
+            self.evictions += 1
+
+    def _evict_store(self, now: float, keep: str):
+        refs = sorted(
+            (ts, owner, key)
+            for key, blob in self._blobs.items() if key != keep
+            for owner, ts in blob.owners.items()
+        )
+        for ts, owner, key in refs:
+            if now - ts < self.idle_seconds and self._bytes <= self.max_bytes:
+                break
+            self._release(owner, key)
+            self.evictions += 1
+
+    def session_bytes(self, owner: str) -> int:
+        with self._lock:
+            return sum(self._sessions.get(owner, {}).values())
+
+    def stats(self) -> dict:
+        with self._lock:
+            # Sessions never say goodbye; sweep idle references here too.
+            self._evict_store(time.time(), keep=None)
+            return {
+                "blobs": len(self._blobs),
+                "bytes": self._bytes,
+                "sessions": len(self._sessions),
+                "evictions": self.evictions,
+                "rejected": self.rejected,
+            }
+
+
+@st.cache_resource
+def get_blob_store() -> BlobStore:
+    return BlobStore()
+
+
+# ==========================================
+# 2. SESSION HELPERS
+# ==========================================
+def put_blob(name: str, data: bytes) -> bool:
+    """Keeps data under st.session_state[name] as a key. False if it was too large to store."""
+    drop_blob(name)
+    key = get_blob_store().put(session_id(), data)
+    if key is None:
+        return False
+    st.session_state[name] = key
+    return True
+
+
+def get_blob(name: str) -> bytes | None:
+    key = st.session_state.get(name)
+    if key is None:
+        return None
+    data = get_blob_store().get(session_id(), key)
+    if data is None:
+        # Evicted (idle or over budget): forget the dangling key.
+        st.session_state.pop(name, None)
+    return data
+
+
+def drop_blob(name: str):
+    key = st.session_state.pop(name, None)
+    if key is not None:
+        get_blob_store().release(session_id(), key)
+
+
+# Values round-trip through pickle: the store never leaves this process, and
+# the payloads (alert dicts with sets and timestamps) aren't all JSON-able.
+def put_value(name: str, value) -> bool:
+    """put_blob for any picklable value. False if it was too large to store."""
+    return put_blob(name, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+
+
+def get_value(name: str, default=None):
+    """The value put_value stored under name, or default if it's unset or was evicted."""
+    data = get_blob(name)
+    return default if data is None else pickle.loads(data)
+
+
+def drop_session():
+    """Releases everything this session holds in the store (logout)."""
+    get_blob_store().release_session(session_id())
@@ -0,0 +1,84 @@
+import threading
+
+import streamlit as st
+
+# Followers never wait longer than this for the leader's result.
+FLIGHT_TIMEOUT = 60
+
+
+class _Call:
+    __slots__ = ("event", "result", "error", "waiters")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller (leader)
+    does the work, everyone else blocks on its result. Exceptions, including
+    timeouts, are re-raised in every waiter; anything that isn't an
+    Exception reaches followers as a RuntimeError instead.
+    """
+
+    def __init__(self, timeout: float = FLIGHT_TIMEOUT):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def begin(self, key: str) -> tuple[_Call, bool]:
+        """Returns (call, is_leader). Leaders must call finish()."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.followers += 1
+                return call, False
+            call = self._calls[key] = _Call()
+            self.leaders += 1
+            return call, True
+
+    def finish(self, key: str, call: _Call, result=None, error: Exception | None = None):
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        call.result = result
+        call.error = error
+        call.event.set()
+
+    def wait(self, call: _Call, timeout: float | None = None):
+        if not call.event.wait(self.timeout if timeout is None else timeout):
+            raise TimeoutError("Timed out waiting for an identical in-flight model request")
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def do(self, key: str, fn, timeout: float | None = None, on_join=None):
+        call, leader = self.begin(key)
+        if not leader:
+            if on_join is not None:
+                on_join()
+            return self.wait(call, timeout)
+        try:
+            result = fn()
+        except BaseException as e:
+            # Control-flow exceptions (Streamlit's rerun/stop, KeyboardInterrupt)
+            # belong to the leader's session; followers just see a failed call.
+            self.finish(key, call, error=e if isinstance(e, Exception) else RuntimeError("In-flight request abandoned"))
+            raise
+        self.finish(key, call, result=result)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"leaders": self.leaders, "followers": self.followers, "in_flight": len(self._calls)}
+
+
+@st.cache_resource
+def get_flight() -> SingleFlight:
+    return SingleFlight()
@@ -0,0 +1,49 @@
+import pytest
+
+pytest.importorskip("streamlit")
+
+import advice_matrix
+from advice_matrix import (
+    STANDARD_TOPICS,
+    STUDENT_TOPICS,
+    AdviceMatrix,
+    matrix_key,
+    profile_tier,
+    read_table,
+    write_table,
+)
+
+STUDENT = {"study_stream": "B.Tech CSE", "savings_buffer": 900, "daily_limit": 100}
+
+
+@pytest.fixture
+def matrix(tmp_path, monkeypatch):
+    built, learned = str(tmp_path / "data" / "matrix.json"), str(tmp_path / "cache" / "matrix.json")
+    key = matrix_key("Student", STUDENT_TOPICS[0], profile_tier("Student", STUDENT))
+    write_table(built, {key: "Cook in bulk."})
+    m = AdviceMatrix(built, learned)
+    monkeypatch.setattr(advice_matrix, "get_matrix", lambda: m)
+    return m
+
+
+def test_bucketed_profile_hits_the_table(matrix):
+    # A different wallet in the same band is the same cell.
+    neighbour = {**STUDENT, "savings_buffer": 1000}
+    assert advice_matrix.lookup_advice("Student", STUDENT_TOPICS[0], neighbour) == "Cook in bulk."
+    assert advice_matrix.lookup_advice("Student", STUDENT_TOPICS[1], neighbour) is None
+
+
+def test_live_answer_fills_the_cell_for_the_tier(matrix):
+    profile = {"risk_score": 40, "runway_days": 50, "held_assets": ["Gold"]}
+    assert advice_matrix.lookup_advice("Standard", STANDARD_TOPICS[0], profile) is None
+
+    advice_matrix.learn_advice("Standard", STANDARD_TOPICS[0], profile, "Buy staples early.")
+    same_tier = {**profile, "risk_score": 41}
+    assert advice_matrix.lookup_advice("Standard", STANDARD_TOPICS[0], same_tier) == "Buy staples early."
+    assert list(read_table(matrix.learned_path).values()) == ["Buy staples early."]
+
+
+def test_learning_never_overrides_the_built_table(matrix):
+    advice_matrix.learn_advice("Student", STUDENT_TOPICS[0], STUDENT, "Something else.")
+    assert advice_matrix.lookup_advice("Student", STUDENT_TOPICS[0], STUDENT) == "Cook in bulk."
+    assert read_table(matrix.learned_path) == {}
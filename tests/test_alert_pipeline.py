@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip("streamlit")
+
+from alert_pipeline import new_items, next_mark, severity
+
+NOON = "Mon, 01 Jan 2024 12:00:00 GMT"
+EARLIER = "Mon, 01 Jan 2024 09:00:00 GMT"
+
+
+def test_severity_ignores_punctuation():
+    assert severity({"title": "Fuel price hike: what it means"}, 0) == "CRITICAL"
+    assert severity({"title": "Rates rise, again"}, 0) == "WARNING"
+    assert severity({"title": "Quiet day for markets"}, 0) == "ADVISORY"
+    assert severity({"title": "Quiet day for markets"}, 4.0) == "CRITICAL"
+
+
+def test_items_at_the_mark_timestamp_are_not_dropped():
+    a = {"guid": "a", "title": "A", "published": NOON}
+    old = {"guid": "old", "title": "Old", "published": EARLIER}
+    mark = next_mark("u", [a, old], None)
+
+    b = {"guid": "b", "title": "B", "published": NOON}
+    assert new_items([b, a, old], mark) == [b]
+
+    mark = next_mark("u", [b], mark)
+    assert new_items([b, a, old], mark) == []
+
+
+def test_new_items_falls_back_to_guid_without_dates():
+    items = [{"guid": "c", "title": "C"}, {"guid": "b", "title": "B"}, {"guid": "a", "title": "A"}]
+    assert new_items(items, {"guid": "b"}) == items[:1]
+    assert new_items(items, None) == items
@@ -0,0 +1,86 @@
+import pytest
+
+pytest.importorskip("streamlit")
+
+import decrypt
+from decrypt import cache_key, decrypt_prompt, parse_batch
+
+
+def test_parse_batch_maps_by_index():
+    raw = '[{"i": 2, "text": "Loans cost more."}, {"i": 1, "text": " Fuel is dearer. "}]'
+    assert parse_batch(raw, 2) == {1: "Fuel is dearer.", 2: "Loans cost more."}
+
+
+def test_parse_batch_strips_code_fences():
+    raw = '```json\n[{"i": 1, "text": "Prices rise."}]\n```'
+    assert parse_batch(raw, 1) == {1: "Prices rise."}
+
+
+@pytest.mark.parametrize("raw", ["not json", '{"i": 1, "text": "x"}', ""])
+def test_parse_batch_ignores_malformed_replies(raw):
+    assert parse_batch(raw, 3) == {}
+
+
+def test_parse_batch_skips_bad_rows():
+    raw = '[{"i": 0, "text": "a"}, {"i": 4, "text": "b"}, {"i": "x", "text": "c"}, {"text": "d"}, {"i": 2, "text": " "}, {"i": 3, "text": "ok"}]'
+    assert parse_batch(raw, 3) == {3: "ok"}
+
+
+class FakeCache:
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, key, site="", count=True, model=""):
+        return self.entries.get(key)
+
+    def set(self, key, text, site=""):
+        self.entries[key] = text
+
+
+class FakeClient:
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = 0
+
+    def generate(self, prompt, site, model):
+        self.calls += 1
+        return self.reply
+
+
+@pytest.fixture
+def env(monkeypatch):
+    cache = FakeCache()
+    monkeypatch.setattr(decrypt, "get_api_key", lambda: "key")
+    monkeypatch.setattr(decrypt, "model_name", lambda: "model")
+    monkeypatch.setattr(decrypt, "get_llm_cache", lambda: cache)
+    monkeypatch.setattr(decrypt, "_failed", {})
+    return cache
+
+
+def test_batch_results_land_under_each_headlines_single_key(env, monkeypatch):
+    client = FakeClient('[{"i": 2, "text": "Loans cost more."}, {"i": 1, "text": "Fuel is dearer."}]')
+    monkeypatch.setattr(decrypt, "get_client", lambda: client)
+
+    results = decrypt.decrypt_batch(["Oil spikes", "Repo up 50bps", "Oil spikes"])
+    assert results == {"Oil spikes": "Fuel is dearer.", "Repo up 50bps": "Loans cost more."}
+    assert env.entries[cache_key("model", "", decrypt_prompt("Repo up 50bps"))] == "Loans cost more."
+    assert decrypt.lookup("Oil spikes") == "Fuel is dearer."
+
+    # Second pass is served from the cache.
+    decrypt.decrypt_batch(["Oil spikes", "Repo up 50bps"])
+    assert client.calls == 1
+
+
+def test_skipped_headline_cools_down(env, monkeypatch):
+    monkeypatch.setattr(decrypt, "get_client", lambda: FakeClient('[{"i": 1, "text": "Fuel is dearer."}]'))
+    results = decrypt.decrypt_batch(["Oil spikes", "Repo up 50bps"])
+    assert list(results) == ["Oil spikes"]
+    assert decrypt.cooling_down("Repo up 50bps")
+    assert not decrypt.cooling_down("Oil spikes")
+
+
+def test_prefetch_is_off_by_default(env, monkeypatch):
+    submitted = []
+    monkeypatch.setattr(decrypt._prefetch_pool, "submit", submitted.append)
+    decrypt.prefetch(["Oil spikes"])
+    assert submitted == []
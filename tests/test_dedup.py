@@ -0,0 +1,34 @@
+from dedup import HeadlineDeduper, collapse, minhash, similarity, tokenize
+
+
+def test_tokenize_drops_punctuation_and_stopwords():
+    assert tokenize("RBI hikes the repo rate: EMIs, loans!") == {"rbi", "hikes", "repo", "rate", "emis", "loans"}
+
+
+def test_minhash_is_deterministic_and_estimates_jaccard():
+    a = minhash("RBI raises repo rate by 25 bps to curb inflation")
+    assert a == minhash("RBI raises repo rate by 25 bps to curb inflation")
+    assert similarity(a, a) == 1.0
+    assert similarity(a, minhash("Monsoon arrives early over Kerala coast")) < 0.3
+
+
+def test_near_duplicates_share_a_cluster_across_feeds():
+    dedup = HeadlineDeduper()
+    first = dedup.add("rbi:1", "RBI raises repo rate by 25 bps to curb inflation", "rbi")
+    copy = dedup.add("sebi:1", "RBI raises repo rate by 25 bps to curb inflation, says governor", "sebi")
+    other = dedup.add("sebi:2", "SEBI tightens rules for F&O traders", "sebi")
+
+    assert copy == first
+    assert other != first
+    assert dedup.cluster_groups(first) == {"rbi", "sebi"}
+
+    dedup.remove_group("sebi")
+    assert dedup.cluster_groups(first) == {"rbi"}
+
+
+def test_collapse_keeps_first_copy_in_display_order():
+    main = [{"title": "A", "cluster": "c1"}, {"title": "B", "cluster": "c2"}, {"title": "B2", "cluster": "c2"}]
+    side = [{"title": "A again", "cluster": "c1"}, {"title": "C"}]
+    kept_main, kept_side = collapse([main, side])
+    assert [i["title"] for i in kept_main] == ["A", "B"]
+    assert [i["title"] for i in kept_side] == ["C"]
@@ -0,0 +1,55 @@
+import pytest
+
+import disk_cache
+from disk_cache import DiskCache
+
+
+@pytest.fixture
+def make_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(disk_cache, "CACHE_ROOT", str(tmp_path))
+    return lambda **kwargs: DiskCache("test", **kwargs)
+
+
+def test_round_trip_and_hit_ratio(make_cache):
+    cache = make_cache(max_bytes=1024)
+    assert cache.get("k") is None
+    cache.set("k", b"value")
+    assert cache.get("k") == b"value"
+    assert "k" in cache
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_expired_entries_are_misses(make_cache, monkeypatch):
+    cache = make_cache(max_bytes=1024, default_ttl=10)
+    now = [1000.0]
+    monkeypatch.setattr(disk_cache.time, "time", lambda: now[0])
+    cache.set("k", b"value")
+    now[0] += 9
+    assert cache.get("k") == b"value"
+    now[0] += 2
+    assert "k" not in cache
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_eviction_keeps_recently_used(make_cache, monkeypatch):
+    cache = make_cache(max_bytes=10)
+    now = [1000.0]
+    monkeypatch.setattr(disk_cache.time, "time", lambda: now[0])
+    for key in ("a", "b"):
+        cache.set(key, b"xxxx")
+        now[0] += 1
+    cache.get("a")
+    now[0] += 1
+    cache.set("c", b"xxxx")
+
+    assert cache.get("a") == b"xxxx"
+    assert cache.get("b") is None
+    assert cache.get("c") == b"xxxx"
+    assert cache.stats()["bytes"] <= 10
+
+
+def test_entries_survive_reopening(make_cache):
+    make_cache(max_bytes=1024).set("k", b"value")
+    assert make_cache(max_bytes=1024).get("k") == b"value"
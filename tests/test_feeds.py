@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+import feeds
+from feeds import CircuitBreaker, FeedStore
+
+URL = "https://example.com/rss"
+
+
+def test_breaker_opens_after_threshold_failures():
+    breaker = CircuitBreaker(threshold=3, cooldown=60)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_half_open_allows_a_single_probe():
+    breaker = CircuitBreaker(threshold=1, cooldown=0)
+    breaker.record_failure()
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_failed_probe_reopens_and_success_closes():
+    breaker = CircuitBreaker(threshold=5, cooldown=0)
+    for _ in range(5):
+        breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.opened_at is not None
+
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+
+
+@pytest.fixture
+def blocked_fetch(monkeypatch):
+    release, calls = threading.Event(), []
+
+    def fetch(url, *args, **kwargs):
+        calls.append(url)
+        release.wait(5)
+        return [{"title": "Repo rate raised by 50bps", "link": "https://example.com/1"}]
+
+    monkeypatch.setattr(feeds, "fetch_rss", fetch)
+    return release, calls
+
+
+def test_revalidate_shares_the_running_refresh(blocked_fetch):
+    release, calls = blocked_fetch
+    store = FeedStore({URL: "Example"})
+    first = store.revalidate(URL)
+    assert store.revalidate(URL) is first
+    release.set()
+    assert first.result(timeout=5) is True
+    assert calls == [URL]
+    assert len(store.get(URL)) == 1
+
+
+def test_deep_scan_joins_a_background_refresh(blocked_fetch):
+    deep_scan = pytest.importorskip("deep_scan")
+    release, calls = blocked_fetch
+    store = FeedStore({URL: "Example"})
+    running = store.revalidate(URL)
+
+    joined, revalidate = threading.Event(), store.revalidate
+    store.revalidate = lambda url: (revalidate(url), joined.set())[0]
+    result = []
+    scan = threading.Thread(target=lambda: result.append(deep_scan._sync_feed(store, URL)))
+    scan.start()
+    assert joined.wait(5) and not running.done()
+    release.set()
+    scan.join(5)
+    assert result == [(URL, 1, "refreshed")]
+    assert calls == [URL]
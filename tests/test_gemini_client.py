@@ -0,0 +1,52 @@
+import pytest
+
+pytest.importorskip("streamlit")
+
+import gemini_client
+from gemini_client import RateLimited, TokenBucket, is_retryable
+
+
+class ServiceUnavailable(Exception):
+    pass
+
+
+class StatusError(Exception):
+    def __init__(self, code):
+        super().__init__("request failed")
+        self.code = code
+
+
+@pytest.mark.parametrize("error, expected", [
+    (RateLimited(), True),
+    (ServiceUnavailable("backend overloaded"), True),
+    (StatusError(503), True),
+    (StatusError(400), False),
+    (RuntimeError("503 Service Unavailable"), True),
+    (TimeoutError(), True),
+    (ValueError("prompt mentions 500 internal rows"), False),
+    (ValueError("Invalid request: 429 tokens over limit"), False),
+])
+def test_is_retryable(error, expected):
+    assert is_retryable(error) is expected
+
+
+def test_token_bucket_spends_burst_then_refuses(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(gemini_client.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(gemini_client.time, "sleep", lambda s: now.__setitem__(0, now[0] + s))
+
+    bucket = TokenBucket(rate_per_minute=60, capacity=2)
+    assert bucket.acquire(timeout=0)
+    assert bucket.acquire(timeout=0)
+    assert not bucket.acquire(timeout=0.5)
+
+
+def test_token_bucket_waits_for_refill(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(gemini_client.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(gemini_client.time, "sleep", lambda s: now.__setitem__(0, now[0] + s))
+
+    bucket = TokenBucket(rate_per_minute=60, capacity=1)
+    assert bucket.acquire(timeout=0)
+    assert bucket.acquire(timeout=2)
+    assert now[0] == pytest.approx(101.0)
@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+from import_budget import IMPORT_BUDGET_MS, importtime, measure, route_files, top_level_imports
+
+BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", IMPORT_BUDGET_MS))
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    timings, failed = importtime(["streamlit"])
+    assert not failed
+    return timings
+
+
+def test_top_level_imports_sees_guarded_imports(tmp_path, monkeypatch):
+    import import_budget
+
+    (tmp_path / "page.py").write_text(
+        "import os\n"
+        "try:\n    from db_ops import save_profile\nexcept ImportError:\n    pass\n"
+        "def later():\n    import gtts\n"
+    )
+    monkeypatch.setattr(import_budget, "ROOT", str(tmp_path))
+    assert top_level_imports("page.py") == ["os", "db_ops"]
+
+
+@pytest.mark.parametrize("route", route_files())
+def test_route_stays_within_import_budget(route, baseline):
+    report = measure(route, baseline)
+    assert not report["failed"], report["failed"]
+    assert not report["heavy"], f"{route} eagerly imports {report['heavy']}; load them via lazy_imports"
+    assert report["total_ms"] <= BUDGET_MS, f"{route} adds {report['total_ms']:.0f} ms of imports"
+
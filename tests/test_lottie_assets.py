@@ -0,0 +1,43 @@
+import pytest
+
+pytest.importorskip("streamlit")
+pytest.importorskip("requests")
+
+import lottie_assets
+from lottie_assets import LottieAssets, asset_path, read_asset, write_asset
+
+ANIMATION = {"v": "5.7.4", "fr": 30, "ip": 0, "op": 60, "w": 100, "h": 100, "layers": []}
+
+
+@pytest.fixture
+def dirs(tmp_path, monkeypatch):
+    bundle, cache = tmp_path / "bundle", tmp_path / "cache"
+    monkeypatch.setattr(lottie_assets, "LOTTIE_DIR", str(bundle))
+    monkeypatch.setattr(lottie_assets, "LOTTIE_CACHE_DIR", str(cache))
+    return bundle, cache
+
+
+def test_cached_copy_wins_over_bundle(dirs):
+    bundle, cache = dirs
+    write_asset("safe", ANIMATION, str(bundle))
+    assert read_asset("safe") == ANIMATION
+
+    refreshed = {**ANIMATION, "fr": 60}
+    write_asset("safe", refreshed, str(cache))
+    assert read_asset("safe") == refreshed
+
+
+def test_refresh_never_writes_into_the_bundle(dirs, monkeypatch):
+    bundle, cache = dirs
+    write_asset("safe", ANIMATION, str(bundle))
+    before = (bundle / "safe.json.gz").read_bytes()
+
+    refreshed = {**ANIMATION, "fr": 60}
+    monkeypatch.setattr(lottie_assets, "fetch", lambda url: refreshed)
+    assets = LottieAssets(urls={"safe": "https://example.invalid/safe.json"})
+    assets.refresh()
+
+    assert assets.get("safe") == refreshed
+    assert (bundle / "safe.json.gz").read_bytes() == before
+    assert read_asset("safe") == refreshed
+    assert asset_path("safe", str(cache)).endswith("safe.json.gz")
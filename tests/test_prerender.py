@@ -0,0 +1,53 @@
+import time
+
+import pytest
+
+pytest.importorskip("streamlit")
+pytest.importorskip("requests")
+
+import audio_cache
+import disk_cache
+import prerender
+import tts
+from audio_cache import AudioCache, audio_key
+from drills import threat_simulations
+from prerender import Prerenderer, briefing_script, cached_briefing
+
+PROFILE = {"transport": 2000, "emi_total": 5000}
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("TTS_BACKENDS", "fixture")
+    monkeypatch.setattr(disk_cache, "CACHE_ROOT", str(tmp_path))
+    cache = AudioCache()
+    for module in (audio_cache, prerender, tts):
+        monkeypatch.setattr(module, "get_audio_cache", lambda: cache)
+    return cache
+
+
+def run(worker: Prerenderer, timeout: float = 10.0):
+    worker.start()
+    deadline = time.time() + timeout
+    while sum(worker.stats[k] for k in ("rendered", "already_cached", "failed")) < worker.stats["queued"]:
+        assert time.time() < deadline, worker.stats
+        time.sleep(0.01)
+
+
+def test_news_prerender_is_a_hit_for_the_voice_page(cache):
+    # What the News page and Deep Scan queue...
+    worker = Prerenderer()
+    worker.enqueue(threat_simulations(PROFILE), "en")
+    run(worker)
+    assert worker.stats["rendered"] == 2
+
+    # ...is what the Voice page falls back to, under the same audio key.
+    for alert in threat_simulations(PROFILE):
+        script, key = cached_briefing(alert, "en")
+        assert script == briefing_script(alert)
+        assert key == audio_key(script, "en", False, "fixture")
+        assert cache.load(key)
+
+
+def test_unrendered_briefing_is_a_miss(cache):
+    assert cached_briefing(threat_simulations({})[0], "en") is None
@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from profile_model import (SAVED_KEY, SCHEMA_VERSION, StandardProfile, StudentProfile, commit, decode, diff,
+                           encode, field_names, from_dict, profile_keys, reset_session, to_dict, to_session)
+
+
+def test_from_dict_coerces_and_defaults():
+    profile = from_dict({"user_type": "Standard", "rent": "8000", "crops_grown": ("Onion",),
+                         "transport": None, "sip": "n/a", "unknown": 1})
+    assert isinstance(profile, StandardProfile)
+    assert profile.rent == 8000.0
+    assert profile.crops_grown == ["Onion"]
+    assert profile.transport == 0.0
+    assert profile.sip == 0.0
+
+
+def test_profiles_are_slotted():
+    assert not hasattr(StudentProfile(), "__dict__")
+
+
+def test_validate_reports_out_of_range_fields():
+    assert StudentProfile().validate() == []
+    problems = StandardProfile(rent=-1, net_savings=-500).validate()
+    assert problems == ["Rent can't be below 0."]
+    assert StudentProfile(daily_limit=5).validate() == ["Daily limit can't be below 10."]
+
+
+@pytest.mark.parametrize("profile", [
+    StudentProfile(savings_buffer=450.0, student_note="Gave ₹500 to Rahul"),
+    StandardProfile(crops_grown=["Onion", "Rice"], net_savings=-200.0, runway_days=999),
+])
+def test_encode_round_trip(profile):
+    assert decode(encode(profile)) == profile
+
+
+def test_decode_rejects_other_schema_versions_and_garbage():
+    row = [SCHEMA_VERSION + 1, "Student"] + [None] * len(field_names(StudentProfile))
+    assert decode(b"j" + json.dumps(row).encode()) is None
+    assert decode(b"j" + json.dumps([SCHEMA_VERSION, "Student", 1.0]).encode()) is None
+    assert decode(b"jnot json") is None
+    assert decode(None) is None
+
+
+def test_diff_lists_changed_fields_or_the_whole_document():
+    old = StudentProfile(today_spend=50.0)
+    assert diff(old, StudentProfile(today_spend=80.0)) == {"today_spend": 80.0}
+    assert diff(old, StudentProfile(today_spend=50.0)) == {}
+    assert diff(old, StandardProfile()) == to_dict(StandardProfile())
+
+
+def test_to_session_drops_the_other_variants_fields():
+    state = {"rent": 8000.0, "lang": "Hindi"}
+    to_session(state, StudentProfile())
+    assert "rent" not in state
+    assert state["user_type"] == "Student"
+    assert state["lang"] == "Hindi"
+
+
+def test_reset_session_clears_every_profile_key():
+    state = {"lang": "Hindi"}
+    to_session(state, StudentProfile())
+    state["profile_complete"] = True
+    reset_session(state)
+    assert state == {"lang": "Hindi"}
+    assert {"daily_limit", "today_spend", "user_type"} <= profile_keys()
+
+
+def test_commit_writes_only_changes_and_always_the_named_fields():
+    writes = []
+    state = {"user_type": "Student", "today_spend": 120.0}
+    commit(state, writes.append)
+    assert writes[-1] == {"schema_version": SCHEMA_VERSION, "user_type": "Student", "today_spend": 120.0}
+    assert SAVED_KEY in state
+
+    state["savings_buffer"] = 300.0
+    commit(state, writes.append)
+    assert writes[-1] == {"savings_buffer": 300.0}
+
+    commit(state, writes.append)
+    assert len(writes) == 2
+
+    fresh = {"user_type": "Student", "today_spend": 0.0}
+    commit(fresh, writes.append, fields=("today_spend",))
+    assert writes[-1]["today_spend"] == 0.0
+
+    full = commit(state, writes.append, full=True)
+    assert full == to_dict(from_dict(state))
@@ -0,0 +1,43 @@
+from relevance import ProfileIndex, RelevanceIndex, extract_facets, profile_facets
+
+FARMER = {"crops_grown": ["Onion"], "emi_total": 5000, "monthly_income": 20000, "transport": 0}
+
+
+def test_extract_facets_matches_terms_through_punctuation():
+    assert extract_facets("Onion prices crash; farmers seek MSP") >= {"crop:Onion", "cost:inflation", "agri:weather"}
+
+
+def test_profile_facets_weights_crops_and_emi_load():
+    weights = profile_facets(FARMER)
+    assert weights["crop:Onion"] == 3.0
+    assert weights["agri:weather"] == 1.5
+    assert weights["loan:rates"] == 2.25
+    assert "cost:fuel" not in weights
+
+
+def test_top_k_ranks_by_weight_and_counts_clusters_once():
+    index = RelevanceIndex()
+    index.add("1", {"title": "Onion exports banned", "cluster": "a"}, "agri")
+    index.add("2", {"title": "Onion export ban extended", "cluster": "a"}, "markets")
+    index.add("3", {"title": "Repo rate unchanged", "cluster": "b"}, "rbi")
+    index.add("4", {"title": "Gold hits record high", "cluster": "c"}, "markets")
+
+    top = index.top_k(profile_facets(FARMER), k=5)
+    assert [m["item"]["cluster"] for m in top] == ["a", "b"]
+    assert index.top_k(profile_facets(FARMER), k=5, groups={"rbi"})[0]["item"]["title"] == "Repo rate unchanged"
+
+    index.remove_group("agri")
+    index.remove_group("markets")
+    assert [m["item"]["cluster"] for m in index.top_k(profile_facets(FARMER))] == ["b"]
+
+
+def test_profile_index_matches_only_users_sharing_a_facet():
+    index = ProfileIndex()
+    index.upsert("farmer", FARMER)
+    index.upsert("investor", {"held_assets": ["Gold"]})
+
+    assert set(index.match({"title": "Onion prices surge"})) == {"farmer"}
+    assert set(index.match({"title": "Gold prices surge"})) == {"investor"}
+
+    index.remove("farmer")
+    assert index.match({"title": "Onion prices surge"}) == {}
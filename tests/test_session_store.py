@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+import session_store
+from session_store import BlobStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(session_store.time, "time", lambda: now[0])
+    return now
+
+
+def test_identical_blobs_are_stored_once(clock):
+    store = BlobStore(max_bytes=100, session_max_bytes=50, max_blob_bytes=20)
+    key = store.put("s1", b"x" * 10)
+    assert store.put("s2", b"x" * 10) == key
+    assert store.stats()["bytes"] == 10
+    assert store.session_bytes("s1") == store.session_bytes("s2") == 10
+
+    store.release("s1", key)
+    assert store.get("s1", key) is None
+    assert store.get("s2", key) == b"x" * 10
+
+
+def test_oversized_blob_is_rejected(clock):
+    store = BlobStore(max_bytes=100, session_max_bytes=50, max_blob_bytes=20)
+    assert store.put("s1", b"x" * 21) is None
+    assert store.stats()["rejected"] == 1
+
+
+def test_max_blob_bytes_must_fit_a_session():
+    with pytest.raises(ValueError):
+        BlobStore(max_bytes=100, session_max_bytes=10, max_blob_bytes=20)
+
+
+def test_session_over_budget_drops_its_oldest_reference(clock):
+    store = BlobStore(max_bytes=100, session_max_bytes=20, max_blob_bytes=10)
+    keys = []
+    for i in range(3):
+        keys.append(store.put("s1", bytes([i]) * 10))
+        clock[0] += 1
+    assert store.get("s1", keys[0]) is None
+    assert store.get("s1", keys[2]) is not None
+    assert store.session_bytes("s1") == 20
+
+
+def test_store_evicts_idle_references_first(clock):
+    store = BlobStore(max_bytes=100, session_max_bytes=50, max_blob_bytes=20, idle_seconds=60)
+    idle = store.put("idle", b"i" * 10)
+    clock[0] += 61
+    active = store.put("active", b"a" * 10)
+    assert store.get("idle", idle) is None
+    assert store.get("active", active) == b"a" * 10
+    assert store.stats()["sessions"] == 1
+
+
+def test_release_session_keeps_blobs_other_sessions_share(clock):
+    store = BlobStore(max_bytes=100, session_max_bytes=50, max_blob_bytes=20)
+    shared = store.put("s1", b"s" * 10)
+    store.put("s2", b"s" * 10)
+    store.put("s1", b"o" * 10)
+    store.release_session("s1")
+    assert store.session_bytes("s1") == 0
+    assert store.get("s2", shared) == b"s" * 10
+    assert store.stats()["bytes"] == 10
+
+
+def test_session_holds_only_the_key_for_a_value(clock, monkeypatch):
+    store = BlobStore()
+    state = {}
+    monkeypatch.setattr(session_store, "st", SimpleNamespace(session_state=state))
+    monkeypatch.setattr(session_store, "get_blob_store", lambda: store)
+
+    alerts = [{"id": "drill_rent", "title": "Rent hike", "tags": {"rent"}}]
+    assert session_store.put_value("alerts", alerts)
+    assert len(state["alerts"]) == 64
+    assert session_store.get_value("alerts") == alerts
+
+    store.release_session(session_store.session_id())
+    assert session_store.get_value("alerts", []) == []
+    assert "alerts" not in state
@@ -0,0 +1,78 @@
+import threading
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+from singleflight import SingleFlight
+
+
+class Rerun(BaseException):
+    """Stands in for Streamlit's RerunException."""
+
+
+def run_with_follower(flight, fn):
+    """Runs fn as the leader while a second thread joins the same flight."""
+    joined = threading.Event()
+    release = threading.Event()
+    outcome = {}
+
+    def leader():
+        def work():
+            release.wait(5)
+            return fn()
+        try:
+            outcome["leader"] = flight.do("k", work)
+        except BaseException as e:
+            outcome["leader"] = e
+
+    def follower():
+        try:
+            outcome["follower"] = flight.do("k", lambda: "own", on_join=joined.set)
+        except BaseException as e:
+            outcome["follower"] = e
+
+    t1 = threading.Thread(target=leader)
+    t1.start()
+    while flight.stats()["in_flight"] == 0:
+        pass
+    t2 = threading.Thread(target=follower)
+    t2.start()
+    joined.wait(5)
+    release.set()
+    t1.join(5)
+    t2.join(5)
+    return outcome
+
+
+def test_follower_gets_the_leaders_result():
+    flight = SingleFlight()
+    outcome = run_with_follower(flight, lambda: "shared")
+    assert outcome == {"leader": "shared", "follower": "shared"}
+    assert flight.stats() == {"leaders": 1, "followers": 1, "in_flight": 0}
+
+
+def test_follower_sees_the_leaders_exception():
+    def fail():
+        raise ValueError("model down")
+    outcome = run_with_follower(SingleFlight(), fail)
+    assert isinstance(outcome["leader"], ValueError)
+    assert outcome["follower"] is outcome["leader"]
+
+
+def test_control_flow_exceptions_stay_with_the_leader():
+    def rerun():
+        raise Rerun()
+    outcome = run_with_follower(SingleFlight(), rerun)
+    assert isinstance(outcome["leader"], Rerun)
+    assert type(outcome["follower"]) is RuntimeError
+
+
+def test_follower_times_out():
+    flight = SingleFlight(timeout=0.01)
+    call, leader = flight.begin("k")
+    assert leader
+    with pytest.raises(TimeoutError):
+        flight.do("k", lambda: "own")
+    flight.finish("k", call, result="late")
+    assert flight.do("k", lambda: "fresh") == "fresh"
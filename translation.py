@@ -0,0 +1,256 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from disk_cache import DiskCache
+from lazy_imports import installed, load
+
+# ==========================================
+# 0. CONFIG
+# ==========================================
+LANG_CODES = {
+    "English": "en",
+    "Hindi": "hi",
+    "Kannada": "kn",
+    "Tamil": "ta",
+    "Telugu": "te"
+}
+
+TRANSLATION_CACHE_MAX_BYTES = 10 * 1024 * 1024
+TRANSLATION_TTL = 30 * 24 * 3600
+MAX_REQUEST_CHARS = 4500        # Google web endpoint rejects > 5000 chars
+
+# A segment that failed isn't prefetched again until its backoff runs out.
+FAILURE_BACKOFF = 60
+FAILURE_BACKOFF_MAX = 3600
+
+SENTENCE_RE = re.compile(r"(?<=[.!?।])\s+|\s*\n+\s*")
+
+
+class TranslationError(Exception):
+    """Some segments could not be translated; .text holds the best effort (untranslated segments kept)."""
+
+    def __init__(self, text: str, failed: int):
+        super().__init__(f"{failed} segment(s) could not be translated")
+        self.text = text
+        self.failed = failed
+
+
+def split_segments(text: str) -> tuple[list[str], list[str]]:
+    """
+    Splits text into sentences. Returns (segments, joiners) where joiners[i]
+    is the whitespace that followed segments[i], so paragraphs survive the
+    round trip.
+    """
+    segments, joiners = [], []
+    pos = 0
+    for m in SENTENCE_RE.finditer(text):
+        segment = text[pos:m.start()].strip()
+        if segment:
+            segments.append(segment)
+            joiners.append("\n\n" if "\n" in m.group() else " ")
+        pos = m.end()
+    tail = text[pos:].strip()
+    if tail:
+        segments.append(tail)
+        joiners.append("")
+    return segments, joiners
+
+
+# ==========================================
+# 1. TRANSLATOR
+# ==========================================
+class Translator:
+    """
+    Sentence-level translation cache: (segment, target) -> text. Uncached
+    segments are sent together, one per line, in as few requests as the
+    length limit allows; if a batched reply doesn't line up, those
+    segments are retried one by one.
+    """
+
+    def __init__(self, max_bytes: int = TRANSLATION_CACHE_MAX_BYTES):
+        self.store = DiskCache("translation", max_bytes=max_bytes, default_ttl=TRANSLATION_TTL)
+        self._lock = threading.Lock()
+        self.counts = {"segments": 0, "cached": 0, "requests": 0, "failures": 0}
+        # (segment, target) -> (consecutive failures, retry_at)
+        self._failures = {}
+        self._inflight = set()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="translate-prefetch")
+
+    @staticmethod
+    def _key(segment: str, target: str) -> str:
+        raw = json.dumps([target, segment], ensure_ascii=False)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _count(self, **deltas):
+        with self._lock:
+            for name, n in deltas.items():
+                self.counts[name] += n
+
+    def _request(self, text: str, target: str) -> str:
+        self._count(requests=1)
+        return load("deep_translator").GoogleTranslator(source="auto", target=target).translate(text)
+
+    def _record(self, target: str, translated: list[str], failed: list[str]):
+        with self._lock:
+            for s in translated:
+                self._failures.pop((s, target), None)
+            now = time.time()
+            for s in failed:
+                n = self._failures.get((s, target), (0, 0))[0] + 1
+                self._failures[(s, target)] = (n, now + min(FAILURE_BACKOFF * 2 ** (n - 1), FAILURE_BACKOFF_MAX))
+
+    def backing_off(self, segment: str, target: str) -> bool:
+        with self._lock:
+            entry = self._failures.get((segment, target))
+        return entry is not None and time.time() < entry[1]
+
+    def segments(self, segments: list[str], target: str) -> tuple[list[str], int]:
+        """Translates each segment. Returns (translations, failed); failed segments come back unchanged."""
+        unique = list(dict.fromkeys(segments))
+        done = {}
+        for s in unique:
+            cached = self.store.get(self._key(s, target))
+            if cached is not None:
+                done[s] = cached.decode()
+        todo = [s for s in unique if s not in done]
+        self._count(segments=len(unique), cached=len(done))
+
+        if todo and not installed("deep_translator"):
+            self._count(failures=len(todo))
+            self._record(target, [], todo)
+            return [done.get(s, s) for s in segments], len(todo)
+
+        batches, batch, size = [], [], 0
+        for s in todo:
+            if batch and size + len(s) + 1 > MAX_REQUEST_CHARS:
+                batches.append(batch)
+                batch, size = [], 0
+            batch.append(s)
+            size += len(s) + 1
+        if batch:
+            batches.append(batch)
+
+        failed = []
+        for batch in batches:
+            try:
+                lines = [l.strip() for l in (self._request("\n".join(batch), target) or "").split("\n") if l.strip()]
+            except Exception:
+                lines = []
+            if len(lines) == len(batch):
+                pairs = zip(batch, lines)
+            else:
+                pairs = []
+                for s in batch:
+                    try:
+                        pairs.append((s, self._request(s, target)))
+                    except Exception:
+                        failed.append(s)
+            for s, t in pairs:
+                if not t:
+                    failed.append(s)
+                    continue
+                done[s] = t
+                self.store.set(self._key(s, target), t.encode())
+
+        self._count(failures=len(failed))
+        self._record(target, [s for s in todo if s in done], failed)
+        return [done.get(s, s) for s in segments], len(failed)
+
+    def peek(self, segments: list[str], target: str) -> list[str] | None:
+        """Cached translations only; None if any segment would need a request."""
+        out = []
+        for s in segments:
+            cached = self.store.get(self._key(s, target), count=False)
+            if cached is None:
+                return None
+            out.append(cached.decode())
+        return out
+
+    def prefetch(self, segments: list[str], target: str):
+        """Fire-and-forget translation of segments not cached, in flight or backing off."""
+        with self._lock:
+            inflight = set(self._inflight)
+        todo = [
+            s for s in dict.fromkeys(segments)
+            if (s, target) not in inflight
+            and not self.backing_off(s, target)
+            and self.store.get(self._key(s, target), count=False) is None
+        ]
+        if not todo:
+            return
+        jobs = {(s, target) for s in todo}
+        with self._lock:
+            self._inflight |= jobs
+
+        def run():
+            try:
+                self.segments(todo, target)
+            finally:
+                with self._lock:
+                    self._inflight -= jobs
+
+        self._pool.submit(run)
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = dict(self.counts)
+            out["backing_off"] = sum(1 for _, retry_at in self._failures.values() if retry_at > time.time())
+        out["hit_ratio"] = round(out["cached"] / out["segments"], 3) if out["segments"] else 0.0
+        out["entries"] = self.store.stats()["entries"]
+        return out
+
+
+@st.cache_resource
+def get_translator() -> Translator:
+    return Translator()
+
+
+def translate(text: str, target: str) -> str:
+    """
+    Translates a script sentence by sentence. Raises TranslationError if any
+    sentence failed; its .text still contains everything that did translate.
+    """
+    if target == "en" or not text.strip():
+        return text
+    segments, joiners = split_segments(text)
+    translated, failed = get_translator().segments(segments, target)
+    out = "".join(t + j for t, j in zip(translated, joiners))
+    if failed:
+        raise TranslationError(out, failed)
+    return out
+
+
+def cached_translation(text: str, target: str) -> str | None:
+    """Like translate(), but never hits the network: None unless every sentence is cached."""
+    if target == "en" or not text.strip():
+        return text
+    segments, joiners = split_segments(text)
+    translated = get_translator().peek(segments, target)
+    if translated is None:
+        return None
+    return "".join(t + j for t, j in zip(translated, joiners))
+
+
+def _headline(text: str) -> str:
+    # Segments are sent one per line, so flatten any embedded newlines.
+    return " ".join(text.split())
+
+
+def cached_many(texts: list[str], target: str) -> list[str | None]:
+    """Cached translations of short texts (e.g. headlines); None where not cached yet. Never hits the network."""
+    if target == "en":
+        return list(texts)
+    translator = get_translator()
+    return [(translator.peek([_headline(t)], target) or [None])[0] for t in texts]
+
+
+def prefetch_many(texts: list[str], target: str):
+    """Translates short texts in one background batch, so a later cached_many() finds them."""
+    if target != "en":
+        get_translator().prefetch([_headline(t) for t in texts], target)
@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from audio_cache import get_audio_cache, synthesize
+from translation import split_segments
+from tts_backends import backend_chain, join_audio
+
+# ==========================================
+# 0. CONFIG
+# ==========================================
+TTS_WORKERS = 4
+CHUNK_CHARS = 200       # sentences are packed into chunks up to this size
+
+_pool = ThreadPoolExecutor(max_workers=TTS_WORKERS, thread_name_prefix="tts")
+
+
+def split_chunks(text: str, max_chars: int = CHUNK_CHARS) -> list[str]:
+    """Packs whole sentences into chunks of at most max_chars (a longer sentence stays whole)."""
+    chunks = []
+    for sentence in split_segments(text)[0]:
+        if chunks and len(chunks[-1]) + 1 + len(sentence) <= max_chars:
+            chunks[-1] += " " + sentence
+        else:
+            chunks.append(sentence)
+    return chunks
+
+
+# ==========================================
+# 1. CHUNKED SYNTHESIS
+# ==========================================
+def synthesize_chunks(text: str, lang: str = "en", slow: bool = False):
+    """
+    Yields (index, total, audio_bytes) in script order while later chunks
+    are still being synthesized in the pool. Each chunk is cached on its
+    own, and the joined clip is cached under the full text.
+
+    All chunks of one clip come from the same backend so they can be
+    joined. If the first chunk fails, the next backend in the chain takes
+    over; once audio has been yielded, errors propagate.
+    """
+    cache = get_audio_cache()
+    whole = cache.get(text, lang, slow)
+    if whole is not None:
+        yield 0, 1, whole
+        return
+
+    chunks = split_chunks(text) or [text]
+    error = RuntimeError(f"No text-to-speech backend available for '{lang}'")
+    for backend in backend_chain(lang):
+        futures = [_pool.submit(synthesize, chunk, lang, slow, backend) for chunk in chunks]
+        parts = []
+        try:
+            for i, future in enumerate(futures):
+                try:
+                    parts.append(future.result())
+                except Exception as e:
+                    if parts:
+                        raise
+                    error = e
+                    break
+                yield i, len(chunks), parts[-1]
+            else:
+                cache.set(text, lang, join_audio(parts), slow, backend.name)
+                return
+        finally:
+            for future in futures:
+                future.cancel()
+    raise error
+
+
+def speak(text: str, lang: str = "en", slow: bool = False) -> bytes:
+    return join_audio([audio for _, _, audio in synthesize_chunks(text, lang, slow)])
@@ -0,0 +1,176 @@
+import io
+import os
+import tempfile
+import threading
+import time
+import wave
+
+import streamlit as st
+
+from lazy_imports import installed, load
+
+# ==========================================
+# 0. CONFIG
+# ==========================================
+# Tried in order; override with TTS_BACKENDS="pyttsx3,gtts" in secrets/env.
+# "fixture" (silent clips) is for offline load tests and demos.
+DEFAULT_BACKENDS = "gtts,pyttsx3"
+
+FIXTURE_RATE = 16000
+FIXTURE_SECONDS_PER_CHAR = 0.06
+
+
+def configured_backends() -> list[str]:
+    try:
+        value = st.secrets.get("TTS_BACKENDS")
+    except Exception:
+        value = None
+    value = value or os.getenv("TTS_BACKENDS") or DEFAULT_BACKENDS
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def audio_format(audio: bytes) -> str:
+    return "audio/wav" if audio[:4] == b"RIFF" else "audio/mp3"
+
+
+def join_audio(parts: list[bytes]) -> bytes:
+    """MP3 frames concatenate as-is; WAV clips are re-wrapped under one header."""
+    if not parts or audio_format(parts[0]) != "audio/wav":
+        return b"".join(parts)
+    out = io.BytesIO()
+    with wave.open(out, "wb") as w:
+        for i, part in enumerate(parts):
+            with wave.open(io.BytesIO(part), "rb") as r:
+                if i == 0:
+                    w.setparams(r.getparams())
+                w.writeframes(r.readframes(r.getnframes()))
+    return out.getvalue()
+
+
+# ==========================================
+# 1. BACKENDS
+# ==========================================
+class TTSBackend:
+    """text + language -> audio bytes (MP3 or WAV; see audio_format)."""
+
+    name = ""
+
+    def available(self) -> bool:
+        return True
+
+    def supports(self, lang: str) -> bool:
+        return True
+
+    def synthesize(self, text: str, lang: str, slow: bool = False) -> bytes:
+        raise NotImplementedError
+
+
+class GTTSBackend(TTSBackend):
+    """Google Translate's TTS endpoint. Best voices, one network round trip per call."""
+
+    name = "gtts"
+
+    def available(self) -> bool:
+        return installed("gtts")
+
+    def synthesize(self, text, lang, slow=False):
+        fp = io.BytesIO()
+        load("gtts").gTTS(text=text, lang=lang, slow=slow).write_to_fp(fp)
+        return fp.getvalue()
+
+
+class Pyttsx3Backend(TTSBackend):
+    """Local engine (eSpeak / SAPI5 / NSSpeech). No network; robotic, WAV output."""
+
+    name = "pyttsx3"
+
+    def __init__(self):
+        self._engine = None
+        self._voices = None
+        # The engine is not thread-safe; synthesis is serialized.
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        if not installed("pyttsx3"):
+            return False
+        try:
+            self._load()
+        except Exception:
+            return False
+        return True
+
+    def _load(self):
+        if self._engine is None:
+            self._engine = load("pyttsx3").init()
+            self._voices = self._engine.getProperty("voices") or []
+
+    def _voice(self, lang: str):
+        for voice in self._voices or []:
+            langs = [l.decode(errors="ignore") if isinstance(l, bytes) else str(l) for l in voice.languages or []]
+            if any(lang in l.lower() for l in langs) or f"/{lang}" in voice.id.lower() or voice.id.lower().endswith(lang):
+                return voice.id
+        return None
+
+    def supports(self, lang: str) -> bool:
+        return lang == "en" or (self.available() and self._voice(lang) is not None)
+
+    def synthesize(self, text, lang, slow=False):
+        with self._lock:
+            self._load()
+            voice = self._voice(lang)
+            if voice:
+                self._engine.setProperty("voice", voice)
+            self._engine.setProperty("rate", 130 if slow else 170)
+            fd, path = tempfile.mkstemp(suffix=".wav")
+            os.close(fd)
+            try:
+                self._engine.save_to_file(text, path)
+                self._engine.runAndWait()
+                with open(path, "rb") as f:
+                    return f.read()
+            finally:
+                os.remove(path)
+
+
+class FixtureBackend(TTSBackend):
+    """
+    Deterministic silent WAV sized to the text, with an optional simulated
+    per-character latency (TTS_FIXTURE_MS_PER_CHAR) for offline load tests.
+    """
+
+    name = "fixture"
+
+    def __init__(self, ms_per_char: float | None = None):
+        self.ms_per_char = float(os.getenv("TTS_FIXTURE_MS_PER_CHAR", 0)) if ms_per_char is None else ms_per_char
+
+    def synthesize(self, text, lang, slow=False):
+        if self.ms_per_char:
+            time.sleep(len(text) * self.ms_per_char / 1000)
+        seconds = len(text) * FIXTURE_SECONDS_PER_CHAR * (1.5 if slow else 1)
+        out = io.BytesIO()
+        with wave.open(out, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(FIXTURE_RATE)
+            w.writeframes(b"\x00\x00" * int(FIXTURE_RATE * seconds))
+        return out.getvalue()
+
+
+BACKENDS = {b.name: b for b in (GTTSBackend, Pyttsx3Backend, FixtureBackend)}
+
+
+@st.cache_resource
+def get_backend(name: str) -> TTSBackend:
+    return BACKENDS[name]()
+
+
+def backend_chain(lang: str) -> list[TTSBackend]:
+    """Configured backends that are installed and can speak lang, in fallback order."""
+    chain = []
+    for name in configured_backends():
+        if name not in BACKENDS:
+            continue
+        backend = get_backend(name)
+        if backend.available() and backend.supports(lang):
+            chain.append(backend)
+    return chain
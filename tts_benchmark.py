@@ -0,0 +1,61 @@
+"""
+Latency per character for each installed TTS backend (bypasses the audio cache).
+
+    python tts_benchmark.py                 # every installed backend, English
+    python tts_benchmark.py gtts fixture -l hi -n 5
+"""
+import argparse
+import statistics
+import time
+
+from tts_backends import BACKENDS
+
+SAMPLES = [
+    "Prices are up.",
+    "The Central Bank has raised rates. Your loan tenure may extend by 6-12 months.",
+    "Vegetable and utility prices are trending up 8%. It is advised to cut discretionary "
+    "spending this week to maintain your runway. Consider pooling or public transit, and "
+    "review subscriptions you no longer use before the next billing cycle.",
+]
+
+
+def bench(backend, lang: str, runs: int) -> dict:
+    per_char, first = [], None
+    for run in range(runs):
+        for text in SAMPLES:
+            started = time.perf_counter()
+            backend.synthesize(text, lang)
+            elapsed = time.perf_counter() - started
+            if first is None:
+                first = elapsed
+            per_char.append(elapsed * 1000 / len(text))
+    return {
+        "first_ms": first * 1000,
+        "p50_ms_per_char": statistics.median(per_char),
+        "max_ms_per_char": max(per_char),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("backends", nargs="*", default=list(BACKENDS))
+    parser.add_argument("-l", "--lang", default="en")
+    parser.add_argument("-n", "--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'backend':<10} {'first call':>12} {'p50 ms/char':>12} {'max ms/char':>12}")
+    for name in args.backends:
+        backend = BACKENDS[name]()
+        if not backend.available() or not backend.supports(args.lang):
+            print(f"{name:<10} {'not available for ' + args.lang:>38}")
+            continue
+        try:
+            r = bench(backend, args.lang, args.runs)
+        except Exception as e:
+            print(f"{name:<10} failed: {e}")
+            continue
+        print(f"{name:<10} {r['first_ms']:>10.0f}ms {r['p50_ms_per_char']:>12.2f} {r['max_ms_per_char']:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()